@@ -1,6 +1,7 @@
 from aws_lambda_powertools import Logger
 from fastapi import APIRouter, Depends, Response, status
 
+from app.container import get_attachment_service
 from app.jwt_bearer import JWTBearer
 from app.models.auth import JWTToken
 from app.models.response import Attachment as AttachmentResponse
@@ -9,7 +10,6 @@ from app.services.attachment_service import AttachmentService
 
 logger = Logger(utc=True)
 
-attachment_service = AttachmentService()
 jwt_bearer = JWTBearer()
 router = APIRouter()
 
@@ -19,6 +19,7 @@ def add_attachment(
     create_attachment: CreateAttachment,
     post_uuid: str,
     token: JWTToken = Depends(jwt_bearer),
+    attachment_service: AttachmentService = Depends(get_attachment_service),
 ):
     attachment = attachment_service.add_attachment(
         post_uuid,
@@ -37,10 +38,17 @@ def add_attachment(
 
 
 @router.get("/{attachment_uuid}", status_code=status.HTTP_200_OK)
-def get_attachment_by_uuid(post_uuid: str, attachment_uuid: str) -> AttachmentResponse:
+def get_attachment_by_uuid(
+    post_uuid: str,
+    attachment_uuid: str,
+    attachment_service: AttachmentService = Depends(get_attachment_service),
+) -> AttachmentResponse:
     return attachment_service.get_attachment_by_id(post_uuid, attachment_uuid)
 
 
 @router.get("", status_code=status.HTTP_200_OK)
-def get_attachments(post_uuid: str):
+def get_attachments(
+    post_uuid: str,
+    attachment_service: AttachmentService = Depends(get_attachment_service),
+):
     return attachment_service.get_attachments(post_uuid)
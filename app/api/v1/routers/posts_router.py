@@ -1,9 +1,11 @@
 from typing import Any
 
 from aws_lambda_powertools import Logger
-from fastapi import APIRouter, Depends, HTTPException, Path, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
 from fastapi.responses import Response
 
+from app import settings
+from app.container import get_post_service
 from app.jwt_bearer import JWTBearer
 from app.models.auth import JWTToken
 from app.models.response import Page
@@ -14,13 +16,14 @@ from app.services.post_service import PostService
 logger = Logger(utc=True)
 
 jwt_bearer = JWTBearer()
-post_service = PostService()
 router = APIRouter()
 
 
 @router.post("")
 def create_post(
-    create_model: CreatePost, token: JWTToken = Depends(jwt_bearer)
+    create_model: CreatePost,
+    token: JWTToken = Depends(jwt_bearer),
+    post_service: PostService = Depends(get_post_service),
 ) -> Response:
     post = post_service.create_post(create_model.model_dump())
     return Response(
@@ -33,12 +36,18 @@ def create_post(
     "/{uuid}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-def delete_post(uuid: str, token: JWTToken = Depends(jwt_bearer)):
+def delete_post(
+    uuid: str,
+    token: JWTToken = Depends(jwt_bearer),
+    post_service: PostService = Depends(get_post_service),
+):
     post_service.delete_post(uuid)
 
 
 @router.get("/archive", status_code=status.HTTP_200_OK)
-def get_archive() -> dict[str, Any]:
+def get_archive(
+    post_service: PostService = Depends(get_post_service),
+) -> dict[str, Any]:
     return post_service.get_archive()
 
 
@@ -50,6 +59,7 @@ def get_by_post_path(
     day: str = Path(
         regex=r"^(0[1-9]|[12]\d|3[01])$", description="2 digit day (01-31)"
     ),
+    post_service: PostService = Depends(get_post_service),
 ) -> PostResponse:
     year_int = int(year)
     month_int = int(month)
@@ -68,7 +78,9 @@ def get_by_post_path(
     status_code=status.HTTP_200_OK,
     response_model_exclude_none=True,
 )
-def get_post_by_uuid(uuid: str) -> PostResponse:
+def get_post_by_uuid(
+    uuid: str, post_service: PostService = Depends(get_post_service)
+) -> PostResponse:
     return post_service.get_post(uuid)
 
 
@@ -78,8 +90,13 @@ def get_post_by_uuid(uuid: str) -> PostResponse:
     status_code=status.HTTP_200_OK,
     response_model_exclude_none=True,
 )
-def get_posts(exclusive_start_key: str | None = None) -> Page:
-    return post_service.get_posts(exclusive_start_key)
+def get_posts(
+    cursor: str | None = None,
+    exclusive_start_key: str | None = Query(None, deprecated=True),
+    limit: int = Query(settings.posts_page_size, ge=1, le=settings.posts_max_page_size),
+    post_service: PostService = Depends(get_post_service),
+) -> Page:
+    return post_service.get_posts(limit, cursor or exclusive_start_key)
 
 
 @router.put(
@@ -87,6 +104,9 @@ def get_posts(exclusive_start_key: str | None = None) -> Page:
     status_code=status.HTTP_204_NO_CONTENT,
 )
 def update_post(
-    update_model: UpdatePost, uuid: str, token: JWTToken = Depends(jwt_bearer)
+    update_model: UpdatePost,
+    uuid: str,
+    token: JWTToken = Depends(jwt_bearer),
+    post_service: PostService = Depends(get_post_service),
 ):
     post_service.update_post(uuid, update_model.model_dump(exclude_none=True))
@@ -1,7 +1,9 @@
+import os
 import uuid
-from typing import Any, Sequence
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Sequence
 
-import uvicorn
+from anyio.to_thread import current_default_thread_limiter
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.logging.logger import set_package_logger
 from botocore.exceptions import BotoCoreError, ClientError
@@ -11,27 +13,53 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import UJSONResponse
 from mangum import Mangum
+from starlette.concurrency import run_in_threadpool
 
-from app import settings
+from app import settings, snapstart
 from app.api.v1.api import router as api_v1_router
+from app.container import container
+from app.event_logging import log_sampled_event
+from app.metrics import latency_metrics, log_latency_metrics
 from app.middlewares import (ClientValidationMiddleware,
-                             CorrelationIdMiddleware, RateLimitingMiddleware)
+                             CorrelationIdMiddleware, LatencyMetricsMiddleware,
+                             RateLimitingMiddleware, ServerTimingMiddleware)
 from app.models.camel_model import CamelModel
+from app.timing import TimedJSONResponse
 
 if settings.debug:
     set_package_logger()
 
 logger = Logger(utc=True)
 
-app = FastAPI(debug=settings.debug, title="PersonalBackendApplication", version="1.0.0")
-app.add_middleware(CorrelationIdMiddleware)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    current_default_thread_limiter().total_tokens = settings.worker_threads
+    yield
+    await run_in_threadpool(container.close)
+
+
+app = FastAPI(
+    debug=settings.debug,
+    default_response_class=TimedJSONResponse,
+    lifespan=lifespan,
+    title="PersonalBackendApplication",
+    version="1.0.0",
+)
+# Middlewares run in reverse order of registration, cheapest rejections first
+app.add_middleware(GZipMiddleware)
 app.add_middleware(ClientValidationMiddleware)
 app.add_middleware(RateLimitingMiddleware)
-app.add_middleware(GZipMiddleware)
+app.add_middleware(CorrelationIdMiddleware)
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(LatencyMetricsMiddleware)
 app.include_router(api_v1_router)
 
-handler = Mangum(app)
-handler = logger.inject_lambda_context(handler, clear_state=True, log_event=True)
+handler = Mangum(app, lifespan="off")
+handler = log_latency_metrics(handler)
+handler = log_sampled_event(handler)
+handler = logger.inject_lambda_context(handler, clear_state=True)
+snapstart.register(app)
 
 
 class ErrorResponse(CamelModel):
@@ -44,6 +72,25 @@ class ValidationErrorResponse(ErrorResponse):
     errors: Sequence[Any]
 
 
+@app.get("/health", include_in_schema=False)
+def health() -> dict[str, str]:
+    return {"status": "ok"}
+
+
+if "AWS_LAMBDA_FUNCTION_NAME" not in os.environ:
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics() -> dict[str, Any]:
+        return latency_metrics.snapshot()
+
+    @app.get("/metrics/aws", include_in_schema=False)
+    def aws_metrics() -> dict[str, Any]:
+        return {
+            "clients": container.aws_clients.stats(),
+            "operations": container.hedged_caller.stats(),
+        }
+
+
 @app.exception_handler(BotoCoreError)
 @app.exception_handler(ClientError)
 def botocore_error_handler(request: Request, error: BotoCoreError) -> UJSONResponse:
@@ -92,4 +139,6 @@ def request_validation_error_handler(
 
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run("app.api_handler:app", host="localhost", port=8080, reload=True)
@@ -0,0 +1,103 @@
+import functools
+import threading
+from typing import Any, Literal
+
+import boto3
+from aws_lambda_powertools import Logger
+from botocore.config import Config
+
+from app.settings import Settings
+
+ClientServiceName = Literal["dynamodb", "s3", "ssm"]
+ResourceServiceName = Literal["dynamodb", "s3"]
+
+
+class ConnectionPoolStats:
+    __slots__ = ("in_flight", "max_in_flight", "pool_size", "requests", "saturated")
+
+    def __init__(self, pool_size: int):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.pool_size = pool_size
+        self.requests = 0
+        self.saturated = 0
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "pool_size": self.pool_size,
+            "requests": self.requests,
+            "saturated": self.saturated,
+            "utilization": round(self.max_in_flight / self.pool_size, 4),
+        }
+
+
+class AWSClientFactory:
+    def __init__(self, settings: Settings):
+        self._config = Config(
+            connect_timeout=settings.aws_connect_timeout_in_seconds,
+            max_pool_connections=settings.aws_max_pool_connections,
+            read_timeout=settings.aws_read_timeout_in_seconds,
+            region_name=settings.aws_region,
+            retries={
+                "mode": "adaptive",
+                "total_max_attempts": settings.aws_max_attempts,
+            },
+            tcp_keepalive=True,
+        )
+        self._lock = threading.Lock()
+        self._logger = Logger(utc=True)
+        self._max_pool_connections = settings.aws_max_pool_connections
+        self._session = boto3.Session()
+        self._session_lock = threading.Lock()
+        self._stats: dict[str, ConnectionPoolStats] = {}
+
+    @property
+    def config(self) -> Config:
+        return self._config
+
+    def client(self, service_name: ClientServiceName) -> Any:
+        self._logger.info(f"Creating {service_name} client")
+        with self._session_lock:
+            client = self._session.client(service_name, config=self._config)
+        self._instrument(service_name, client)
+        return client
+
+    def resource(self, service_name: ResourceServiceName) -> Any:
+        self._logger.info(f"Creating {service_name} resource")
+        with self._session_lock:
+            resource = self._session.resource(service_name, config=self._config)
+        self._instrument(service_name, resource.meta.client)
+        return resource
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {
+                service_name: stats.summary()
+                for service_name, stats in sorted(self._stats.items())
+            }
+
+    def _instrument(self, service_name: str, client: Any) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(
+                service_name, ConnectionPoolStats(self._max_pool_connections)
+            )
+        client.meta.events.register(
+            "before-send", functools.partial(self._on_before_send, stats)
+        )
+        client.meta.events.register(
+            "response-received", functools.partial(self._on_response_received, stats)
+        )
+
+    def _on_before_send(self, stats: ConnectionPoolStats, **kwargs: Any) -> None:
+        with self._lock:
+            stats.in_flight += 1
+            stats.requests += 1
+            stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+            if stats.in_flight > stats.pool_size:
+                stats.saturated += 1
+
+    def _on_response_received(self, stats: ConnectionPoolStats, **kwargs: Any) -> None:
+        with self._lock:
+            stats.in_flight -= 1
@@ -0,0 +1,15 @@
+from aws_lambda_powertools import Logger
+
+from app.container import container
+
+logger = Logger(utc=True)
+
+
+def main() -> int:
+    updated = container.post_service.backfill_published_index()
+    logger.info(f"Updated {updated} posts")
+    return updated
+
+
+if __name__ == "__main__":
+    main()
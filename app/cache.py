@@ -0,0 +1,73 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache[K, V]:
+    def __init__(self, max_size: int, ttl: float):
+        self._items: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_size = max_size
+        self._ttl = ttl
+        self.evictions = 0
+        self.expirations = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._items[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        ttl = self._ttl if ttl is None else ttl
+        with self._lock:
+            if ttl <= 0:
+                self._items.pop(key, None)
+                return
+            self._items[key] = (time.monotonic() + ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self._max_size:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "size": len(self._items),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class ExpiringSet[K](TTLCache[K, bool]):
+    def add(self, key: K, ttl: float | None = None) -> None:
+        self.set(key, True, ttl)
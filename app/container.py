@@ -0,0 +1,142 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+from aws_lambda_powertools import Logger
+
+from app import settings
+from app.aws_clients import AWSClientFactory
+from app.hedging import HedgedCaller
+from app.jwt_secret_provider import parse_keys
+from app.pagination import CursorCodec
+from app.repositories.post_repository import PostRepository
+from app.repositories.rate_limit_repository import RateLimitRepository
+from app.services.attachment_service import AttachmentService
+from app.services.post_service import PostService
+from app.services.storage_service import StorageService
+from app.settings import Settings
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.service_resource import DynamoDBServiceResource
+    from mypy_boto3_s3.service_resource import S3ServiceResource
+
+    from app.services.publisher_service import PublisherService
+
+T = TypeVar("T")
+
+
+class Container:
+    def __init__(self, settings: Settings):
+        self._instances: dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self._logger = Logger(utc=True)
+        self._settings = settings
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._instances
+
+    @property
+    def aws_clients(self) -> AWSClientFactory:
+        return self._get("aws_clients", lambda: AWSClientFactory(self._settings))
+
+    @property
+    def dynamodb(self) -> "DynamoDBServiceResource":
+        return self._get("dynamodb", lambda: self.aws_clients.resource("dynamodb"))
+
+    @property
+    def s3(self) -> "S3ServiceResource":
+        return self._get("s3", lambda: self.aws_clients.resource("s3"))
+
+    @property
+    def cursors(self) -> CursorCodec:
+        return self._get("cursors", lambda: CursorCodec(self._cursor_keys))
+
+    @property
+    def hedged_caller(self) -> HedgedCaller:
+        return self._get("hedged_caller", lambda: HedgedCaller(self._settings))
+
+    @property
+    def post_repository(self) -> PostRepository:
+        return self._get(
+            "post_repository",
+            lambda: PostRepository(
+                self.dynamodb, self.hedged_caller, self.scan_executor
+            ),
+        )
+
+    @property
+    def rate_limit_repository(self) -> RateLimitRepository:
+        return self._get(
+            "rate_limit_repository", lambda: RateLimitRepository(self.dynamodb)
+        )
+
+    @property
+    def scan_executor(self) -> ThreadPoolExecutor:
+        return self._get(
+            "scan_executor",
+            lambda: ThreadPoolExecutor(
+                max_workers=self._settings.db_scan_workers,
+                thread_name_prefix="segment-scan",
+            ),
+        )
+
+    @property
+    def post_service(self) -> PostService:
+        return self._get(
+            "post_service", lambda: PostService(self.post_repository, self.cursors)
+        )
+
+    @property
+    def storage_service(self) -> StorageService:
+        return self._get("storage_service", lambda: StorageService(self.s3))
+
+    @property
+    def attachment_service(self) -> AttachmentService:
+        return self._get(
+            "attachment_service",
+            lambda: AttachmentService(self.post_service, self.storage_service),
+        )
+
+    @property
+    def publisher_service(self) -> "PublisherService":
+        from app.services.publisher_service import PublisherService
+
+        return self._get(
+            "publisher_service", lambda: PublisherService(self.post_service)
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            instances, self._instances = self._instances, {}
+        if "hedged_caller" in instances:
+            instances["hedged_caller"].close()
+        if "scan_executor" in instances:
+            instances["scan_executor"].shutdown(wait=False, cancel_futures=True)
+        for name in ("dynamodb", "s3"):
+            if name in instances:
+                self._logger.info(f"Closing {name} client")
+                instances[name].meta.client.close()
+
+    def _cursor_keys(self) -> dict[str, str]:
+        secret = self._settings.cursor_secret
+        return parse_keys(secret) if secret else {}
+
+    def _get(self, name: str, factory: Callable[[], T]) -> T:
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    instance = self._instances[name] = factory()
+        return instance
+
+
+container = Container(settings)
+
+
+async def get_attachment_service() -> AttachmentService:
+    return container.attachment_service
+
+
+async def get_post_service() -> PostService:
+    return container.post_service
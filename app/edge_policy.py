@@ -0,0 +1,52 @@
+import re
+from typing import NamedTuple
+
+from starlette.types import Scope
+
+from app import settings
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class EdgePolicy(NamedTuple):
+    rate_limit: bool
+    validate_client: bool
+
+
+FULL = EdgePolicy(rate_limit=True, validate_client=True)
+RATE_LIMIT_ONLY = EdgePolicy(rate_limit=True, validate_client=False)
+SKIP = EdgePolicy(rate_limit=False, validate_client=False)
+
+
+def build_edge_policies(
+    validate_client_on_reads: bool,
+) -> list[tuple[re.Pattern[str], frozenset[str] | None, EdgePolicy]]:
+    return [
+        (re.compile(r"^/(health|metrics(/aws)?)$"), None, SKIP),
+        (re.compile(r"^/(docs|redoc|openapi\.json)"), READ_METHODS, RATE_LIMIT_ONLY),
+        (re.compile(r"^/api/"), frozenset({"OPTIONS"}), RATE_LIMIT_ONLY),
+        (
+            re.compile(r"^/api/"),
+            READ_METHODS,
+            FULL if validate_client_on_reads else RATE_LIMIT_ONLY,
+        ),
+    ]
+
+
+EDGE_POLICIES = build_edge_policies(settings.validate_client_on_reads)
+
+
+def resolve_edge_policy(method: str, path: str) -> EdgePolicy:
+    for pattern, methods, policy in EDGE_POLICIES:
+        if (methods is None or method in methods) and pattern.match(path):
+            return policy
+    return FULL
+
+
+def get_edge_policy(scope: Scope) -> EdgePolicy:
+    policy = scope.get("edge_policy")
+    if policy is None:
+        policy = scope["edge_policy"] = resolve_edge_policy(
+            scope["method"], scope["path"]
+        )
+    return policy
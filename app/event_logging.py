@@ -0,0 +1,63 @@
+import functools
+import random
+import time
+from typing import Any, Callable, TypeVar
+
+from aws_lambda_powertools import Logger
+
+from app import settings
+
+REDACTED = "[REDACTED]"
+REDACTED_HEADERS = frozenset({"authorization", "cookie", "x-api-key"})
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+logger = Logger(utc=True)
+
+
+def redact_event(event: dict[str, Any], max_body_size: int | None) -> dict[str, Any]:
+    event = dict(event)
+    for key in ("headers", "multiValueHeaders"):
+        if event.get(key):
+            event[key] = {
+                name: REDACTED if name.lower() in REDACTED_HEADERS else value
+                for name, value in event[key].items()
+            }
+    if event.get("cookies"):
+        event["cookies"] = REDACTED
+    body = event.get("body")
+    if max_body_size is not None and body and len(body) > max_body_size:
+        event["body"] = f"{body[:max_body_size]}...[truncated {len(body)} bytes]"
+    return event
+
+
+def log_sampled_event(handler: F) -> F:
+    @functools.wraps(handler)
+    def wrapper(event: dict[str, Any], context: Any) -> Any:
+        start = time.perf_counter()
+        status_code = None
+        try:
+            response = handler(event, context)
+            if isinstance(response, dict):
+                status_code = response.get("statusCode")
+            return response
+        finally:
+            _log_event(event, (time.perf_counter() - start) * 1000, status_code)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _log_event(event: dict[str, Any], duration: float, status_code: int | None) -> None:
+    failed = status_code is None or status_code >= 500
+    if failed or duration >= settings.event_log_slow_threshold_in_ms:
+        max_body_size = None
+    elif random.random() < settings.event_log_sample_rate:
+        max_body_size = settings.event_log_max_body_size
+    else:
+        return
+    logger.info(
+        "Received event",
+        event=redact_event(event, max_body_size),
+        duration=round(duration, 2),
+        status_code=status_code,
+    )
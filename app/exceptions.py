@@ -13,6 +13,21 @@ class BucketNotFoundException(HTTPException):
         super().__init__(status.HTTP_500_INTERNAL_SERVER_ERROR, detail)
 
 
+class DatabaseTimeoutException(HTTPException):
+    def __init__(self, detail: Any = None) -> None:
+        super().__init__(status.HTTP_504_GATEWAY_TIMEOUT, detail=detail)
+
+
+class InvalidCursorException(HTTPException):
+    def __init__(self, detail: Any = None) -> None:
+        super().__init__(status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+class SecretUnavailableException(HTTPException):
+    def __init__(self, detail: Any = None) -> None:
+        super().__init__(status.HTTP_503_SERVICE_UNAVAILABLE, detail=detail)
+
+
 class ObjectNotFoundException(HTTPException):
     def __init__(self, detail: Any = None) -> None:
         super().__init__(status.HTTP_500_INTERNAL_SERVER_ERROR, detail)
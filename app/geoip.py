@@ -0,0 +1,156 @@
+import csv
+import ipaddress
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from typing import Iterable
+
+from aws_lambda_powertools import Logger
+
+logger = Logger(utc=True)
+
+
+class _PackedKeys:
+    def __init__(self, buffer: memoryview, size: int):
+        self._buffer = buffer
+        self._size = size
+
+    def __getitem__(self, index: int) -> bytes:
+        start = index * self._size
+        end = start + self._size
+        return bytes(self._buffer[start:end])
+
+    def __len__(self) -> int:
+        return len(self._buffer) // self._size
+
+
+class IPRangeDatabase:
+    HEADER = struct.Struct("<4sHHII")
+    MAGIC = b"IPDB"
+    VERSION = 1
+
+    def __init__(self, buffer: memoryview):
+        magic, version, _, v4_count, v6_count = self.HEADER.unpack_from(buffer)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError("Unsupported IP range database format")
+        offset = self.HEADER.size
+        self._v4_starts, offset = self._ints(buffer, offset, v4_count)
+        self._v4_ends, offset = self._ints(buffer, offset, v4_count)
+        self._v4_countries, offset = self._slice(buffer, offset, 2 * v4_count)
+        v6_starts, offset = self._slice(buffer, offset, 16 * v6_count)
+        v6_ends, offset = self._slice(buffer, offset, 16 * v6_count)
+        self._v6_countries, offset = self._slice(buffer, offset, 2 * v6_count)
+        self._v6_starts = _PackedKeys(v6_starts, 16)
+        self._v6_ends = _PackedKeys(v6_ends, 16)
+
+    def __len__(self) -> int:
+        return len(self._v4_starts) + len(self._v6_starts)
+
+    @staticmethod
+    def _ints(
+        buffer: memoryview, offset: int, count: int
+    ) -> tuple["memoryview | array[int]", int]:
+        end = offset + 4 * count
+        view = buffer[offset:end].cast("I")
+        if sys.byteorder == "little":
+            return view, end
+        swapped = array("I", view)
+        swapped.byteswap()
+        return swapped, end
+
+    @staticmethod
+    def _slice(buffer: memoryview, offset: int, size: int) -> tuple[memoryview, int]:
+        end = offset + size
+        return buffer[offset:end], end
+
+    @classmethod
+    def from_file(cls, path: str) -> "IPRangeDatabase":
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(memoryview(buffer))
+
+    @classmethod
+    def build(cls, ranges: Iterable[tuple[str, str, str]]) -> bytes:
+        v4: list[tuple[int, int, bytes]] = []
+        v6: list[tuple[bytes, bytes, bytes]] = []
+        for start, end, country_code in ranges:
+            first, last = ipaddress.ip_address(start), ipaddress.ip_address(end)
+            if first.version != last.version or int(first) > int(last):
+                raise ValueError(f"Invalid IP range {start=} {end=}")
+            code = country_code.strip().upper().encode("ascii")
+            if len(code) != 2:
+                raise ValueError(f"Invalid {country_code=}")
+            if first.version == 4:
+                v4.append((int(first), int(last), code))
+            else:
+                v6.append((first.packed, last.packed, code))
+        v4.sort()
+        v6.sort()
+        return b"".join(
+            [
+                cls.HEADER.pack(cls.MAGIC, cls.VERSION, 0, len(v4), len(v6)),
+                struct.pack(f"<{len(v4)}I", *(first for first, _, _ in v4)),
+                struct.pack(f"<{len(v4)}I", *(last for _, last, _ in v4)),
+                b"".join(code for _, _, code in v4),
+                b"".join(first for first, _, _ in v6),
+                b"".join(last for _, last, _ in v6),
+                b"".join(code for _, _, code in v6),
+            ]
+        )
+
+    def lookup(self, ip: str) -> str | None:
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return None
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if address.version == 4:
+            value = int(address)
+            index = bisect_right(self._v4_starts, value) - 1
+            if index >= 0 and value <= self._v4_ends[index]:
+                return self._country(self._v4_countries, index)
+        else:
+            key = address.packed
+            index = bisect_right(self._v6_starts, key) - 1
+            if index >= 0 and key <= self._v6_ends[index]:
+                return self._country(self._v6_countries, index)
+        return None
+
+    @staticmethod
+    def _country(countries: memoryview, index: int) -> str:
+        start = 2 * index
+        end = start + 2
+        return bytes(countries[start:end]).decode("ascii")
+
+
+def read_ranges(path: str) -> Iterable[tuple[str, str, str]]:
+    with open(path, newline="") as file:
+        for row in csv.reader(file):
+            if not row or row[0].startswith("#"):
+                continue
+            if len(row) == 2:
+                network = ipaddress.ip_network(row[0].strip(), strict=False)
+                yield str(network[0]), str(network[-1]), row[1]
+            else:
+                yield row[0].strip(), row[1].strip(), row[2]
+
+
+def load_country_database(path: str | None) -> IPRangeDatabase | None:
+    if not path:
+        return None
+    try:
+        database = IPRangeDatabase.from_file(path)
+    except (OSError, ValueError):
+        logger.exception(f"Failed to load country database {path=}")
+        return None
+    logger.info(f"Loaded country database {path=} with {len(database)} ranges")
+    return database
+
+
+if __name__ == "__main__":
+    source, target = sys.argv[1:3]
+    with open(target, "wb") as output:
+        output.write(IPRangeDatabase.build(read_ranges(source)))
@@ -0,0 +1,209 @@
+import contextvars
+import math
+import threading
+import time
+from array import array
+from concurrent.futures import (FIRST_COMPLETED, Future, ThreadPoolExecutor,
+                                wait)
+from typing import Any, Callable, TypeVar
+
+from aws_lambda_powertools import Logger
+
+from app.exceptions import DatabaseTimeoutException
+from app.settings import Settings
+
+T = TypeVar("T")
+
+
+class RollingLatency:
+    def __init__(self, size: int):
+        self._index = 0
+        self._lock = threading.Lock()
+        self._samples = array("d", bytes(8 * size))
+        self._sorted: list[float] | None = None
+        self.count = 0
+
+    def observe(self, duration: float) -> None:
+        with self._lock:
+            self._samples[self._index] = duration
+            self._index = (self._index + 1) % len(self._samples)
+            self.count += 1
+            self._sorted = None
+
+    def percentile(self, percentile: float) -> float:
+        with self._lock:
+            if self._sorted is None:
+                self._sorted = sorted(
+                    self._samples[: min(self.count, len(self._samples))]
+                )
+            samples = self._sorted
+        if not samples:
+            return 0.0
+        return samples[max(0, math.ceil(percentile / 100 * len(samples)) - 1)]
+
+
+class HedgedCaller:
+    def __init__(self, settings: Settings):
+        self._executor: ThreadPoolExecutor | None = None
+        self._hedging = settings.db_hedging
+        self._hedge_percentile = settings.db_hedge_percentile
+        self._latencies: dict[str, RollingLatency] = {}
+        self._lock = threading.Lock()
+        self._logger = Logger(utc=True)
+        self._max_timeout = settings.aws_read_timeout_in_seconds * 1000
+        self._min_samples = settings.db_latency_min_samples
+        self._min_timeout = settings.db_min_timeout_in_ms
+        self._timeout_multiplier = settings.db_timeout_multiplier
+        self._window = settings.db_latency_window
+        self._workers = settings.db_read_workers
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.timeouts = 0
+
+    def latency(self, operation: str) -> RollingLatency:
+        latency = self._latencies.get(operation)
+        if latency is None:
+            with self._lock:
+                latency = self._latencies.setdefault(
+                    operation, RollingLatency(self._window)
+                )
+        return latency
+
+    def timeout(self, operation: str) -> float | None:
+        latency = self.latency(operation)
+        if latency.count < self._min_samples:
+            return None
+        return min(
+            max(latency.percentile(99) * self._timeout_multiplier, self._min_timeout),
+            self._max_timeout,
+        )
+
+    def hedge_delay(self, operation: str) -> float | None:
+        latency = self.latency(operation)
+        if not self._hedging or latency.count < self._min_samples:
+            return None
+        return latency.percentile(self._hedge_percentile)
+
+    def run(self, operation: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        latency = self.latency(operation)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            latency.observe((time.perf_counter() - start) * 1000)
+
+    def read(
+        self,
+        operation: str,
+        fn: Callable[..., T],
+        *args: Any,
+        hedge: bool = False,
+        **kwargs: Any,
+    ) -> T:
+        timeout = self.timeout(operation)
+        if timeout is None:
+            return self.run(operation, fn, *args, **kwargs)
+        started = threading.Event()
+        futures = [self._submit(started, operation, fn, *args, **kwargs)]
+        started.wait()
+        deadline = time.perf_counter() + timeout / 1000
+        try:
+            hedge_delay = self.hedge_delay(operation) if hedge else None
+            if hedge_delay is not None and hedge_delay < timeout:
+                wait(futures, timeout=hedge_delay / 1000)
+                if not futures[0].done():
+                    self._logger.debug(
+                        f"Hedging {operation=} after {hedge_delay=:.2f}ms"
+                    )
+                    with self._lock:
+                        self.hedges += 1
+                    futures.append(
+                        self._submit(threading.Event(), operation, fn, *args, **kwargs)
+                    )
+            pending = set(futures)
+            error: BaseException | None = None
+            while pending:
+                done, pending = wait(
+                    pending,
+                    timeout=max(0.0, deadline - time.perf_counter()),
+                    return_when=FIRST_COMPLETED,
+                )
+                if not done:
+                    break
+                for future in done:
+                    if future.cancelled():
+                        continue
+                    if future.exception() is None:
+                        if future is not futures[0]:
+                            with self._lock:
+                                self.hedge_wins += 1
+                        return future.result()
+                    error = future.exception()
+            if error is not None and not pending:
+                raise error
+        finally:
+            for future in futures:
+                future.cancel()
+        with self._lock:
+            self.timeouts += 1
+        self._logger.warning(f"Timed out {operation=} after {timeout=:.2f}ms")
+        raise DatabaseTimeoutException(
+            f"The database did not respond in {timeout:.0f}ms"
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "timeouts": self.timeouts,
+            "operations": {
+                operation: {
+                    "count": latency.count,
+                    "p50": round(latency.percentile(50), 2),
+                    "p95": round(latency.percentile(95), 2),
+                    "p99": round(latency.percentile(99), 2),
+                    "timeout_in_ms": self.timeout(operation),
+                }
+                for operation, latency in sorted(self._latencies.items())
+            },
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(
+        self,
+        started: threading.Event,
+        operation: str,
+        fn: Callable[..., T],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Future[T]:
+        executor = self._executor
+        if executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._workers, thread_name_prefix="hedged-read"
+                    )
+                executor = self._executor
+        context = contextvars.copy_context()
+        future = executor.submit(
+            context.run, self._attempt, started, operation, fn, *args, **kwargs
+        )
+        future.add_done_callback(lambda _: started.set())
+        return future
+
+    def _attempt(
+        self,
+        started: threading.Event,
+        operation: str,
+        fn: Callable[..., T],
+        *args: Any,
+        **kwargs: Any,
+    ) -> T:
+        started.set()
+        return self.run(operation, fn, *args, **kwargs)
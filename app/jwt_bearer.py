@@ -1,15 +1,24 @@
+import hashlib
+import time
+
 import jwt
 from aws_lambda_powertools import Logger
 from fastapi import HTTPException, Request, status
 from fastapi.security.http import HTTPAuthorizationCredentials
 from fastapi.security.http import HTTPBearer as FastAPIHTTPBearer
 from fastapi.security.utils import get_authorization_scheme_param
-from jwt import DecodeError, ExpiredSignatureError
+from jwt import DecodeError, ExpiredSignatureError, InvalidSignatureError
 
 from app import settings
+from app.cache import TTLCache
+from app.jwt_secret_provider import jwt_secret_provider
 from app.models.auth import JWTToken
+from app.timing import timed
 
 logger = Logger(utc=True)
+verified_tokens: TTLCache[bytes, JWTToken] = TTLCache(
+    settings.jwt_cache_max_size, settings.jwt_cache_ttl_in_seconds
+)
 
 ERROR_MESSAGE_NOT_AUTHENTICATED = "Not authenticated"
 
@@ -72,31 +81,50 @@ class HTTPBearer(FastAPIHTTPBearer):
 class JWTBearer:
     def __init__(self, auto_error: bool = True):
         self._auto_error = auto_error
+        self._http_bearer = HTTPBearer(auto_error)
 
     def __call__(self, request: Request) -> JWTToken | None:
-        credentials = HTTPBearer(self._auto_error).__call__(request)
-        if credentials:
-            if not self._validate_token(credentials.credentials):
-                if self._auto_error:
-                    logger.warning(f"Invalid authentication token {credentials=}")
-                    raise HTTPException(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        detail=ERROR_MESSAGE_NOT_AUTHENTICATED,
-                    )
-                else:
-                    return None
-            return self.decoded_token
-        else:
+        with timed("jwt"):
+            return self._authenticate(request)
+
+    def _authenticate(self, request: Request) -> JWTToken | None:
+        credentials = self._http_bearer(request)
+        if not credentials:
             return None
+        decoded_token = self._validate_token(credentials.credentials)
+        if decoded_token is None and self._auto_error:
+            logger.warning(f"Invalid authentication token {credentials=}")
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=ERROR_MESSAGE_NOT_AUTHENTICATED,
+            )
+        return decoded_token
 
-    def _validate_token(self, token: str) -> bool:
+    def _validate_token(self, token: str) -> JWTToken | None:
+        key = hashlib.sha256(token.encode()).digest()
+        decoded_token = verified_tokens.get(key)
+        if decoded_token is not None:
+            return decoded_token
         try:
-            self.decoded_token = JWTToken(
-                **jwt.decode(token, settings.jwt_secret, algorithms=["HS256"])
-            )
-            return True
+            kid = jwt.get_unverified_header(token).get("kid")
+            for secret in jwt_secret_provider.get_secrets(kid):
+                try:
+                    payload = jwt.decode(token, secret, algorithms=["HS256"])
+                except InvalidSignatureError:
+                    continue
+                decoded_token = JWTToken(**payload)
+                verified_tokens.set(
+                    key,
+                    decoded_token,
+                    min(
+                        settings.jwt_cache_ttl_in_seconds,
+                        decoded_token.exp - time.time(),
+                    ),
+                )
+                return decoded_token
+            logger.warning(f"No JWT secret matches token signature {kid=}")
         except DecodeError:
             logger.exception("Error occurred during token decoding")
         except ExpiredSignatureError:
             logger.exception("Expired signature")
-        return False
+        return None
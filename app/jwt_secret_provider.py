@@ -0,0 +1,114 @@
+import json
+import threading
+import time
+
+from aws_lambda_powertools import Logger
+from aws_lambda_powertools.utilities.parameters.exceptions import \
+    GetParameterError
+
+from app import settings
+from app.settings import Settings
+
+DEFAULT_KEY_ID = "default"
+
+
+def parse_keys(value: str) -> dict[str, str]:
+    try:
+        keys = json.loads(value)
+    except ValueError:
+        return {DEFAULT_KEY_ID: value}
+    if isinstance(keys, dict) and keys:
+        return {str(kid): str(secret) for kid, secret in keys.items()}
+    return {DEFAULT_KEY_ID: value}
+
+
+class JWTSecretProvider:
+    FAILURE_BACKOFF_IN_SECONDS = 30.0
+    MIN_FORCED_REFRESH_INTERVAL_IN_SECONDS = 30.0
+
+    def __init__(self, settings: Settings):
+        self._force_fetch = False
+        self._expires_at = 0.0
+        self._keys: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._logger = Logger(utc=True)
+        self._refresh_after = 0.0
+        self._refresh_ahead = min(
+            settings.jwt_secret_refresh_ahead_in_seconds,
+            settings.jwt_secret_ttl_in_seconds,
+        )
+        self._refreshed_at = float("-inf")
+        self._refreshing = False
+        self._settings = settings
+        self._ttl = settings.jwt_secret_ttl_in_seconds
+
+    def get_keys(self) -> dict[str, str]:
+        now = time.monotonic()
+        if now >= self._expires_at:
+            with self._lock:
+                if time.monotonic() >= self._expires_at:
+                    self._fetch()
+        elif now >= self._refresh_after and not self._refreshing:
+            self._start_refresh()
+        return self._keys
+
+    def get_secrets(self, kid: str | None) -> list[str]:
+        keys = self.get_keys()
+        if kid is None:
+            return list(keys.values())
+        secret = keys.get(kid)
+        if secret is None and (
+            time.monotonic() - self._refreshed_at
+            >= self.MIN_FORCED_REFRESH_INTERVAL_IN_SECONDS
+        ):
+            self._logger.info(f"Unknown {kid=}, refreshing JWT secrets")
+            secret = self.refresh().get(kid)
+        return [secret] if secret is not None else []
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expires_at = 0.0
+            self._force_fetch = True
+            self._keys = {}
+            self._refresh_after = 0.0
+            self._refreshed_at = float("-inf")
+
+    def refresh(self) -> dict[str, str]:
+        with self._lock:
+            return self._fetch()
+
+    def _start_refresh(self) -> None:
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            start = not self._refreshing
+            self._refreshing = True
+        finally:
+            self._lock.release()
+        if start:
+            threading.Thread(target=self.refresh, daemon=True).start()
+
+    def _fetch(self) -> dict[str, str]:
+        try:
+            value = self._settings.load_secrets(force_fetch=self._force_fetch)[
+                "jwt_secret"
+            ]
+        except GetParameterError:
+            if not self._keys:
+                raise
+            self._logger.exception("Failed to refresh JWT secrets, using cached")
+            self._expires_at = time.monotonic() + self.FAILURE_BACKOFF_IN_SECONDS
+            self._refresh_after = self._expires_at
+            return self._keys
+        finally:
+            self._refreshing = False
+        now = time.monotonic()
+        self._force_fetch = True
+        self._keys = parse_keys(value)
+        self._expires_at = now + self._ttl
+        self._refresh_after = self._expires_at - self._refresh_ahead
+        self._refreshed_at = now
+        return self._keys
+
+
+jwt_secret_provider = JWTSecretProvider(settings)
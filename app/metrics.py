@@ -0,0 +1,142 @@
+import functools
+from array import array
+from bisect import bisect_left
+from typing import Any, Callable, TypeVar
+
+from aws_lambda_powertools.metrics import EphemeralMetrics, MetricUnit
+
+from app import settings
+
+LATENCY_BUCKETS_IN_MS = (
+    5.0,
+    10.0,
+    25.0,
+    50.0,
+    75.0,
+    100.0,
+    150.0,
+    250.0,
+    400.0,
+    600.0,
+    1000.0,
+    1500.0,
+    2500.0,
+    5000.0,
+    10000.0,
+    30000.0,
+)
+MAX_EMF_VALUES = 100
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "count", "max", "sum")
+
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * (len(LATENCY_BUCKETS_IN_MS) + 1)))
+        self.count = 0
+        self.max = 0.0
+        self.sum = 0.0
+
+    def observe(self, duration: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS_IN_MS, duration)] += 1
+        self.count += 1
+        self.max = max(self.max, duration)
+        self.sum += duration
+
+    def percentile(self, percentile: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = percentile / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = LATENCY_BUCKETS_IN_MS[index - 1] if index else 0.0
+                upper = (
+                    LATENCY_BUCKETS_IN_MS[index]
+                    if index < len(LATENCY_BUCKETS_IN_MS)
+                    else self.max
+                )
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": round(self.sum / self.count, 2) if self.count else 0.0,
+            "max": round(self.max, 2),
+            "p50": round(self.percentile(50), 2),
+            "p95": round(self.percentile(95), 2),
+            "p99": round(self.percentile(99), 2),
+            "buckets": dict(
+                zip(
+                    [*map(str, LATENCY_BUCKETS_IN_MS), "+Inf"],
+                    self.counts.tolist(),
+                )
+            ),
+        }
+
+
+class LatencyMetrics:
+    def __init__(self):
+        self._histograms: dict[tuple[str, str], LatencyHistogram] = {}
+        self._pending: dict[tuple[str, str], array] = {}
+        self._pending_counts: dict[tuple[str, str], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._histograms)
+
+    def clear(self) -> None:
+        self._histograms.clear()
+        self._pending.clear()
+        self._pending_counts.clear()
+
+    def observe(self, route: str, status_code: int, duration: float) -> None:
+        key = (route, f"{status_code // 100}xx")
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = LatencyHistogram()
+            self._pending[key] = array("d")
+        histogram.observe(duration)
+        self._pending_counts[key] = self._pending_counts.get(key, 0) + 1
+        if len(self._pending[key]) < MAX_EMF_VALUES:
+            self._pending[key].append(duration)
+
+    def snapshot(self) -> dict[str, dict[str, dict[str, Any]]]:
+        snapshot: dict[str, dict[str, dict[str, Any]]] = {}
+        for (route, status_class), histogram in sorted(self._histograms.items()):
+            snapshot.setdefault(route, {})[status_class] = histogram.summary()
+        return snapshot
+
+    def flush(self) -> None:
+        for key, count in self._pending_counts.items():
+            route, status_class = key
+            metrics = EphemeralMetrics(
+                namespace=settings.app_name, service=settings.app_name
+            )
+            metrics.add_dimension(name="route", value=route)
+            metrics.add_dimension(name="status_class", value=status_class)
+            for duration in self._pending[key]:
+                metrics.add_metric(
+                    name="Latency", unit=MetricUnit.Milliseconds, value=duration
+                )
+            metrics.add_metric(name="Requests", unit=MetricUnit.Count, value=count)
+            metrics.flush_metrics()
+            del self._pending[key][:]
+        self._pending_counts.clear()
+
+
+latency_metrics = LatencyMetrics()
+
+
+def log_latency_metrics(handler: F) -> F:
+    @functools.wraps(handler)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return handler(*args, **kwargs)
+        finally:
+            latency_metrics.flush()
+
+    return wrapper  # type: ignore[return-value]
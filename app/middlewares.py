@@ -1,150 +1,257 @@
+import asyncio
+import time
 import uuid
 from contextvars import ContextVar
-from datetime import datetime, timedelta
-from typing import Any
+from typing import TYPE_CHECKING
 
-import httpx
 from aws_lambda_powertools import Logger
 from fastapi import status
-from fastapi.requests import Request
-from fastapi.responses import Response, UJSONResponse
-from httpx import HTTPError
-from starlette.middleware.base import (BaseHTTPMiddleware,
-                                       RequestResponseEndpoint)
-from starlette.types import ASGIApp
+from fastapi.responses import UJSONResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app import Settings
+from app import settings
+from app.cache import ExpiringSet, TTLCache
+from app.edge_policy import get_edge_policy
+from app.geoip import IPRangeDatabase, load_country_database
+from app.metrics import latency_metrics
+from app.rate_limiter import create_rate_limiter
+from app.timing import format_server_timing, server_timings, timed
+
+if TYPE_CHECKING:
+    import httpx
 
 COUNTRY_IS_API_BASE_URL = "https://api.country.is"
 X_CORRELATION_ID = "X-Correlation-ID"
 
 correlation_id: ContextVar[str] = ContextVar(X_CORRELATION_ID)
 logger = Logger(utc=True)
-settings = Settings()
 
-banned_hosts: list[str] = []
-clients: dict[str, Any] = {}
+banned_hosts: ExpiringSet[str] = ExpiringSet(
+    settings.banned_hosts_max_size, settings.banned_hosts_ttl_in_seconds
+)
+host_verdicts: TTLCache[str, bool] = TTLCache(
+    settings.geo_cache_max_size, settings.geo_cache_ttl_in_seconds
+)
+pending_lookups: dict[str, asyncio.Future[bool]] = {}
+rate_limiter = create_rate_limiter(settings)
+country_database: IPRangeDatabase | None = (
+    load_country_database(settings.country_database_path)
+    if settings.country_lookup == "local"
+    else None
+)
+
+_country_client: "httpx.AsyncClient | None" = None
+_country_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_country_client() -> "httpx.AsyncClient":
+    import httpx
+
+    global _country_client, _country_client_loop
+    loop = asyncio.get_running_loop()
+    if _country_client is None or _country_client_loop is not loop:
+        _country_client = httpx.AsyncClient(
+            timeout=settings.geo_lookup_timeout_in_seconds
+        )
+        _country_client_loop = loop
+    return _country_client
 
 
-class ClientValidationMiddleware(BaseHTTPMiddleware):
+def get_client_ip(scope: Scope) -> str | None:
+    client = scope.get("client")
+    return client[0] if client else None
+
+
+class ClientValidationMiddleware:
     RESTRICTED_COUNTRY_CODES = ["CN", "RU"]
     WHITELIST = ["127.0.0.1", "localhost", "::1"]
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        if (
-            not request.client
-            or not request.client.host
-            or request.client.host in self.WHITELIST
-        ):
-            return await call_next(request)
-        client_ip = request.client.host
-        is_banned = client_ip in banned_hosts or await self._validate_host(client_ip)
-        if is_banned:
-            if client_ip not in banned_hosts:
-                banned_hosts.append(client_ip)
-            return UJSONResponse(
-                content={"message": "Forbidden"},
-                status_code=status.HTTP_403_FORBIDDEN,
-            )
-        return await call_next(request)
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not get_edge_policy(scope).validate_client:
+            return await self.app(scope, receive, send)
+        client_ip = get_client_ip(scope)
+        if not client_ip or client_ip in self.WHITELIST:
+            return await self.app(scope, receive, send)
+        with timed("geo"):
+            is_banned = client_ip in banned_hosts
+            is_restricted = not is_banned and await self._is_restricted(client_ip)
+        if is_restricted:
+            banned_hosts.add(client_ip)
+        if is_banned or is_restricted:
+            return await self._forbidden(scope, receive, send)
+        await self.app(scope, receive, send)
+
+    async def _forbidden(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = UJSONResponse(
+            content={"message": "Forbidden"},
+            status_code=status.HTTP_403_FORBIDDEN,
+        )
+        await response(scope, receive, send)
+
+    async def _is_restricted(self, client_ip: str) -> bool:
+        verdict = host_verdicts.get(client_ip)
+        if verdict is not None:
+            return verdict
+        if country_database:
+            country_code = country_database.lookup(client_ip)
+            if country_code:
+                return self._set_verdict(client_ip, country_code)
+        lookup = pending_lookups.get(client_ip)
+        if lookup is None:
+            lookup = asyncio.ensure_future(self._validate_host(client_ip))
+            pending_lookups[client_ip] = lookup
+            lookup.add_done_callback(lambda _: pending_lookups.pop(client_ip, None))
+        return await asyncio.shield(lookup)
 
     async def _validate_host(self, client_ip: str) -> bool:
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(f"{COUNTRY_IS_API_BASE_URL}/{client_ip}")
-                response.raise_for_status()
-                if response.json()["country"] in self.RESTRICTED_COUNTRY_CODES:
-                    logger.info(
-                        f"Client has restricted "
-                        f"country_code={response.json()['country']} with {client_ip=}"
-                    )
-                    return True
-            except HTTPError as exc:
-                logger.warning(f"HTTP exception for {exc.request.url}")
-        return False
-
-
-class CorrelationIdMiddleware(BaseHTTPMiddleware):
+        from httpx import HTTPError
+
+        try:
+            response = await get_country_client().get(
+                f"{COUNTRY_IS_API_BASE_URL}/{client_ip}"
+            )
+            response.raise_for_status()
+            country_code = response.json()["country"]
+        except HTTPError as exc:
+            logger.warning(f"HTTP exception for {exc.request.url}")
+            return False
+        return self._set_verdict(client_ip, country_code)
+
+    def _set_verdict(self, client_ip: str, country_code: str) -> bool:
+        is_restricted = country_code in self.RESTRICTED_COUNTRY_CODES
+        if is_restricted:
+            logger.info(
+                f"Client has restricted country_code={country_code} with {client_ip=}"
+            )
+        host_verdicts.set(client_ip, is_restricted)
+        return is_restricted
+
+
+class CorrelationIdMiddleware:
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        aws_context = scope.get("aws.context")
         correlation_id.set(
-            request.headers.get(X_CORRELATION_ID)
-            or request.scope.get("aws.context", {}).aws_request_id
-            if request.scope.get("aws.context")
-            else str(uuid.uuid4())
+            Headers(scope=scope).get(X_CORRELATION_ID)
+            or (aws_context.aws_request_id if aws_context else str(uuid.uuid4()))
         )
         logger.set_correlation_id(correlation_id.get())
-        response = await call_next(request)
-        response.headers[X_CORRELATION_ID] = correlation_id.get()
-        return response
 
+        async def send_with_correlation_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[X_CORRELATION_ID] = correlation_id.get()
+            await send(message)
 
-class RateLimitingMiddleware(BaseHTTPMiddleware):
-    RATE_LIMIT_DURATION = timedelta(seconds=settings.rate_limit_duration_in_seconds)
+        await self.app(scope, receive, send_with_correlation_id)
 
+
+class LatencyMetricsMiddleware:
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
-
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        if settings.rate_limiting:
-            client_ip = request.client.host if request.client else None
-            if client_ip:
-                rate_limited_response = self._check_rate_limit(client_ip)
-                if rate_limited_response:
-                    return rate_limited_response
-                response = await call_next(request)
-                response.headers.update(
-                    self._get_rate_limit_headers(clients[client_ip])
-                )
-                return response
-            else:
-                logger.warning("Missing client information. Skipping rate limiting")
-        else:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+
+        async def send_with_status_code(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status_code)
+        finally:
+            route = scope.get("route")
+            latency_metrics.observe(
+                f"{scope['method']} {route.path if route else 'UNMATCHED'}",
+                status_code,
+                (time.perf_counter() - start) * 1000,
+            )
+
+
+class RateLimitingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not get_edge_policy(scope).rate_limit:
+            return await self.app(scope, receive, send)
+        if not settings.rate_limiting:
             logger.info("Rate limiting is turned off")
-        return await call_next(request)
+            return await self.app(scope, receive, send)
+        client_ip = get_client_ip(scope)
+        if not client_ip:
+            logger.warning("Missing client information. Skipping rate limiting")
+            return await self.app(scope, receive, send)
+        with timed("ratelimit"):
+            rate_limit = (
+                await run_in_threadpool(rate_limiter.acquire, client_ip)
+                if rate_limiter.blocking
+                else rate_limiter.acquire(client_ip)
+            )
+        headers = rate_limit.headers()
+        if not rate_limit.allowed:
+            logger.warning(
+                "The client has exceeded the rate limit and has been rate limited",
+                host=client_ip,
+            )
+            response = UJSONResponse(
+                content={"message": "Rate limit exceeded. Please try again later"},
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers=headers,
+            )
+            return await response(scope, receive, send)
 
-    def _check_rate_limit(self, client_ip: str) -> UJSONResponse | None:
-        client = clients.get(
-            client_ip, {"request_count": 0, "last_request": datetime.min}
-        )
-        if (datetime.now() - client["last_request"]) > self.RATE_LIMIT_DURATION:
-            client["request_count"] = 1
-        else:
-            if client["request_count"] >= settings.rate_limit_requests:
-                logger.warning(
-                    "The client has exceeded the rate limit and has been rate limited",
-                    host=client_ip,
-                )
-                return UJSONResponse(
-                    content={"message": "Rate limit exceeded. Please try again later"},
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    headers=self._get_rate_limit_headers(client),
-                )
-            client["request_count"] += 1
-        client["last_request"] = datetime.now()
-        clients[client_ip] = client
-        return None
-
-    def _get_rate_limit_headers(self, client: dict[str, Any]) -> dict[str, Any]:
-        return {
-            "X-RateLimit-Limit": str(settings.rate_limit_requests),
-            "X-RateLimit-Remaining": str(
-                settings.rate_limit_requests - client["request_count"]
-            ),
-            "X-RateLimit-Reset": str(
-                int(
-                    (
-                        client["last_request"].replace(second=0, microsecond=0)
-                        + timedelta(minutes=1)
-                    ).timestamp()
+        async def send_with_rate_limit_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_rate_limit_headers)
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.server_timing:
+            return await self.app(scope, receive, send)
+        timings: dict[str, float] = {}
+        token = server_timings.set(timings)
+        start = time.perf_counter()
+        status_code = None
+
+        async def send_with_server_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                timings["total"] = (time.perf_counter() - start) * 1000
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", format_server_timing(timings)
                 )
-            ),
-        }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            server_timings.reset(token)
+            logger.info(
+                "Server timing",
+                method=scope["method"],
+                path=scope["path"],
+                status_code=status_code,
+                timings={name: round(value, 2) for name, value in timings.items()},
+            )
@@ -26,5 +26,5 @@ class Post(CamelModel):
 
 
 class Page(CamelModel):
-    exclusive_start_key: str | None = None
+    next_cursor: str | None = None
     posts: list[Post]
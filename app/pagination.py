@@ -0,0 +1,73 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+from typing import Any, Callable
+
+from aws_lambda_powertools import Logger
+from aws_lambda_powertools.utilities.parameters.exceptions import \
+    GetParameterError
+
+from app.exceptions import InvalidCursorException, SecretUnavailableException
+
+ERROR_INVALID_CURSOR = "The pagination cursor is invalid"
+ERROR_SECRET_UNAVAILABLE = "The pagination cursor secret is unavailable"
+
+
+def b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class CursorCodec:
+    CONTEXT = b"pagination-cursor"
+
+    def __init__(self, keys: Callable[[], dict[str, str]]):
+        self._keys = keys
+        self._logger = Logger(utc=True)
+
+    def encode(self, key: dict[str, Any]) -> str:
+        payload = json.dumps(key, separators=(",", ":"), sort_keys=True).encode()
+        secret = next(iter(self._get_keys().values()))
+        return f"{b64encode(payload)}.{b64encode(self._sign(secret, payload))}"
+
+    def decode(self, cursor: str) -> dict[str, Any]:
+        try:
+            encoded_payload, encoded_signature = cursor.split(".")
+            payload = b64decode(encoded_payload)
+            signature = b64decode(encoded_signature)
+        except (binascii.Error, ValueError):
+            self._logger.warning(f"Malformed {cursor=}")
+            raise InvalidCursorException(ERROR_INVALID_CURSOR)
+        if not any(
+            hmac.compare_digest(self._sign(secret, payload), signature)
+            for secret in self._get_keys().values()
+        ):
+            self._logger.warning(f"Invalid signature of {cursor=}")
+            raise InvalidCursorException(ERROR_INVALID_CURSOR)
+        try:
+            key = json.loads(payload)
+        except ValueError:
+            raise InvalidCursorException(ERROR_INVALID_CURSOR)
+        if not isinstance(key, dict) or not key:
+            raise InvalidCursorException(ERROR_INVALID_CURSOR)
+        return key
+
+    def _get_keys(self) -> dict[str, str]:
+        try:
+            keys = self._keys()
+        except GetParameterError:
+            self._logger.exception("Failed to load the cursor secret")
+            raise SecretUnavailableException(ERROR_SECRET_UNAVAILABLE)
+        if not keys:
+            self._logger.error("The cursor secret is not configured")
+            raise SecretUnavailableException(ERROR_SECRET_UNAVAILABLE)
+        return keys
+
+    def _sign(self, secret: str, payload: bytes) -> bytes:
+        key = hmac.digest(secret.encode(), self.CONTEXT, hashlib.sha256)
+        return hmac.digest(key, payload, hashlib.sha256)
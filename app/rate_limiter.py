@@ -0,0 +1,229 @@
+import math
+import threading
+import time
+from itertools import islice
+from typing import NamedTuple
+
+from aws_lambda_powertools import Logger
+from botocore.exceptions import BotoCoreError, ClientError
+
+from app.container import container
+from app.repositories.rate_limit_repository import RateLimitRepository
+from app.settings import Settings
+
+
+class RateLimit(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(time.time() + self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(math.ceil(self.retry_after))
+        return headers
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated_at")
+
+    def __init__(self, tokens: float, updated_at: float):
+        self.tokens = tokens
+        self.updated_at = updated_at
+
+
+class RateLimiter:
+    blocking = False
+
+    def __init__(self, limit: int, period: float, max_clients: int):
+        self._buckets: dict[str, TokenBucket] = {}
+        self._limit = limit
+        self._max_clients = max_clients
+        self._next_eviction = time.monotonic() + period
+        self._period = period
+        self._refill_rate = limit / period
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def acquire(self, key: str) -> RateLimit:
+        now = time.monotonic()
+        if now >= self._next_eviction:
+            self.evict_idle(now)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self._max_clients:
+                self._evict_oldest()
+            bucket = self._buckets[key] = TokenBucket(self._limit, now)
+        else:
+            bucket.tokens = min(
+                self._limit,
+                bucket.tokens + (now - bucket.updated_at) * self._refill_rate,
+            )
+            bucket.updated_at = now
+        allowed = bucket.tokens >= 1
+        if allowed:
+            bucket.tokens -= 1
+        return RateLimit(
+            allowed=allowed,
+            limit=self._limit,
+            remaining=int(bucket.tokens),
+            reset_after=(self._limit - bucket.tokens) / self._refill_rate,
+            retry_after=max(0.0, 1 - bucket.tokens) / self._refill_rate,
+        )
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+    def evict_idle(self, now: float | None = None) -> int:
+        now = time.monotonic() if now is None else now
+        idle_since = now - self._period
+        idle_keys = [
+            key
+            for key, bucket in self._buckets.items()
+            if bucket.updated_at <= idle_since
+        ]
+        for key in idle_keys:
+            del self._buckets[key]
+        self._next_eviction = now + self._period
+        return len(idle_keys)
+
+    def _evict_oldest(self) -> None:
+        count = max(1, self._max_clients // 10)
+        for key in list(islice(self._buckets, count)):
+            del self._buckets[key]
+
+
+class Lease:
+    __slots__ = ("consumed", "renewing", "tokens")
+
+    def __init__(self):
+        self.consumed = 0
+        self.renewing = threading.Lock()
+        self.tokens = 0
+
+
+class DistributedRateLimiter:
+    FAILURE_COOLDOWN_IN_SECONDS = 30.0
+    blocking = True
+
+    def __init__(
+        self,
+        limit: int,
+        period: int,
+        lease_size: int,
+        repository: RateLimitRepository,
+        local: RateLimiter,
+    ):
+        self._disabled_until = 0.0
+        self._lease_size = max(1, min(lease_size, limit))
+        self._leases: dict[str, Lease] = {}
+        self._limit = limit
+        self._local = local
+        self._lock = threading.Lock()
+        self._logger = Logger(utc=True)
+        self._period = period
+        self._repository = repository
+        self._window = 0
+
+    def __len__(self) -> int:
+        return len(self._leases)
+
+    def acquire(self, key: str) -> RateLimit:
+        with self._lock:
+            rate_limit = self._local.acquire(key)
+            if not rate_limit.allowed or time.monotonic() < self._disabled_until:
+                return rate_limit
+            now = time.time()
+            window = int(now // self._period)
+            if window != self._window:
+                self._leases.clear()
+                self._window = window
+            lease = self._leases.get(key)
+            if lease is None:
+                lease = self._leases[key] = Lease()
+            if not self._needs_renewal(lease):
+                return self._take(lease, rate_limit, window, now)
+        with lease.renewing:
+            with self._lock:
+                if time.monotonic() < self._disabled_until:
+                    return rate_limit
+                if not self._needs_renewal(lease):
+                    return self._take(lease, rate_limit, window, now)
+            try:
+                consumed, tokens = self._lease_tokens(
+                    f"{key}#{window}", (window + 2) * self._period
+                )
+            except (BotoCoreError, ClientError):
+                self._logger.exception(
+                    "Shared rate limit backend is unavailable, "
+                    "falling back to local rate limiting"
+                )
+                with self._lock:
+                    self._disabled_until = (
+                        time.monotonic() + self.FAILURE_COOLDOWN_IN_SECONDS
+                    )
+                return rate_limit
+            with self._lock:
+                lease.consumed = consumed
+                lease.tokens = tokens
+                return self._take(lease, rate_limit, window, now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._disabled_until = 0.0
+            self._leases.clear()
+            self._local.clear()
+
+    def _lease_tokens(self, key: str, expires_at: int) -> tuple[int, int]:
+        for count in dict.fromkeys((self._lease_size, 1)):
+            consumed = self._repository.lease_tokens(
+                key, count, self._limit, expires_at
+            )
+            if consumed is not None:
+                return consumed, count
+        return self._limit, 0
+
+    def _needs_renewal(self, lease: Lease) -> bool:
+        return not lease.tokens and lease.consumed < self._limit
+
+    def _take(
+        self, lease: Lease, rate_limit: RateLimit, window: int, now: float
+    ) -> RateLimit:
+        allowed = lease.tokens > 0
+        if allowed:
+            lease.tokens -= 1
+        reset_after = (window + 1) * self._period - now
+        return RateLimit(
+            allowed=allowed,
+            limit=self._limit,
+            remaining=min(
+                rate_limit.remaining,
+                lease.tokens + max(0, self._limit - lease.consumed),
+            ),
+            reset_after=max(reset_after, rate_limit.reset_after),
+            retry_after=reset_after,
+        )
+
+
+def create_rate_limiter(settings: Settings) -> RateLimiter | DistributedRateLimiter:
+    rate_limiter = RateLimiter(
+        settings.rate_limit_requests,
+        settings.rate_limit_duration_in_seconds,
+        settings.rate_limit_max_clients,
+    )
+    if settings.rate_limit_backend == "dynamodb":
+        return DistributedRateLimiter(
+            settings.rate_limit_requests,
+            settings.rate_limit_duration_in_seconds,
+            settings.rate_limit_lease_size,
+            container.rate_limit_repository,
+            rate_limiter,
+        )
+    return rate_limiter
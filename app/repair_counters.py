@@ -0,0 +1,15 @@
+from aws_lambda_powertools import Logger
+
+from app.container import container
+
+logger = Logger(utc=True)
+
+
+def main() -> int:
+    repaired = container.post_service.repair_counters()
+    logger.info(f"Rewrote {repaired} post counters")
+    return repaired
+
+
+if __name__ == "__main__":
+    main()
@@ -1,110 +1,429 @@
-from typing import Any
+import contextvars
+import queue
+import re
+import threading
+from collections import Counter
+from concurrent.futures import CancelledError, Executor, Future
+from decimal import Decimal
+from functools import partial
+from typing import TYPE_CHECKING, Any, Iterator, cast
 
-import boto3
+import pendulum
 from aws_lambda_powertools import Logger
-from boto3.dynamodb.conditions import ConditionBase, Key
+from boto3.dynamodb.conditions import (Attr, ConditionBase,
+                                       ConditionExpressionBuilder, Key)
 
 from app import settings
+from app.hedging import HedgedCaller
+from app.timing import timed
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.service_resource import DynamoDBServiceResource
+    from mypy_boto3_dynamodb.type_defs import ScanOutputTableTypeDef
+
+ARCHIVE_COUNTERS = "archive"
+POST_COUNTERS = "totals"
+POST_COUNTERS_KEY = "posts"
+PUBLISHED_AT_INDEX = "PublishedAtIndex"
+PUBLISHED_KEY = "published_key"
+PUBLISHED_KEY_VALUE = "published"
+PUBLISHED_SORT_KEY = "published_sort_key"
+PUBLISHED_INDEX_KEYS = (PUBLISHED_KEY, PUBLISHED_SORT_KEY)
+MONTH_PREFIX = re.compile(r"\d{4}-(0[1-9]|1[0-2])(-|$)")
+
+
+def published_month(published_at: str) -> str:
+    if MONTH_PREFIX.match(published_at):
+        return published_at[:7]
+    parsed = pendulum.parse(published_at)
+    if not isinstance(parsed, pendulum.DateTime):
+        raise ValueError(f"Invalid {published_at=}")
+    return parsed.format("YYYY-MM")
+
+
+def with_published_index_keys(item: dict[str, Any]) -> dict[str, Any]:
+    item = {
+        key: value for key, value in item.items() if key not in PUBLISHED_INDEX_KEYS
+    }
+    if item.get("published_at") and not item.get("deleted_at"):
+        item[PUBLISHED_KEY] = PUBLISHED_KEY_VALUE
+        item[PUBLISHED_SORT_KEY] = item["published_at"]
+    return item
+
+
+def post_counters(item: dict[str, Any] | None) -> Counter[tuple[str, str, str]]:
+    counters: Counter[tuple[str, str, str]] = Counter()
+    if not item or item.get("deleted_at"):
+        return counters
+    counters[POST_COUNTERS, POST_COUNTERS_KEY, "live"] += 1
+    if item.get("published_at"):
+        month = published_month(item["published_at"])
+        counters[POST_COUNTERS, POST_COUNTERS_KEY, "published"] += 1
+        counters[ARCHIVE_COUNTERS, month, "count"] += 1
+    return counters
 
 
 class PostRepository:
-    def __init__(self):
+    def __init__(
+        self,
+        dynamodb: "DynamoDBServiceResource",
+        calls: HedgedCaller,
+        scan_executor: Executor | None = None,
+    ):
+        self._calls = calls
+        self._client = dynamodb.meta.client
+        self._counters_table = dynamodb.Table(f"{settings.stage}-post-counters")
         self._logger = Logger(utc=True)
-        self._table = boto3.resource("dynamodb").Table(f"{settings.stage}-posts")
+        self._scan_executor = scan_executor
+        self._scan_segments = settings.db_scan_segments
+        self._table = dynamodb.Table(f"{settings.stage}-posts")
 
+    @timed("db.create_post")
     def create_post(self, data: dict):
-        self._table.put_item(Item=data)
+        self._calls.run(
+            "create_post",
+            self._client.transact_write_items,
+            TransactItems=[
+                {
+                    "Put": {
+                        "TableName": self._table.name,
+                        "Item": with_published_index_keys(data),
+                        "ConditionExpression": "attribute_not_exists(id)",
+                    }
+                },
+                *self._counter_updates(None, data),
+            ],
+        )
 
+    @timed("db.get_all_posts")
     def get_all_posts(
         self, filter_expression: ConditionBase, fields: list[str]
     ) -> list[dict[str, Any]]:
-        projection = ",".join(fields)
-        items = []
-        response = self._table.scan(
-            FilterExpression=filter_expression, ProjectionExpression=projection
-        )
-        items.extend(response["Items"])
-        while "LastEvaluatedKey" in response:
-            response = self._table.scan(
-                ExclusiveStartKey=response["LastEvaluatedKey"],
+        return [
+            item
+            for page in self._scan(
+                "get_all_posts",
                 FilterExpression=filter_expression,
-                ProjectionExpression=projection,
+                ProjectionExpression=",".join(fields),
             )
-            items.extend(response["Items"])
-        return items
+            for item in page["Items"]
+        ]
 
+    @timed("db.count_all_posts")
     def count_all_posts(self, filter_expression: ConditionBase) -> int:
-        count = 0
-        response = self._table.scan(Select="COUNT", FilterExpression=filter_expression)
-        count += response["Count"]
-        while "LastEvaluatedKey" in response:
-            response = self._table.scan(
-                Select="COUNT",
-                ExclusiveStartKey=response["LastEvaluatedKey"],
-                FilterExpression=filter_expression,
+        return sum(
+            page["Count"]
+            for page in self._scan(
+                "count_all_posts", Select="COUNT", FilterExpression=filter_expression
             )
-            count += response["Count"]
-        return count
+        )
+
+    @timed("db.get_archive")
+    def get_archive(self) -> dict[str, int]:
+        return {
+            item["sk"]: int(item["count"])
+            for item in self._archive_counters()
+            if item.get("count")
+        }
+
+    @timed("db.get_post_counts")
+    def get_post_counts(self) -> dict[str, int]:
+        item = self._calls.read(
+            "get_post_counts",
+            self._counters_table.get_item,
+            Key={"pk": POST_COUNTERS, "sk": POST_COUNTERS_KEY},
+        ).get("Item", {})
+        return {
+            name: int(cast(Decimal, item.get(name, 0)))
+            for name in ("live", "published")
+        }
+
+    @timed("db.repair_counters")
+    def repair_counters(self) -> int:
+        counters: Counter[tuple[str, str, str]] = Counter()
+        for page in self._scan(
+            "repair_counters", ProjectionExpression="id, published_at, deleted_at"
+        ):
+            for item in page["Items"]:
+                counters.update(post_counters(item))
+        items: dict[tuple[str, str], dict[str, Any]] = {
+            (POST_COUNTERS, POST_COUNTERS_KEY): {"live": 0, "published": 0}
+        }
+        for (pk, sk, name), count in counters.items():
+            items.setdefault((pk, sk), {})[name] = count
+        stale = [
+            (ARCHIVE_COUNTERS, item["sk"])
+            for item in self._archive_counters()
+            if (ARCHIVE_COUNTERS, item["sk"]) not in items
+        ]
+        with self._counters_table.batch_writer() as batch:
+            for (pk, sk), attributes in items.items():
+                batch.put_item(Item={"pk": pk, "sk": sk, **attributes})
+            for pk, sk in stale:
+                batch.delete_item(Key={"pk": pk, "sk": sk})
+        return len(items) + len(stale)
 
+    @timed("db.item_count")
     def item_count(self) -> int:
         return self._table.item_count
 
+    @timed("db.get_post_by_post_path")
     def get_post_by_post_path(
         self, post_path: str, filter_expression: ConditionBase
     ) -> dict | None:
-        response = self._table.query(
+        response = self._calls.read(
+            "get_post_by_post_path",
+            self._table.query,
+            hedge=True,
             IndexName="PostPathIndex",
             KeyConditionExpression=Key("post_path").eq(post_path),
             FilterExpression=filter_expression,
         )
         return response["Items"][0] if response["Items"] else None
 
+    @timed("db.get_post_by_title")
     def get_post_by_title(
         self, title: str, filter_expression: ConditionBase
     ) -> dict | None:
-        response = self._table.query(
+        response = self._calls.read(
+            "get_post_by_title",
+            self._table.query,
             IndexName="TitleIndex",
             KeyConditionExpression=Key("title").eq(title),
             FilterExpression=filter_expression,
         )
         return response["Items"][0] if response["Items"] else None
 
+    @timed("db.get_post_by_uuid")
     def get_post_by_uuid(
         self, post_uuid: str, filter_expression: ConditionBase
     ) -> dict | None:
-        response = self._table.query(
+        response = self._calls.read(
+            "get_post_by_uuid",
+            self._table.query,
+            hedge=True,
             KeyConditionExpression=Key("id").eq(post_uuid),
             FilterExpression=filter_expression,
         )
         return response["Items"][0] if response["Items"] else None
 
+    @timed("db.get_posts")
     def get_posts(
         self,
-        filter_expression: ConditionBase,
-        exclusive_start_key: dict[str, str] | None = None,
+        limit: int,
+        exclusive_start_key: dict[str, Any] | None = None,
         fields: list[str] | None = None,
-    ) -> tuple[str | None, list[dict[str, Any]]]:
-        kwargs = {
-            "FilterExpression": filter_expression,
-            "ExclusiveStartKey": exclusive_start_key,
-            "ProjectionExpression": ",".join(fields) if fields else None,
+    ) -> tuple[dict[str, Any] | None, list[dict[str, Any]]]:
+        query: dict[str, Any] = {
+            "IndexName": PUBLISHED_AT_INDEX,
+            "KeyConditionExpression": Key(PUBLISHED_KEY).eq(PUBLISHED_KEY_VALUE),
+            "Limit": limit,
+            "ScanIndexForward": False,
         }
-        response = self._table.scan(
-            **{k: v for k, v in kwargs.items() if v is not None}
-        )
-        last_key = response.get("LastEvaluatedKey", {}).get("id")
-        return last_key, response["Items"]
+        if exclusive_start_key:
+            query["ExclusiveStartKey"] = exclusive_start_key
+        if fields:
+            query["ExpressionAttributeNames"] = {f"#{field}": field for field in fields}
+            query["ProjectionExpression"] = ",".join(f"#{field}" for field in fields)
+        response = self._calls.read("get_posts", partial(self._table.query, **query))
+        return response.get("LastEvaluatedKey"), response["Items"]
 
+    @timed("db.backfill_published_keys")
+    def backfill_published_keys(self) -> int:
+        updated = 0
+        kwargs: dict[str, Any] = {
+            "ProjectionExpression": ", ".join(
+                ["id", "published_at", "deleted_at", *PUBLISHED_INDEX_KEYS]
+            )
+        }
+        while True:
+            response = self._table.scan(**kwargs)
+            for item in response["Items"]:
+                expected = with_published_index_keys(item)
+                if all(
+                    item.get(key) == expected.get(key) for key in PUBLISHED_INDEX_KEYS
+                ):
+                    continue
+                update: dict[str, Any] = {
+                    "UpdateExpression": "REMOVE "
+                    + ", ".join(f"#{key}" for key in PUBLISHED_INDEX_KEYS)
+                }
+                if PUBLISHED_KEY in expected:
+                    update = {
+                        "UpdateExpression": "SET "
+                        + ", ".join(f"#{key}=:{key}" for key in PUBLISHED_INDEX_KEYS),
+                        "ExpressionAttributeValues": {
+                            f":{key}": expected[key] for key in PUBLISHED_INDEX_KEYS
+                        },
+                    }
+                self._table.update_item(
+                    Key={"id": item["id"]},
+                    ConditionExpression=Attr("id").exists(),
+                    ExpressionAttributeNames={
+                        f"#{key}": key for key in PUBLISHED_INDEX_KEYS
+                    },
+                    **update,
+                )
+                updated += 1
+            if "LastEvaluatedKey" not in response:
+                return updated
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    @timed("db.update_post")
     def update_post(
-        self, post_uuid: str, data: dict, condition_expression: ConditionBase
+        self,
+        post_uuid: str,
+        data: dict,
+        condition_expression: ConditionBase,
+        previous: dict[str, Any] | None = None,
     ):
-        attr_names = {f"#{k}": k for k in data}
-        attr_values = {f":{k}": v for k, v in data.items()}
-        update_expr = ", ".join(f"#{k}=:{k}" for k in data)
-        self._table.update_item(
-            Key={"id": post_uuid},
-            ConditionExpression=condition_expression,
-            UpdateExpression=f"SET {update_expr}",
-            ExpressionAttributeNames=attr_names,
-            ExpressionAttributeValues=attr_values,
+        counter_updates = []
+        if previous is not None:
+            counter_updates = self._counter_updates(previous, {**previous, **data})
+            published_at = previous.get("published_at")
+            condition_expression &= (
+                Attr("published_at").eq(published_at)
+                if published_at
+                else Attr("published_at").eq(None) | Attr("published_at").not_exists()
+            )
+        remove: list[str] = []
+        if "published_at" in data or "deleted_at" in data:
+            data = with_published_index_keys(data)
+            if PUBLISHED_KEY not in data:
+                remove.extend(PUBLISHED_INDEX_KEYS)
+        condition = ConditionExpressionBuilder().build_expression(condition_expression)
+        attr_names = {
+            f"#{k}": k for k in [*data, *remove]
+        } | condition.attribute_name_placeholders
+        attr_values = {
+            f":{k}": v for k, v in data.items()
+        } | condition.attribute_value_placeholders
+        update_expr = f"SET {', '.join(f'#{k}=:{k}' for k in data)}"
+        if remove:
+            update_expr += f" REMOVE {', '.join(f'#{k}' for k in remove)}"
+        update = {
+            "Key": {"id": post_uuid},
+            "ConditionExpression": condition.condition_expression,
+            "UpdateExpression": update_expr,
+            "ExpressionAttributeNames": attr_names,
+            "ExpressionAttributeValues": attr_values,
+        }
+        if not counter_updates:
+            self._calls.run("update_post", self._table.update_item, **update)
+            return
+        self._calls.run(
+            "update_post",
+            self._client.transact_write_items,
+            TransactItems=[
+                {"Update": {"TableName": self._table.name, **update}},
+                *counter_updates,
+            ],
         )
+
+    def _counter_updates(
+        self, before: dict[str, Any] | None, after: dict[str, Any] | None
+    ) -> list[dict[str, Any]]:
+        deltas = post_counters(after)
+        deltas.subtract(post_counters(before))
+        counters: dict[tuple[str, str], dict[str, int]] = {}
+        for (pk, sk, name), delta in sorted(deltas.items()):
+            if delta:
+                counters.setdefault((pk, sk), {})[name] = delta
+        return [
+            {
+                "Update": {
+                    "TableName": self._counters_table.name,
+                    "Key": {"pk": pk, "sk": sk},
+                    "UpdateExpression": "ADD "
+                    + ", ".join(f"#{name} :{name}" for name in attributes),
+                    "ExpressionAttributeNames": {
+                        f"#{name}": name for name in attributes
+                    },
+                    "ExpressionAttributeValues": {
+                        f":{name}": delta for name, delta in attributes.items()
+                    },
+                }
+            }
+            for (pk, sk), attributes in counters.items()
+        ]
+
+    def _archive_counters(self) -> Iterator[dict[str, Any]]:
+        kwargs: dict[str, Any] = {
+            "KeyConditionExpression": Key("pk").eq(ARCHIVE_COUNTERS)
+        }
+        while True:
+            response = self._calls.read(
+                "get_archive", self._counters_table.query, **kwargs
+            )
+            yield from response["Items"]
+            if "LastEvaluatedKey" not in response:
+                return
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def _scan(
+        self, operation: str, **kwargs: Any
+    ) -> Iterator["ScanOutputTableTypeDef"]:
+        if self._scan_executor is None or self._scan_segments < 2:
+            yield from self._scan_segment(operation, threading.Event(), **kwargs)
+            return
+        pages: queue.Queue["ScanOutputTableTypeDef | BaseException | None"] = (
+            queue.Queue()
+        )
+        stop = threading.Event()
+
+        def put_cancellation(future: Future[None]) -> None:
+            if future.cancelled():
+                pages.put(CancelledError())
+
+        try:
+            for segment in range(self._scan_segments):
+                context = contextvars.copy_context()
+                future = self._scan_executor.submit(
+                    context.run,
+                    partial(
+                        self._put_segment_pages,
+                        operation,
+                        pages,
+                        stop,
+                        Segment=segment,
+                        TotalSegments=self._scan_segments,
+                        **kwargs,
+                    ),
+                )
+                future.add_done_callback(put_cancellation)
+            remaining = self._scan_segments
+            while remaining:
+                page = pages.get()
+                if page is None:
+                    remaining -= 1
+                elif isinstance(page, BaseException):
+                    raise page
+                else:
+                    yield page
+        finally:
+            stop.set()
+
+    def _scan_segment(
+        self, operation: str, stop: threading.Event, **kwargs: Any
+    ) -> Iterator["ScanOutputTableTypeDef"]:
+        while not stop.is_set():
+            response = self._calls.read(operation, self._table.scan, **kwargs)
+            yield response
+            if "LastEvaluatedKey" not in response:
+                return
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def _put_segment_pages(
+        self,
+        operation: str,
+        pages: queue.Queue["ScanOutputTableTypeDef | BaseException | None"],
+        stop: threading.Event,
+        **kwargs: Any,
+    ) -> None:
+        try:
+            for page in self._scan_segment(operation, stop, **kwargs):
+                pages.put(page)
+        except BaseException as error:
+            pages.put(error)
+        else:
+            pages.put(None)
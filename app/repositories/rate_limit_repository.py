@@ -0,0 +1,43 @@
+from decimal import Decimal
+from typing import TYPE_CHECKING, cast
+
+from aws_lambda_powertools import Logger
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+from app import settings
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.service_resource import DynamoDBServiceResource
+
+
+class RateLimitRepository:
+    def __init__(self, dynamodb: "DynamoDBServiceResource"):
+        self._logger = Logger(utc=True)
+        self._table = dynamodb.Table(f"{settings.stage}-rate-limits")
+
+    def lease_tokens(
+        self, key: str, count: int, limit: int, expires_at: int
+    ) -> int | None:
+        try:
+            response = self._table.update_item(
+                Key={"id": key},
+                ConditionExpression=Attr("consumed").not_exists()
+                | Attr("consumed").lte(limit - count),
+                UpdateExpression=(
+                    "SET #expires_at = if_not_exists(#expires_at, :expires_at) "
+                    "ADD #consumed :count"
+                ),
+                ExpressionAttributeNames={
+                    "#consumed": "consumed",
+                    "#expires_at": "expires_at",
+                },
+                ExpressionAttributeValues={":count": count, ":expires_at": expires_at},
+                ReturnValues="UPDATED_NEW",
+            )
+        except ClientError as error:
+            if error.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                self._logger.debug(f"Not enough tokens left to lease {count=} {key=}")
+                return None
+            raise
+        return int(cast(Decimal, response["Attributes"]["consumed"]))
@@ -3,7 +3,6 @@ import mimetypes
 import uuid
 
 from aws_lambda_powertools import Logger
-from unidecode import unidecode
 
 from app import settings
 from app.exceptions import AttachmentNotFoundException
@@ -14,14 +13,16 @@ from app.services.storage_service import StorageService
 
 
 class AttachmentService:
-    def __init__(self):
+    def __init__(self, post_service: PostService, storage_service: StorageService):
         self._logger = Logger(utc=True)
-        self._post_service = PostService()
-        self._storage_service = StorageService()
+        self._post_service = post_service
+        self._storage_service = storage_service
 
     def add_attachment(
         self, post_uuid: str, attachment_name: str, base64_data: str, display_name: str
     ) -> Attachment:
+        from unidecode import unidecode
+
         attachment_name = unidecode(attachment_name)
         self._logger.info(f"Adding attachment {attachment_name=} to {post_uuid=}")
 
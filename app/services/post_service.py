@@ -1,31 +1,56 @@
+import threading
 import uuid
-from typing import Any
+from typing import Any, Iterator, Mapping
 
-import markdown
 import pendulum
 from aws_lambda_powertools import Logger
 from boto3.dynamodb.conditions import Attr
-from slugify import slugify
 
+from app import settings
+from app.cache import TTLCache
 from app.exceptions import PostAlreadyExistsException, PostNotFoundException
 from app.models.post import Post
 from app.models.response import Page
 from app.models.response import Post as PostResponse
+from app.pagination import CursorCodec
 from app.repositories.post_repository import PostRepository
+from app.timing import timed
+
+
+def month_range(first: str, last: str) -> Iterator[str]:
+    start = int(first[:4]) * 12 + int(first[5:7]) - 1
+    end = int(last[:4]) * 12 + int(last[5:7]) - 1
+    for month in range(start, end + 1):
+        yield f"{month // 12:04d}-{month % 12 + 1:02d}"
+
+
+def fill_archive_months(counts: Mapping[str, int]) -> dict[str, int]:
+    if not counts:
+        return {}
+    return {
+        month: counts.get(month, 0) for month in month_range(min(counts), max(counts))
+    }
 
 
 class FilterExpressions:
     NOT_DELETED = Attr("deleted_at").eq(None) | Attr("deleted_at").not_exists()
-    PUBLISHED = Attr("published_at").ne(None)
 
 
 class PostService:
     ERROR_POST_EXISTS = "There is already a post with this title"
     ERROR_POST_NOT_FOUND = "The requested post was not found"
 
-    def __init__(self):
+    ARCHIVE_CACHE_KEY = "archive"
+
+    def __init__(self, repository: PostRepository, cursors: CursorCodec):
+        self._archive_cache: TTLCache[str, dict[str, int]] = TTLCache(
+            1, settings.archive_cache_ttl_in_seconds
+        )
+        self._archive_generation = 0
+        self._archive_lock = threading.Lock()
+        self._cursors = cursors
         self._logger = Logger(utc=True)
-        self._repo = PostRepository()
+        self._repo = repository
 
     def get_post_by_uuid(self, post_uuid: str) -> Post:
         item = self._repo.get_post_by_uuid(post_uuid, FilterExpressions.NOT_DELETED)
@@ -35,10 +60,15 @@ class PostService:
         return Post(**item)
 
     def _post_to_response(self, post_data: dict[str, Any]) -> PostResponse:
-        post_data["content"] = markdown.markdown(post_data["content"])
+        import markdown
+
+        with timed("markdown"):
+            post_data["content"] = markdown.markdown(post_data["content"])
         return PostResponse(**post_data)
 
     def create_post(self, data: dict[str, Any]) -> Post:
+        from slugify import slugify
+
         now = pendulum.now()
         if self._repo.get_post_by_title(
             data["title"],
@@ -59,14 +89,20 @@ class PostService:
             }
         )
         self._repo.create_post(data)
+        self._invalidate_archive()
         return Post(**data)
 
     def delete_post(self, post_uuid: str):
         post = self.get_post_by_uuid(post_uuid)
+        previous = post.model_dump(exclude={"id"})
         post.deleted_at = pendulum.now().to_iso8601_string()
         self._repo.update_post(
-            post_uuid, post.model_dump(exclude={"id"}), FilterExpressions.NOT_DELETED
+            post_uuid,
+            post.model_dump(exclude={"id"}),
+            FilterExpressions.NOT_DELETED,
+            previous,
         )
+        self._invalidate_archive()
         self._logger.info(f"Post deleted: {post_uuid=}")
 
     def get_post(self, post_uuid: str) -> PostResponse:
@@ -81,14 +117,14 @@ class PostService:
             raise PostNotFoundException(self.ERROR_POST_NOT_FOUND)
         return self._post_to_response(post)
 
-    def get_posts(self, exclusive_start_key: str | None = None) -> Page:
+    def get_posts(self, limit: int | None = None, cursor: str | None = None) -> Page:
         last_key, posts = self._repo.get_posts(
-            FilterExpressions.NOT_DELETED & FilterExpressions.PUBLISHED,
-            {"id": exclusive_start_key} if exclusive_start_key else None,
+            limit or settings.posts_page_size,
+            self._cursors.decode(cursor) if cursor else None,
             ["id", "title", "meta", "published_at", "updated_at"],
         )
         return Page(
-            exclusive_start_key=last_key,
+            next_cursor=self._cursors.encode(last_key) if last_key else None,
             posts=[PostResponse(**post) for post in posts],
         )
 
@@ -97,27 +133,42 @@ class PostService:
         if not post:
             self._logger.warning(f"Post not found: {post_uuid=}")
             raise PostNotFoundException(self.ERROR_POST_NOT_FOUND)
-        post.update(data)
-        post["updated_at"] = pendulum.now().to_iso8601_string()
         post.pop("id")
-        self._repo.update_post(post_uuid, post, FilterExpressions.NOT_DELETED)
+        self._repo.update_post(
+            post_uuid,
+            {**post, **data, "updated_at": pendulum.now().to_iso8601_string()},
+            FilterExpressions.NOT_DELETED,
+            post,
+        )
+        self._invalidate_archive()
         self._logger.info(f"Post updated: {post_uuid=}")
 
+    def backfill_published_index(self) -> int:
+        updated = self._repo.backfill_published_keys()
+        self._logger.info(f"Backfilled published index: {updated=}")
+        return updated
+
     def get_archive(self) -> dict[str, int]:
-        posts = self._repo.get_all_posts(
-            FilterExpressions.NOT_DELETED & FilterExpressions.PUBLISHED,
-            ["id", "published_at"],
-        )
-        if not posts:
-            return {}
-        dates = [pendulum.parse(post["published_at"]) for post in posts]
-        archive = {}
-        for dt in pendulum.interval(
-            min(dates).start_of("month"), max(dates).end_of("month")
-        ).range("months"):
-            archive[dt.format("YYYY-MM")] = sum(
-                1
-                for date in dates
-                if dt.start_of("month") <= date <= dt.end_of("month")
-            )
+        archive = self._archive_cache.get(self.ARCHIVE_CACHE_KEY)
+        if archive is not None:
+            return archive
+        generation = self._archive_generation
+        archive = fill_archive_months(self._repo.get_archive())
+        with self._archive_lock:
+            if generation == self._archive_generation:
+                self._archive_cache.set(self.ARCHIVE_CACHE_KEY, archive)
         return archive
+
+    def get_post_counts(self) -> dict[str, int]:
+        return self._repo.get_post_counts()
+
+    def repair_counters(self) -> int:
+        repaired = self._repo.repair_counters()
+        self._invalidate_archive()
+        self._logger.info(f"Repaired post counters: {repaired=}")
+        return repaired
+
+    def _invalidate_archive(self) -> None:
+        with self._archive_lock:
+            self._archive_generation += 1
+            self._archive_cache.clear()
@@ -5,16 +5,16 @@ from asyncssh import Error as SSHError
 from aws_lambda_powertools import Logger
 from sshfs import SSHFileSystem
 
-from app import Settings
+from app import settings
 from app.exceptions import PublishException
 from app.services.post_service import PostService
 
 
 class PublisherService:
-    def __init__(self):
+    def __init__(self, post_service: PostService):
         self._logger = Logger(utc=True)
-        self._post_service = PostService()
-        self._settings = Settings()
+        self._post_service = post_service
+        self._settings = settings
 
     def publish(self, post_uuid: str) -> None:
         self._logger.info(f"Publishing post with id={post_uuid}")
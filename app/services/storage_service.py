@@ -1,35 +1,46 @@
-from typing import Any
+from typing import TYPE_CHECKING, cast
 
-import boto3
 from aws_lambda_powertools import Logger
 from botocore.exceptions import ClientError
-from mypy_boto3_s3.literals import BucketCannedACLType
-from mypy_boto3_s3.service_resource import Bucket, BucketObjectsCollection
 
 from app import settings
 from app.exceptions import BucketNotFoundException, ObjectNotFoundException
 
+if TYPE_CHECKING:
+    from mypy_boto3_s3.literals import (BucketCannedACLType,
+                                        BucketLocationConstraintType)
+    from mypy_boto3_s3.service_resource import (Bucket,
+                                                BucketObjectsCollection,
+                                                S3ServiceResource)
+    from mypy_boto3_s3.type_defs import (DeleteObjectOutputTypeDef,
+                                         GetObjectOutputTypeDef,
+                                         PutObjectOutputTypeDef)
+
 
 class StorageService:
-    def __init__(self):
+    def __init__(self, s3: "S3ServiceResource"):
         self._logger = Logger(utc=True)
-        self._s3 = boto3.resource("s3", region_name=settings.aws_region)
+        self._s3 = s3
 
     def create_bucket(
-        self, bucket: str, acl: BucketCannedACLType = "private"
-    ) -> Bucket:
+        self, bucket: str, acl: "BucketCannedACLType" = "private"
+    ) -> "Bucket":
         self._logger.info(f"Creating bucket={bucket} with acl={acl}")
         return self._s3.create_bucket(
             ACL=acl,
             Bucket=bucket,
-            CreateBucketConfiguration={"LocationConstraint": settings.aws_region},
+            CreateBucketConfiguration={
+                "LocationConstraint": cast(
+                    "BucketLocationConstraintType", settings.aws_region
+                )
+            },
         )
 
-    def delete_object(self, bucket: str, key: str) -> dict[str, Any]:
+    def delete_object(self, bucket: str, key: str) -> "DeleteObjectOutputTypeDef":
         self._logger.info(f"Deleting object key={key} from bucket={bucket}")
         return self._s3.Object(bucket_name=bucket, key=key).delete()
 
-    def get_bucket(self, name: str) -> Bucket:
+    def get_bucket(self, name: str) -> "Bucket":
         self._logger.info(f"Fetching bucket name={name}")
         bucket = self._s3.Bucket(name=name)
         if not bucket.creation_date:
@@ -38,7 +49,7 @@ class StorageService:
             raise BucketNotFoundException(error)
         return bucket
 
-    def get_object(self, bucket: str, key: str) -> dict[str, Any]:
+    def get_object(self, bucket: str, key: str) -> "GetObjectOutputTypeDef":
         self._logger.info(f"Fetching object key={key} from bucket={bucket}")
         obj = self._s3.Object(bucket_name=bucket, key=key)
         try:
@@ -49,13 +60,13 @@ class StorageService:
             raise ObjectNotFoundException(error)
         return obj.get()
 
-    def list_objects(self, bucket: str) -> BucketObjectsCollection:
+    def list_objects(self, bucket: str) -> "BucketObjectsCollection":
         self._logger.info(f"Listing objects in bucket={bucket}")
         return self._s3.Bucket(name=bucket).objects.all()
 
     def put_object(
         self, bucket: str, key: str, data: bytes, acl: str = "public-read"
-    ) -> dict[str, Any]:
+    ) -> "PutObjectOutputTypeDef":
         self._logger.info(
             f"Uploading object key={key} with acl={acl} to bucket={bucket}"
         )
@@ -1,37 +1,108 @@
-import os
+import json
+import threading
+from typing import Any, Literal
 
 from aws_lambda_powertools.utilities import parameters
-from pydantic import Field, computed_field
+from pydantic import Field, PrivateAttr, computed_field
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     debug: bool = False
     app_name: str
+    archive_cache_ttl_in_seconds: int = 300
     attachments_bucket_name: str
     aws_access_key_id: str
+    aws_connect_timeout_in_seconds: float = 1.0
+    aws_max_attempts: int = 3
+    aws_read_timeout_in_seconds: float = 3.0
     aws_secret_access_key: str
     aws_region: str = Field(alias="AWS_DEFAULT_REGION")
+    banned_hosts_max_size: int = 10_000
+    banned_hosts_ttl_in_seconds: int = 86_400
+    country_database_path: str | None = None
+    country_lookup: Literal["http", "local"] = "http"
+    cursor_secret_ssm_param_name: str | None = None
+    db_hedge_percentile: float = 95.0
+    db_hedging: bool = True
+    db_latency_min_samples: int = 50
+    db_latency_window: int = 512
+    db_min_timeout_in_ms: float = 100.0
+    db_scan_segments: int = 4
+    db_scan_workers: int = 16
+    db_timeout_multiplier: float = 3.0
     default_timezone: str
+    event_log_max_body_size: int = 2048
+    event_log_sample_rate: float = 0.1
+    event_log_slow_threshold_in_ms: int = 1000
+    geo_cache_max_size: int = 10_000
+    geo_cache_ttl_in_seconds: int = 3600
+    geo_lookup_timeout_in_seconds: float = 2.0
+    jwt_cache_max_size: int = 1024
+    jwt_cache_ttl_in_seconds: int = 300
+    jwt_secret_refresh_ahead_in_seconds: int = 60
+    jwt_secret_ssm_param_name: str | None = None
+    jwt_secret_ttl_in_seconds: int = 300
+    posts_max_page_size: int = 100
+    posts_page_size: int = 20
+    rate_limit_backend: Literal["local", "dynamodb"] = "local"
     rate_limit_duration_in_seconds: int
+    rate_limit_lease_size: int = 10
+    rate_limit_max_clients: int = 100_000
     rate_limit_requests: int
     rate_limiting: bool
+    server_timing: bool = False
     ssh_host: str
     ssh_password: str
     ssh_root_path: str
+    ssh_secret_ssm_param_name: str | None = None
     ssh_username: str
     stage: str
+    validate_client_on_reads: bool = False
+    worker_threads: int = 40
+
+    _secrets: dict[str, Any] | None = PrivateAttr(default=None)
+    _secrets_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def aws_max_pool_connections(self) -> int:
+        return self.worker_threads + self.db_scan_workers + self.db_read_workers
+
+    @property
+    def cursor_secret(self) -> str | None:
+        return self.load_secrets().get("cursor_secret")
+
+    @property
+    def db_read_workers(self) -> int:
+        return 2 * (self.worker_threads + self.db_scan_workers)
 
     @computed_field
     @property
     def jwt_secret(self) -> str:
-        return parameters.get_parameter(
-            os.environ.get("JWT_SECRET_SSM_PARAM_NAME"), decrypt=True
-        )
+        return self.load_secrets()["jwt_secret"]
 
     @computed_field
     @property
     def ssh_secret(self) -> dict:
-        return parameters.get_parameter(
-            os.environ.get("SSH_SECRET_SSM_PARAM_NAME"), transform="json", decrypt=True
-        )
+        return self.load_secrets()["ssh_secret"]
+
+    def load_secrets(self, force_fetch: bool = False) -> dict[str, Any]:
+        with self._secrets_lock:
+            if self._secrets is None or force_fetch:
+                names = {
+                    key: name
+                    for key, name in (
+                        ("cursor_secret", self.cursor_secret_ssm_param_name),
+                        ("jwt_secret", self.jwt_secret_ssm_param_name),
+                        ("ssh_secret", self.ssh_secret_ssm_param_name),
+                    )
+                    if name
+                }
+                values = parameters.get_parameters_by_name(
+                    {name: {} for name in names.values()}, decrypt=True, max_age=0
+                )
+                secrets = {key: values[name] for key, name in names.items()}
+                if "ssh_secret" in secrets:
+                    secrets["ssh_secret"] = json.loads(secrets["ssh_secret"])
+                self._secrets = secrets
+            return self._secrets
@@ -0,0 +1,135 @@
+import importlib
+import random
+import sys
+import uuid
+from types import SimpleNamespace
+from typing import Any
+
+import pendulum
+from aws_lambda_powertools import Logger
+from fastapi import FastAPI
+from mangum import Mangum
+
+from app import middlewares, settings
+from app.container import container
+from app.jwt_bearer import verified_tokens
+from app.metrics import latency_metrics
+from app.models.post import Post
+from app.models.response import Page
+from app.models.response import Post as PostResponse
+
+try:
+    from snapshot_restore_py import (  # type: ignore[import-not-found]
+        register_after_restore, register_before_snapshot)
+except ImportError:
+    register_after_restore = register_before_snapshot = None
+
+LAZY_MODULES = ["httpx", "markdown", "slugify", "unidecode"]
+
+logger = Logger(utc=True)
+
+
+def make_http_event(
+    method: str,
+    path: str,
+    headers: dict[str, str] | None = None,
+    body: str | None = None,
+    query_string: str = "",
+) -> dict[str, Any]:
+    now = pendulum.now("UTC")
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": path,
+        "rawQueryString": query_string,
+        "headers": {"host": "localhost", **(headers or {})},
+        "requestContext": {
+            "accountId": "000000000000",
+            "apiId": "snapstart",
+            "domainName": "localhost",
+            "domainPrefix": "localhost",
+            "http": {
+                "method": method,
+                "path": path,
+                "protocol": "HTTP/1.1",
+                "sourceIp": "127.0.0.1",
+                "userAgent": "snapstart",
+            },
+            "requestId": str(uuid.uuid4()),
+            "routeKey": "$default",
+            "stage": "$default",
+            "time": now.format("DD/MMM/YYYY:HH:mm:ss ZZ"),
+            "timeEpoch": now.int_timestamp * 1000,
+        },
+        "body": body,
+        "isBase64Encoded": False,
+    }
+
+
+def make_lambda_context() -> SimpleNamespace:
+    return SimpleNamespace(
+        aws_request_id=str(uuid.uuid4()),
+        function_name="snapstart",
+        function_version="$LATEST",
+        invoked_function_arn="arn:aws:lambda:eu-central-1:000000000000:function:snapstart",
+        memory_limit_in_mb=128,
+        get_remaining_time_in_millis=lambda: 30_000,
+    )
+
+
+def prime(app: FastAPI) -> None:
+    logger.info("Priming application before snapshot")
+    for module in LAZY_MODULES:
+        importlib.import_module(module)
+    now = pendulum.now().to_iso8601_string()
+    post = Post(
+        id=str(uuid.uuid4()),
+        author="snapstart",
+        title="Priming",
+        content="# Priming\n\n*markdown* with a [link](https://example.com)",
+        post_path="1970/01/01/priming",
+        created_at=now,
+        published_at=now,
+        slug="priming",
+        tags=["priming"],
+        meta={
+            "category": "priming",
+            "description": "priming",
+            "language": "en",
+            "keywords": ["priming"],
+            "title": "Priming",
+        },
+    )
+    response = PostResponse(
+        **{
+            **post.model_dump(),
+            "content": sys.modules["markdown"].markdown(post.content),
+        }
+    )
+    Page(posts=[response]).model_dump_json(by_alias=True)
+    container.dynamodb
+    container.s3
+    asgi_handler = Mangum(app, lifespan="off")
+    asgi_handler(make_http_event("GET", "/health"), make_lambda_context())
+
+
+def reset() -> None:
+    logger.info("Resetting per-process state after restore")
+    random.seed()
+    middlewares.banned_hosts.clear()
+    middlewares.host_verdicts.clear()
+    middlewares.pending_lookups.clear()
+    middlewares.rate_limiter.clear()
+    middlewares._country_client = None
+    middlewares._country_client_loop = None
+    middlewares.logger.set_correlation_id(None)
+    latency_metrics.clear()
+    verified_tokens.clear()
+
+
+def register(app: FastAPI) -> bool:
+    if register_before_snapshot is None or register_after_restore is None:
+        return False
+    register_before_snapshot(prime, app)
+    register_after_restore(reset)
+    return True
@@ -0,0 +1,33 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from fastapi.responses import JSONResponse
+
+server_timings: ContextVar[dict[str, float] | None] = ContextVar(
+    "server_timings", default=None
+)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    timings = server_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+
+def format_server_timing(timings: dict[str, float]) -> str:
+    return ", ".join(f"{name};dur={duration:.2f}" for name, duration in timings.items())
+
+
+class TimedJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        with timed("serialize"):
+            return super().render(content)
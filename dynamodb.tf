@@ -23,6 +23,16 @@ resource "aws_dynamodb_table" "posts" {
     type = "S"
   }
 
+  attribute {
+    name = "published_key"
+    type = "S"
+  }
+
+  attribute {
+    name = "published_sort_key"
+    type = "S"
+  }
+
   global_secondary_index {
     name            = "PostPathIndex"
     hash_key        = "post_path"
@@ -40,4 +50,45 @@ resource "aws_dynamodb_table" "posts" {
     hash_key        = "created_at"
     projection_type = "ALL"
   }
+
+  global_secondary_index {
+    name               = "PublishedAtIndex"
+    hash_key           = "published_key"
+    range_key          = "published_sort_key"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["meta", "published_at", "title", "updated_at"]
+  }
+}
+
+resource "aws_dynamodb_table" "post_counters" {
+  name         = "${var.stage}-post-counters"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "pk"
+  range_key    = "sk"
+
+  attribute {
+    name = "pk"
+    type = "S"
+  }
+
+  attribute {
+    name = "sk"
+    type = "S"
+  }
+}
+
+resource "aws_dynamodb_table" "rate_limits" {
+  name         = "${var.stage}-rate-limits"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "id"
+
+  attribute {
+    name = "id"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
 }
@@ -24,6 +24,8 @@ resource "aws_iam_policy" "lambda_policy" {
       {
         Effect   = "Allow"
         Action   = [
+          "dynamodb:BatchWriteItem",
+          "dynamodb:GetItem",
           "dynamodb:PutItem",
           "dynamodb:Query",
           "dynamodb:Scan",
@@ -33,7 +35,10 @@ resource "aws_iam_policy" "lambda_policy" {
           aws_dynamodb_table.posts.arn,
           "${aws_dynamodb_table.posts.arn}/index/PostPathIndex",
           "${aws_dynamodb_table.posts.arn}/index/TitleIndex",
-          "${aws_dynamodb_table.posts.arn}/index/CreatedAtIndex"
+          "${aws_dynamodb_table.posts.arn}/index/CreatedAtIndex",
+          "${aws_dynamodb_table.posts.arn}/index/PublishedAtIndex",
+          aws_dynamodb_table.post_counters.arn,
+          aws_dynamodb_table.rate_limits.arn
         ]
       },
       {
@@ -59,7 +64,8 @@ resource "aws_iam_policy" "lambda_policy" {
       {
         Effect   = "Allow"
         Action   = [
-          "ssm:GetParameter"
+          "ssm:GetParameter",
+          "ssm:GetParameters"
         ]
         Resource = "*"
       }
@@ -49,16 +49,25 @@ resource "aws_lambda_function" "fastapi" {
     variables = {
       APP_NAME                             = var.app_name
       ATTACHMENTS_BUCKET_NAME              = aws_s3_bucket.attachments.id
+      COUNTRY_DATABASE_PATH                = var.country_database_path
+      COUNTRY_LOOKUP                       = var.country_lookup
+      CURSOR_SECRET_SSM_PARAM_NAME         = var.cursor_secret_ssm_param_name
       DEBUG                                = var.debug
       DEFAULT_TIMEZONE                     = var.default_timezone
+      EVENT_LOG_MAX_BODY_SIZE              = var.event_log_max_body_size
+      EVENT_LOG_SAMPLE_RATE                = var.event_log_sample_rate
+      EVENT_LOG_SLOW_THRESHOLD_IN_MS       = var.event_log_slow_threshold_in_ms
       JWT_SECRET_SSM_PARAM_NAME            = var.jwt_secret_ssm_param_name
+      JWT_SECRET_TTL_IN_SECONDS            = var.jwt_secret_ttl_in_seconds
       LOG_LEVEL                            = var.log_level
-      POWERTOOLS_LOGGER_LOG_EVENT          = "true"
+      POWERTOOLS_LOGGER_LOG_EVENT          = "false"
       POWERTOOLS_SERVICE_NAME              = var.power_tools_service_name
       POWERTOOLS_DEBUG                     = "false"
+      RATE_LIMIT_BACKEND                   = var.rate_limit_backend
       RATE_LIMIT_DURATION_IN_SECONDS       = var.rate_limit_duration_in_seconds
       RATE_LIMIT_REQUESTS                  = var.rate_limit_requests
       RATE_LIMITING                        = var.rate_limiting
+      SERVER_TIMING                        = var.server_timing
       SSH_HOST                             = var.ssh_host
       SSH_PASSWORD                         = var.ssh_password
       SSH_ROOT_PATH                        = var.ssh_root_path
@@ -0,0 +1,308 @@
+import argparse
+import base64
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable
+
+BENCHMARK_ENV = {
+    "APP_NAME": "personal-backend-service",
+    "ATTACHMENTS_BUCKET_NAME": "benchmark-attachments",
+    "AWS_ACCESS_KEY_ID": "access_key_id",
+    "AWS_DEFAULT_REGION": "eu-central-1",
+    "AWS_SECRET_ACCESS_KEY": "secret_access_key",
+    "CURSOR_SECRET_SSM_PARAM_NAME": "/benchmark/secrets/cursor",
+    "DEFAULT_TIMEZONE": "UTC",
+    "JWT_SECRET_SSM_PARAM_NAME": "/benchmark/secrets/jwt",
+    "RATE_LIMIT_DURATION_IN_SECONDS": "60",
+    "RATE_LIMIT_REQUESTS": "60",
+    "SSH_HOST": "localhost",
+    "SSH_PASSWORD": "password",
+    "SSH_ROOT_PATH": "/tmp",
+    "SSH_USERNAME": "benchmark",
+}
+BENCHMARK_OVERRIDES = {
+    "DEBUG": "false",
+    "EVENT_LOG_SAMPLE_RATE": "0",
+    "EVENT_LOG_SLOW_THRESHOLD_IN_MS": "60000",
+    "LOG_LEVEL": "WARNING",
+    "RATE_LIMIT_BACKEND": "local",
+    "RATE_LIMITING": "false",
+    "SERVER_TIMING": "false",
+    "STAGE": "benchmark",
+}
+CURSOR_SECRET = "benchmark-cursor-secret"
+JWT_SECRET = "benchmark-secret"
+NUMBER_OF_POSTS = 50
+ROOT_PATH = Path(__file__).parents[2]
+
+
+def benchmark_env() -> dict[str, str]:
+    env = {
+        name: value
+        for name, value in os.environ.items()
+        if not name.startswith("COV_CORE_")
+    }
+    for name, value in BENCHMARK_ENV.items():
+        env.setdefault(name, value)
+    env.update(BENCHMARK_OVERRIDES)
+    return env
+
+
+def measure_import_time(runs: int) -> list[float]:
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        "import app.api_handler\n"
+        "print((time.perf_counter() - start) * 1000)\n"
+    )
+    return [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", code],
+                capture_output=True,
+                check=True,
+                cwd=ROOT_PATH,
+                env=benchmark_env(),
+                text=True,
+            ).stdout.splitlines()[-1]
+        )
+        for _ in range(runs)
+    ]
+
+
+def make_post(published_at, index: int) -> dict[str, Any]:
+    slug = f"benchmark-post-{index}"
+    return {
+        "id": str(uuid.uuid4()),
+        "author": "Benchmark",
+        "title": f"Benchmark post {index}",
+        "content": f"# Benchmark post {index}\n\n" + "Lorem *ipsum* " * 200,
+        "post_path": f"{published_at.format('YYYY/MM/DD')}/{slug}",
+        "created_at": published_at.to_iso8601_string(),
+        "deleted_at": None,
+        "published_at": published_at.to_iso8601_string(),
+        "updated_at": None,
+        "slug": slug,
+        "tags": ["benchmark"],
+        "meta": {
+            "category": "benchmark",
+            "description": "Benchmark post",
+            "language": "en",
+            "keywords": ["benchmark"],
+            "title": "Benchmark",
+        },
+    }
+
+
+def seed(settings) -> tuple[Any, list[dict[str, Any]]]:
+    import boto3
+    import pendulum
+
+    from app.hedging import HedgedCaller
+    from app.repositories.post_repository import (PostRepository,
+                                                  with_published_index_keys)
+    from tests.helpers.utils import (create_post_counters_table,
+                                     create_posts_table)
+
+    boto3.client("ssm").put_parameter(
+        Name=settings.cursor_secret_ssm_param_name,
+        Value=CURSOR_SECRET,
+        Type="SecureString",
+    )
+    boto3.client("ssm").put_parameter(
+        Name=settings.jwt_secret_ssm_param_name, Value=JWT_SECRET, Type="SecureString"
+    )
+    boto3.client("s3").create_bucket(
+        Bucket=settings.attachments_bucket_name,
+        CreateBucketConfiguration={"LocationConstraint": settings.aws_region},
+    )
+    dynamodb = boto3.resource("dynamodb")
+    table = create_posts_table(dynamodb, f"{settings.stage}-posts")
+    create_post_counters_table(dynamodb, f"{settings.stage}-post-counters")
+    now = pendulum.now()
+    posts = [
+        make_post(now.subtract(days=index * 7), index)
+        for index in range(NUMBER_OF_POSTS)
+    ]
+    with table.batch_writer() as batch:
+        for post in posts:
+            batch.put_item(Item=with_published_index_keys(post))
+    PostRepository(dynamodb, HedgedCaller(settings)).repair_counters()
+    return table, posts
+
+
+def make_routes(
+    table: Any, posts: list[dict[str, Any]]
+) -> dict[str, Callable[[], dict[str, Any]]]:
+    import pendulum
+
+    from app.repositories.post_repository import with_published_index_keys
+    from app.snapstart import make_http_event
+    from tests.helpers.utils import generate_jwt_token
+
+    jwt_token, _ = generate_jwt_token(
+        JWT_SECRET,
+        {
+            "id": str(uuid.uuid4()),
+            "email": "benchmark@netcode.hu",
+            "display_name": "benchmark",
+        },
+    )
+    authorization = {
+        "authorization": f"Bearer {jwt_token}",
+        "content-type": "application/json",
+    }
+    post = posts[0]
+
+    def create_post() -> dict[str, Any]:
+        body = {
+            key: post[key]
+            for key in ("author", "content", "tags", "meta", "published_at")
+        } | {"title": f"Benchmark post {uuid.uuid4()}"}
+        return make_http_event("POST", "/api/v1/posts", authorization, json.dumps(body))
+
+    def add_attachment() -> dict[str, Any]:
+        attachment_post = make_post(pendulum.now(), len(posts))
+        posts.append(attachment_post)
+        table.put_item(Item=with_published_index_keys(attachment_post))
+        body = {
+            "name": f"{uuid.uuid4()}.txt",
+            "data": base64.b64encode(b"benchmark" * 100).decode(),
+        }
+        return make_http_event(
+            "POST",
+            f"/api/v1/posts/{attachment_post['id']}/attachments",
+            authorization,
+            json.dumps(body),
+        )
+
+    return {
+        "GET /health": lambda: make_http_event("GET", "/health"),
+        "GET /api/v1/posts": lambda: make_http_event("GET", "/api/v1/posts"),
+        "GET /api/v1/posts/{uuid}": lambda: make_http_event(
+            "GET", f"/api/v1/posts/{post['id']}"
+        ),
+        "GET /api/v1/posts/archive": lambda: make_http_event(
+            "GET", "/api/v1/posts/archive"
+        ),
+        "GET /api/v1/posts/{year}/{month}/{day}/{slug}": lambda: make_http_event(
+            "GET", f"/api/v1/posts/{post['post_path']}"
+        ),
+        "POST /api/v1/posts": create_post,
+        "POST /api/v1/posts/{post_uuid}/attachments": add_attachment,
+    }
+
+
+def summarize(latencies: list[float]) -> dict[str, float]:
+    latencies = sorted(latencies)
+    return {
+        "min": round(latencies[0], 3),
+        "p50": round(statistics.median(latencies), 3),
+        "p95": round(latencies[math.ceil(0.95 * len(latencies)) - 1], 3),
+        "max": round(latencies[-1], 3),
+        "mean": round(statistics.fmean(latencies), 3),
+    }
+
+
+def run_invocations(iterations: int) -> dict[str, Any]:
+    from moto import mock_aws
+
+    with mock_aws():
+        start = time.perf_counter()
+        import app.api_handler
+
+        import_time = (time.perf_counter() - start) * 1000
+        from app import settings
+        from app.snapstart import make_lambda_context
+
+        routes = make_routes(*seed(settings))
+        results: dict[str, Any] = {}
+        for route, make_event in routes.items():
+            latencies = []
+            status_codes = set()
+            for _ in range(iterations + 1):
+                event = make_event()
+                start = time.perf_counter()
+                response = app.api_handler.handler(event, make_lambda_context())
+                latencies.append((time.perf_counter() - start) * 1000)
+                status_codes.add(response["statusCode"])
+            results[route] = {
+                "first_invocation_ms": round(latencies[0], 3),
+                "steady_state_ms": summarize(latencies[1:]),
+                "status_codes": sorted(status_codes),
+            }
+    return {
+        "import_time_with_boto3_loaded_ms": round(import_time, 3),
+        "routes": results,
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            cwd=ROOT_PATH,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(iterations: int, import_runs: int) -> dict[str, Any]:
+    import_times = measure_import_time(import_runs)
+    invocations = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "tests.benchmark.cold_start",
+            "--child",
+            "--iterations",
+            str(iterations),
+        ],
+        capture_output=True,
+        check=True,
+        cwd=ROOT_PATH,
+        env=benchmark_env(),
+        text=True,
+    )
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "iterations": iterations,
+        "import_time_ms": summarize(import_times),
+        **json.loads(invocations.stdout.splitlines()[-1]),
+    }
+
+
+def main(argv: list[str] | None = None) -> dict[str, Any]:
+    parser = argparse.ArgumentParser(
+        description="Cold-start and first-request benchmark for app.api_handler"
+    )
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--import-runs", default=5, type=int)
+    parser.add_argument("--iterations", default=50, type=int)
+    parser.add_argument("--output", default="cold-start-benchmark.json")
+    args = parser.parse_args(argv)
+    if args.child:
+        results = run_invocations(args.iterations)
+        sys.stdout.flush()
+        print(json.dumps(results))
+        return results
+    results = run(args.iterations, args.import_runs)
+    with open(args.output, "w") as output:
+        json.dump(results, output, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
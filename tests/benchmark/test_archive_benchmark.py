@@ -0,0 +1,57 @@
+import random
+import time
+from collections import Counter
+
+import pendulum
+import pytest
+
+from app.repositories.post_repository import published_month
+from app.services.post_service import fill_archive_months
+
+NUMBER_OF_POSTS = 10_000
+NUMBER_OF_YEARS = 10
+
+
+def legacy_archive(published_at: list[str]) -> dict[str, int]:
+    dates = [pendulum.parse(value) for value in published_at]
+    archive = {}
+    for dt in pendulum.interval(
+        min(dates).start_of("month"), max(dates).end_of("month")
+    ).range("months"):
+        archive[dt.format("YYYY-MM")] = sum(
+            1 for date in dates if dt.start_of("month") <= date <= dt.end_of("month")
+        )
+    return archive
+
+
+def single_pass_archive(published_at: list[str]) -> dict[str, int]:
+    return fill_archive_months(Counter(map(published_month, published_at)))
+
+
+def measure(fn, published_at: list[str]) -> tuple[float, dict[str, int]]:
+    start = time.perf_counter()
+    result = fn(published_at)
+    return (time.perf_counter() - start) * 1000, result
+
+
+@pytest.mark.benchmark
+class TestArchiveBenchmark:
+    def test_single_pass_archive_against_legacy_archive(self):
+        end = pendulum.datetime(2025, 1, 1)
+        start = end.subtract(years=NUMBER_OF_YEARS)
+        span = int((end - start).total_seconds())
+        published_at = [
+            start.add(seconds=random.randrange(span)).to_iso8601_string()
+            for _ in range(NUMBER_OF_POSTS)
+        ]
+
+        legacy_ms, legacy = measure(legacy_archive, published_at)
+        single_pass_ms, single_pass = measure(single_pass_archive, published_at)
+
+        print(
+            f"{NUMBER_OF_POSTS} posts over {NUMBER_OF_YEARS} years: "
+            f"legacy {legacy_ms:.1f}ms, single pass {single_pass_ms:.1f}ms "
+            f"({legacy_ms / single_pass_ms:.0f}x)"
+        )
+        assert single_pass == legacy
+        assert single_pass_ms < legacy_ms
@@ -0,0 +1,31 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from tests.benchmark.cold_start import main
+
+
+@pytest.mark.benchmark
+class TestColdStartBenchmark:
+    def test_cold_start_and_first_request_latency(self, tmp_path: Path):
+        output = tmp_path / "cold-start-benchmark.json"
+
+        main(["--iterations", "5", "--import-runs", "2", "--output", str(output)])
+
+        results = json.loads(output.read_text())
+        print(json.dumps(results, indent=2))
+        assert results["import_time_ms"]["min"] > 0
+        assert set(results["routes"]) == {
+            "GET /health",
+            "GET /api/v1/posts",
+            "GET /api/v1/posts/{uuid}",
+            "GET /api/v1/posts/archive",
+            "GET /api/v1/posts/{year}/{month}/{day}/{slug}",
+            "POST /api/v1/posts",
+            "POST /api/v1/posts/{post_uuid}/attachments",
+        }
+        for route in results["routes"].values():
+            assert route["first_invocation_ms"] > 0
+            assert route["steady_state_ms"]["p50"] <= route["steady_state_ms"]["p95"]
+            assert all(200 <= status < 300 for status in route["status_codes"])
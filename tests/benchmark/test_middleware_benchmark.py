@@ -0,0 +1,88 @@
+import time
+
+import pytest
+from fastapi import FastAPI, Request, Response, status
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+from starlette.middleware.base import (BaseHTTPMiddleware,
+                                       RequestResponseEndpoint)
+
+from app.api.v1.api import router as api_v1_router
+from app.middlewares import (ClientValidationMiddleware,
+                             CorrelationIdMiddleware, RateLimitingMiddleware,
+                             host_verdicts)
+from app.models.post import Post
+from app.models.response import Page
+from app.models.response import Post as PostResponse
+from app.rate_limiter import RateLimiter
+from app.services.post_service import PostService
+
+CLIENT_IP = "8.8.8.8"
+NUMBER_OF_REQUESTS = 2_000
+NUMBER_OF_RUNS = 3
+TOLERANCE = 0.9
+URL = "/api/v1/posts"
+
+
+class BaseHTTPMiddlewareProxy(BaseHTTPMiddleware):
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        return await call_next(request)
+
+
+def make_app(with_base_http_middleware_proxy: bool) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(GZipMiddleware)
+    for middleware in (
+        ClientValidationMiddleware,
+        RateLimitingMiddleware,
+        CorrelationIdMiddleware,
+    ):
+        app.add_middleware(middleware)
+        if with_base_http_middleware_proxy:
+            app.add_middleware(BaseHTTPMiddlewareProxy)
+    app.include_router(api_v1_router)
+    return app
+
+
+def measure_requests_per_second(app: FastAPI) -> float:
+    with TestClient(app, client=(CLIENT_IP, 50000)) as test_client:
+        assert test_client.get(URL).status_code == status.HTTP_200_OK
+        start = time.perf_counter()
+        for _ in range(NUMBER_OF_REQUESTS):
+            test_client.get(URL)
+        return NUMBER_OF_REQUESTS / (time.perf_counter() - start)
+
+
+@pytest.mark.benchmark
+class TestMiddlewareBenchmark:
+    @pytest.fixture(autouse=True)
+    def setup_function(self, mocker: MockerFixture, posts: list[Post]):
+        mocker.patch.object(
+            PostService,
+            "get_posts",
+            return_value=Page(
+                posts=[PostResponse(**post.model_dump()) for post in posts]
+            ),
+        )
+        host_verdicts.set(CLIENT_IP, False)
+        mocker.patch(
+            "app.middlewares.rate_limiter", RateLimiter(1_000_000, 60, 100_000)
+        )
+
+    def test_requests_per_second_against_base_http_middleware_proxy(self):
+        before_app, after_app = make_app(True), make_app(False)
+        before, after = 0.0, 0.0
+        for _ in range(NUMBER_OF_RUNS):
+            before = max(before, measure_requests_per_second(before_app))
+            after = max(after, measure_requests_per_second(after_app))
+
+        print(
+            f"GET {URL}: {before:.1f} req/s with a passthrough BaseHTTPMiddleware "
+            f"per middleware (proxy for the previous stack), "
+            f"{after:.1f} req/s with pure ASGI middlewares only "
+            f"({(after / before - 1) * 100:+.1f}%)"
+        )
+        assert after >= before * TOLERANCE
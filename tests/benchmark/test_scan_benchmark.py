@@ -0,0 +1,88 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from boto3.dynamodb.conditions import Attr
+from pytest_mock import MockerFixture
+
+from app import settings
+from app.hedging import HedgedCaller
+from app.repositories.post_repository import (PostRepository,
+                                              with_published_index_keys)
+from tests.helpers.utils import create_posts_table
+
+NUMBER_OF_POSTS = 1_000
+NUMBER_OF_RUNS = 3
+PAGE_SIZE = 100
+ROUND_TRIP_IN_SECONDS = 0.05
+SEGMENTS = (1, 2, 4, 8)
+TOLERANCE = 1.25
+FILTER_EXPRESSION = Attr("deleted_at").eq(None) & Attr("published_at").ne(None)
+
+
+def with_round_trip(scan):
+    def scan_page(**kwargs):
+        time.sleep(ROUND_TRIP_IN_SECONDS)
+        return scan(Limit=PAGE_SIZE, **kwargs)
+
+    return scan_page
+
+
+def measure(fn) -> tuple[float, object]:
+    durations = []
+    for _ in range(NUMBER_OF_RUNS):
+        start = time.perf_counter()
+        result = fn()
+        durations.append((time.perf_counter() - start) * 1000)
+    return min(durations), result
+
+
+@pytest.mark.benchmark
+class TestScanBenchmark:
+    @pytest.fixture(autouse=True)
+    def setup_function(self, dynamodb_resource, make_post):
+        table = create_posts_table(dynamodb_resource, "test-posts")
+        with table.batch_writer() as batch:
+            for _ in range(NUMBER_OF_POSTS):
+                post = make_post()
+                batch.put_item(Item=with_published_index_keys(post.model_dump()))
+
+    def test_archive_scan_latency_by_segments(
+        self, dynamodb_resource, mocker: MockerFixture
+    ):
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(SEGMENTS)) as executor:
+            for segments in SEGMENTS:
+                mocker.patch.object(settings, "db_scan_segments", segments)
+                post_repository = PostRepository(
+                    dynamodb_resource, HedgedCaller(settings), executor
+                )
+                mocker.patch.object(
+                    post_repository._table,
+                    "scan",
+                    with_round_trip(post_repository._table.scan),
+                )
+                scan_ms, items = measure(
+                    lambda: post_repository.get_all_posts(
+                        FILTER_EXPRESSION, ["id", "published_at"]
+                    )
+                )
+                count_ms, count = measure(
+                    lambda: post_repository.count_all_posts(FILTER_EXPRESSION)
+                )
+                results[segments] = (scan_ms, count_ms)
+
+                assert len(items) == NUMBER_OF_POSTS
+                assert count == NUMBER_OF_POSTS
+
+        serial_scan_ms, serial_count_ms = results[1]
+        for segments, (scan_ms, count_ms) in results.items():
+            print(
+                f"{NUMBER_OF_POSTS} posts, {segments} segment(s): "
+                f"get_all_posts {scan_ms:.1f}ms "
+                f"({serial_scan_ms / scan_ms:.2f}x), "
+                f"count_all_posts {count_ms:.1f}ms "
+                f"({serial_count_ms / count_ms:.2f}x)"
+            )
+            assert scan_ms <= serial_scan_ms * TOLERANCE
+            assert count_ms <= serial_count_ms * TOLERANCE
@@ -7,12 +7,18 @@ import pendulum
 import pytest
 from moto import mock_aws
 
+from app.hedging import HedgedCaller
 from app.models.post import Attachment, Post
+from app.repositories.post_repository import (PostRepository,
+                                              with_published_index_keys)
 from app.settings import Settings
+from tests.helpers.utils import create_post_counters_table, create_posts_table
 
 
 def pytest_configure():
     pytest.aws_default_region = "eu-central-1"
+    pytest.cursor_secret_ssm_param_name = "/dev/secrets/cursor"
+    pytest.cursor_secret_ssm_param_value = "c7s0p4x2qm"
     pytest.jwt_secret_ssm_param_name = "/dev/secrets/secret"
     pytest.jwt_secret_ssm_param_value = "94k9yz00rw"
 
@@ -21,6 +27,11 @@ def pytest_configure():
 def setup():
     with mock_aws():
         ssm_client = boto3.client("ssm")
+        ssm_client.put_parameter(
+            Name=pytest.cursor_secret_ssm_param_name,
+            Value=pytest.cursor_secret_ssm_param_value,
+            Type="SecureString",
+        )
         ssm_client.put_parameter(
             Name=pytest.jwt_secret_ssm_param_name,
             Value=pytest.jwt_secret_ssm_param_value,
@@ -61,75 +72,19 @@ def dynamodb_resource(settings: Settings):
 
 @pytest.fixture
 def initialize_posts_table(
-    dynamodb_resource, posts: list[Post], post_with_attachment: Post, posts_table
+    dynamodb_resource,
+    posts: list[Post],
+    post_with_attachment: Post,
+    posts_table,
+    settings: Settings,
 ):
-    dynamodb_resource.create_table(
-        AttributeDefinitions=[
-            {
-                "AttributeName": "id",
-                "AttributeType": "S",
-            },
-            {
-                "AttributeName": "post_path",
-                "AttributeType": "S",
-            },
-            {
-                "AttributeName": "title",
-                "AttributeType": "S",
-            },
-            {
-                "AttributeName": "created_at",
-                "AttributeType": "S",
-            },
-        ],
-        TableName="test-posts",
-        KeySchema=[
-            {"AttributeName": "id", "KeyType": "HASH"},
-        ],
-        GlobalSecondaryIndexes=[
-            {
-                "IndexName": "PostPathIndex",
-                "KeySchema": [
-                    {
-                        "AttributeName": "post_path",
-                        "KeyType": "HASH",
-                    },
-                ],
-                "Projection": {
-                    "ProjectionType": "ALL",
-                },
-            },
-            {
-                "IndexName": "TitleIndex",
-                "KeySchema": [
-                    {
-                        "AttributeName": "title",
-                        "KeyType": "HASH",
-                    },
-                ],
-                "Projection": {
-                    "ProjectionType": "ALL",
-                },
-            },
-            {
-                "IndexName": "CreatedAtIndex",
-                "KeySchema": [
-                    {
-                        "AttributeName": "created_at",
-                        "KeyType": "HASH",
-                    },
-                ],
-                "Projection": {
-                    "ProjectionType": "ALL",
-                },
-            },
-        ],
-        ProvisionedThroughput={"ReadCapacityUnits": 1, "WriteCapacityUnits": 1},
-    )
+    create_posts_table(dynamodb_resource, "test-posts")
+    create_post_counters_table(dynamodb_resource, "test-post-counters")
     posts.append(post_with_attachment)
     with posts_table.batch_writer() as batch:
         for post in posts:
-            batch.put_item(Item=post.model_dump())
+            batch.put_item(Item=with_published_index_keys(post.model_dump()))
+    PostRepository(dynamodb_resource, HedgedCaller(settings)).repair_counters()
 
 
 @pytest.fixture
@@ -176,11 +131,26 @@ def posts(make_post) -> list[Post]:
     return posts
 
 
+@pytest.fixture
+def post_counters_table(dynamodb_resource):
+    return dynamodb_resource.Table("test-post-counters")
+
+
 @pytest.fixture
 def posts_table(dynamodb_resource):
     return dynamodb_resource.Table("test-posts")
 
 
+@pytest.fixture
+def rate_limits_table(dynamodb_resource):
+    return dynamodb_resource.create_table(
+        AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
+        TableName="test-rate-limits",
+        KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
 @pytest.fixture
 def s3_resource(settings: Settings):
     with mock_aws():
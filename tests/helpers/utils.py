@@ -23,3 +23,109 @@ def generate_jwt_token(
         ),
         token_id,
     )
+
+
+def create_posts_table(dynamodb_resource, table_name: str):
+    return dynamodb_resource.create_table(
+        AttributeDefinitions=[
+            {
+                "AttributeName": "id",
+                "AttributeType": "S",
+            },
+            {
+                "AttributeName": "post_path",
+                "AttributeType": "S",
+            },
+            {
+                "AttributeName": "title",
+                "AttributeType": "S",
+            },
+            {
+                "AttributeName": "created_at",
+                "AttributeType": "S",
+            },
+            {
+                "AttributeName": "published_key",
+                "AttributeType": "S",
+            },
+            {
+                "AttributeName": "published_sort_key",
+                "AttributeType": "S",
+            },
+        ],
+        TableName=table_name,
+        KeySchema=[
+            {"AttributeName": "id", "KeyType": "HASH"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": "PostPathIndex",
+                "KeySchema": [
+                    {
+                        "AttributeName": "post_path",
+                        "KeyType": "HASH",
+                    },
+                ],
+                "Projection": {
+                    "ProjectionType": "ALL",
+                },
+            },
+            {
+                "IndexName": "TitleIndex",
+                "KeySchema": [
+                    {
+                        "AttributeName": "title",
+                        "KeyType": "HASH",
+                    },
+                ],
+                "Projection": {
+                    "ProjectionType": "ALL",
+                },
+            },
+            {
+                "IndexName": "CreatedAtIndex",
+                "KeySchema": [
+                    {
+                        "AttributeName": "created_at",
+                        "KeyType": "HASH",
+                    },
+                ],
+                "Projection": {
+                    "ProjectionType": "ALL",
+                },
+            },
+            {
+                "IndexName": "PublishedAtIndex",
+                "KeySchema": [
+                    {
+                        "AttributeName": "published_key",
+                        "KeyType": "HASH",
+                    },
+                    {
+                        "AttributeName": "published_sort_key",
+                        "KeyType": "RANGE",
+                    },
+                ],
+                "Projection": {
+                    "ProjectionType": "INCLUDE",
+                    "NonKeyAttributes": ["meta", "published_at", "title", "updated_at"],
+                },
+            },
+        ],
+        ProvisionedThroughput={"ReadCapacityUnits": 1, "WriteCapacityUnits": 1},
+    )
+
+
+def create_post_counters_table(dynamodb_resource, table_name: str):
+    return dynamodb_resource.create_table(
+        AttributeDefinitions=[
+            {"AttributeName": "pk", "AttributeType": "S"},
+            {"AttributeName": "sk", "AttributeType": "S"},
+        ],
+        TableName=table_name,
+        KeySchema=[
+            {"AttributeName": "pk", "KeyType": "HASH"},
+            {"AttributeName": "sk", "KeyType": "RANGE"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
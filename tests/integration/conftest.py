@@ -1,9 +1,20 @@
 import pytest
 from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
 
+from app import edge_policy
 from app.api_handler import app
+from app.container import container
 
 
 @pytest.fixture
 def test_client(initialize_posts_table) -> TestClient:
-    return TestClient(app, raise_server_exceptions=True)
+    yield TestClient(app, raise_server_exceptions=True)
+    container.close()
+
+
+@pytest.fixture
+def validate_client_on_reads(mocker: MockerFixture):
+    mocker.patch.object(
+        edge_policy, "EDGE_POLICIES", edge_policy.build_edge_policies(True)
+    )
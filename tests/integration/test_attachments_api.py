@@ -7,7 +7,8 @@ from httpx import Response
 from mypy_boto3_cloudformation import ServiceResource
 from respx import MockRouter
 
-from app.middlewares import COUNTRY_IS_API_BASE_URL, banned_hosts
+from app.middlewares import (COUNTRY_IS_API_BASE_URL, banned_hosts,
+                             host_verdicts)
 from app.models.post import Attachment, Post
 from app.schemas.attachment_schema import CreateAttachment
 from tests.helpers.utils import generate_jwt_token
@@ -29,6 +30,7 @@ class TestAttachmentsApi:
             CreateBucketConfiguration={"LocationConstraint": pytest.aws_default_region},
         )
         banned_hosts.clear()
+        host_verdicts.clear()
         respx_mock.route(method="GET", url__startswith=COUNTRY_IS_API_BASE_URL).mock(
             Response(
                 status_code=status.HTTP_200_OK,
@@ -119,6 +121,7 @@ class TestAttachmentsApi:
         respx_mock: MockRouter,
         post_with_attachment: Post,
         test_client: TestClient,
+        validate_client_on_reads,
     ):
         route_mock = respx_mock.route(
             method="GET",
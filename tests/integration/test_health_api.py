@@ -0,0 +1,30 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+
+
+class TestHealthApi:
+    def test_successfully_get_health(self, test_client: TestClient):
+        response = test_client.get("/health")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"status": "ok"}
+        assert response.headers["X-Correlation-ID"]
+        assert "X-RateLimit-Limit" not in response.headers
+
+    def test_successfully_get_metrics(self, test_client: TestClient):
+        test_client.get("/health")
+
+        response = test_client.get("/metrics")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["GET /health"]["2xx"]["count"] >= 1
+
+    def test_successfully_get_aws_metrics(self, test_client: TestClient):
+        test_client.get("/api/v1/posts")
+
+        response = test_client.get("/metrics/aws")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["clients"]["dynamodb"]["requests"] >= 1
+        assert response.json()["clients"]["dynamodb"]["in_flight"] == 0
+        assert response.json()["operations"]["operations"]["get_posts"]["count"] >= 1
@@ -1,14 +1,18 @@
 import random
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 import pendulum
 import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
 from httpx import ConnectTimeout, Response
+from pytest_mock import MockerFixture
 from respx import MockRouter
 
-from app.middlewares import COUNTRY_IS_API_BASE_URL, banned_hosts
+from app import middlewares
+from app.middlewares import (COUNTRY_IS_API_BASE_URL, banned_hosts,
+                             host_verdicts)
 from app.models.post import Post
 from app.schemas.post_schema import CreatePost
 from tests.helpers.utils import generate_jwt_token
@@ -37,6 +41,7 @@ class TestPostsApi:
     @pytest.fixture(autouse=True)
     def setup_function(self, respx_mock: MockRouter):
         banned_hosts.clear()
+        host_verdicts.clear()
         respx_mock.route(method="GET", url__startswith=COUNTRY_IS_API_BASE_URL).mock(
             Response(
                 status_code=status.HTTP_200_OK,
@@ -55,6 +60,39 @@ class TestPostsApi:
             post = next(post for post in posts if post.id == post_response["id"])
             assert post_response.items() <= post.model_dump(by_alias=True).items()
 
+    def test_successfully_get_posts_with_cursor(
+        self, posts: list[Post], test_client: TestClient
+    ):
+        ids = []
+        params = {"limit": 4}
+        while True:
+            response = test_client.get(BASE_URL, params=params)
+            assert response.status_code == status.HTTP_200_OK
+            page = response.json()
+            assert len(page["posts"]) <= 4
+            assert "exclusiveStartKey" not in page
+            ids.extend(post["id"] for post in page["posts"])
+            if "nextCursor" not in page:
+                break
+            params["cursor"] = page["nextCursor"]
+
+        assert sorted(ids) == sorted(post.id for post in posts)
+
+    @pytest.mark.parametrize("limit", [0, 101])
+    def test_fail_to_get_posts_due_to_invalid_limit(
+        self, limit: int, test_client: TestClient
+    ):
+        response = test_client.get(BASE_URL, params={"limit": limit})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_fail_to_get_posts_due_to_invalid_cursor(
+        self, posts: list[Post], test_client: TestClient
+    ):
+        response = test_client.get(BASE_URL, params={"cursor": "invalid"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_fail_to_get_post_by_uuid_due_to_not_found(
         self, posts: list[Post], test_client: TestClient
     ):
@@ -93,6 +131,7 @@ class TestPostsApi:
         self,
         respx_mock: MockRouter,
         test_client: TestClient,
+        validate_client_on_reads,
     ):
         route_mock = respx_mock.route(
             method="GET",
@@ -111,14 +150,40 @@ class TestPostsApi:
 
         assert response.status_code == status.HTTP_403_FORBIDDEN
         assert response.json() == {"message": "Forbidden"}
+        assert response.headers["X-Correlation-ID"]
         assert route_mock.called
         assert route_mock.call_count == 1
 
+    def test_successfully_get_post_without_client_validation(
+        self,
+        posts: list[Post],
+        respx_mock: MockRouter,
+        test_client: TestClient,
+    ):
+        route_mock = respx_mock.route(
+            method="GET",
+            url__startswith=COUNTRY_IS_API_BASE_URL,
+        ).mock(
+            Response(
+                status_code=status.HTTP_200_OK,
+                json={
+                    "ip": "testclient",
+                    "country": "RU",
+                },
+            ),
+        )
+
+        response = test_client.get(f"{BASE_URL}/{posts[0].id}")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not route_mock.called
+
     def test_successfully_get_post_despite_country_api_unavailability(
         self,
         posts: list[Post],
         respx_mock: MockRouter,
         test_client: TestClient,
+        validate_client_on_reads,
     ):
         route_mock = respx_mock.route(
             method="GET", url__startswith=COUNTRY_IS_API_BASE_URL
@@ -146,6 +211,39 @@ class TestPostsApi:
         assert route_mock.called
         assert route_mock.call_count == 1
 
+    def test_successfully_get_post_with_server_timing(
+        self,
+        mocker: MockerFixture,
+        posts: list[Post],
+        test_client: TestClient,
+        validate_client_on_reads,
+    ):
+        mocker.patch.object(middlewares.settings, "server_timing", True)
+
+        response = test_client.get(f"{BASE_URL}/{posts[0].id}")
+
+        assert response.status_code == status.HTTP_200_OK
+        server_timing = {
+            metric.split(";")[0]
+            for metric in response.headers["Server-Timing"].split(", ")
+        }
+        assert {
+            "geo",
+            "ratelimit",
+            "db.get_post_by_uuid",
+            "markdown",
+            "serialize",
+            "total",
+        } <= server_timing
+
+    def test_successfully_get_post_without_server_timing(
+        self, posts: list[Post], test_client: TestClient
+    ):
+        response = test_client.get(f"{BASE_URL}/{posts[0].id}")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "Server-Timing" not in response.headers
+
     def test_successfully_get_archive(self, posts: list[Post], test_client: TestClient):
         response = test_client.get(f"{BASE_URL}/archive")
 
@@ -240,6 +338,34 @@ class TestPostsApi:
 
         assert response.status_code == status.HTTP_204_NO_CONTENT
 
+    def test_successfully_authorize_concurrent_requests_with_distinct_tokens(
+        self,
+        posts: list[Post],
+        test_client: TestClient,
+        user_dict: dict[str, str | None],
+        mocker: MockerFixture,
+    ):
+        mocker.patch.object(middlewares.settings, "rate_limiting", False)
+
+        def delete_post(index: int) -> tuple[int, int]:
+            jwt_secret = (
+                pytest.jwt_secret_ssm_param_value if index % 2 else "invalid-secret"
+            )
+            jwt_token, _ = generate_jwt_token(jwt_secret, user_dict)
+            response = test_client.delete(
+                f"{BASE_URL}/{uuid.uuid4()}",
+                headers={"Authorization": f"Bearer {jwt_token}"},
+            )
+            expected_status_code = (
+                status.HTTP_404_NOT_FOUND if index % 2 else status.HTTP_403_FORBIDDEN
+            )
+            return response.status_code, expected_status_code
+
+        with test_client, ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(delete_post, range(200)))
+
+        assert all(status_code == expected for status_code, expected in results)
+
     def test_fail_to_create_post_due_to_bad_request(
         self,
         test_client: TestClient,
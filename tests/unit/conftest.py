@@ -1,21 +1,38 @@
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 import pendulum
 import pytest
 from boto3.dynamodb.conditions import Attr, ConditionBase
 
+from app.hedging import HedgedCaller
 from app.jwt_bearer import JWTBearer
+from app.jwt_secret_provider import parse_keys
 from app.models.auth import JWTToken
+from app.pagination import CursorCodec
 from app.repositories.post_repository import PostRepository
 from app.services.attachment_service import AttachmentService
 from app.services.post_service import PostService
 from app.services.publisher_service import PublisherService
 from app.services.storage_service import StorageService
+from app.settings import Settings
 
 
 @pytest.fixture
-def attachment_service() -> AttachmentService:
-    return AttachmentService()
+def attachment_service(
+    post_service: PostService, storage_service: StorageService
+) -> AttachmentService:
+    return AttachmentService(post_service, storage_service)
+
+
+@pytest.fixture
+def cursor_codec(settings: Settings) -> CursorCodec:
+    return CursorCodec(lambda: parse_keys(settings.cursor_secret))
+
+
+@pytest.fixture
+def hedged_caller(settings: Settings) -> HedgedCaller:
+    return HedgedCaller(settings)
 
 
 @pytest.fixture
@@ -42,20 +59,40 @@ def jwt_token(user_dict: dict[str, str | None]) -> JWTToken:
 
 
 @pytest.fixture
-def post_repository(initialize_posts_table) -> PostRepository:
-    return PostRepository()
+def post_repository(
+    initialize_posts_table, dynamodb_resource, hedged_caller: HedgedCaller
+) -> PostRepository:
+    return PostRepository(dynamodb_resource, hedged_caller)
+
+
+@pytest.fixture
+def parallel_post_repository(
+    initialize_posts_table,
+    dynamodb_resource,
+    hedged_caller: HedgedCaller,
+    scan_executor: ThreadPoolExecutor,
+) -> PostRepository:
+    return PostRepository(dynamodb_resource, hedged_caller, scan_executor)
+
+
+@pytest.fixture
+def post_service(
+    cursor_codec: CursorCodec, dynamodb_resource, hedged_caller: HedgedCaller
+) -> PostService:
+    return PostService(PostRepository(dynamodb_resource, hedged_caller), cursor_codec)
 
 
 @pytest.fixture
-def post_service() -> PostService:
-    return PostService()
+def publisher_service(post_service: PostService) -> PublisherService:
+    return PublisherService(post_service)
 
 
 @pytest.fixture
-def publisher_service() -> PublisherService:
-    return PublisherService()
+def scan_executor() -> ThreadPoolExecutor:
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
 
 
 @pytest.fixture
-def storage_service() -> StorageService:
-    return StorageService()
+def storage_service(s3_resource) -> StorageService:
+    return StorageService(s3_resource)
@@ -3,10 +3,18 @@ from collections import Counter
 from random import randint
 
 import pendulum
+import pytest
 from boto3.dynamodb.conditions import ConditionBase
+from botocore.exceptions import ClientError
+from pytest_mock import MockerFixture
 
+from app.hedging import HedgedCaller
 from app.models.post import Post
-from app.repositories.post_repository import PostRepository
+from app.repositories.post_repository import (PUBLISHED_KEY,
+                                              PUBLISHED_KEY_VALUE,
+                                              PUBLISHED_SORT_KEY,
+                                              PostRepository, published_month,
+                                              with_published_index_keys)
 
 LARGE_SIZED_POST_MAX_LENGTH = 25_000
 LARGE_SIZED_POST_MIN_LENGTH = 10_000
@@ -27,7 +35,7 @@ class TestPostRepository:
 
         response = posts_table.get_item(Key={"id": post_dict["id"]})
 
-        assert response["Item"] == post_dict
+        assert response["Item"] == with_published_index_keys(post_dict)
 
     def test_successfully_get_all_posts(
         self,
@@ -86,7 +94,7 @@ class TestPostRepository:
     ):
         item = post_repository.get_post_by_uuid(posts[0].id, filter_expression)
 
-        assert posts[0].model_dump() == item
+        assert with_published_index_keys(posts[0].model_dump()) == item
 
     def test_fail_to_get_post_by_uuid(
         self,
@@ -129,6 +137,56 @@ class TestPostRepository:
     ):
         assert len(posts) == post_repository.count_all_posts(filter_expression)
 
+    def test_successfully_get_all_posts_with_parallel_scan(
+        self,
+        filter_expression: ConditionBase,
+        hedged_caller: HedgedCaller,
+        mocker: MockerFixture,
+        posts: list[Post],
+        parallel_post_repository: PostRepository,
+    ):
+        read = mocker.spy(hedged_caller, "read")
+
+        items = parallel_post_repository.get_all_posts(filter_expression, ["id"])
+
+        assert sorted(item["id"] for item in items) == sorted(post.id for post in posts)
+        assert sorted(call.kwargs["Segment"] for call in read.call_args_list) == [
+            0,
+            1,
+            2,
+            3,
+        ]
+        assert {call.kwargs["TotalSegments"] for call in read.call_args_list} == {4}
+
+    def test_successfully_count_all_posts_with_parallel_scan(
+        self,
+        filter_expression: ConditionBase,
+        posts: list[Post],
+        parallel_post_repository: PostRepository,
+    ):
+        assert parallel_post_repository.count_all_posts(filter_expression) == len(posts)
+
+    def test_fail_to_get_all_posts_with_parallel_scan_due_to_segment_error(
+        self,
+        filter_expression: ConditionBase,
+        mocker: MockerFixture,
+        posts: list[Post],
+        parallel_post_repository: PostRepository,
+    ):
+        scan = parallel_post_repository._table.scan
+
+        def fail_on_last_segment(**kwargs):
+            if kwargs["Segment"] == 3:
+                raise ValueError("error")
+            return scan(**kwargs)
+
+        mocker.patch.object(
+            parallel_post_repository._table, "scan", side_effect=fail_on_last_segment
+        )
+
+        with pytest.raises(ValueError):
+            parallel_post_repository.get_all_posts(filter_expression, ["id"])
+
     def test_successfully_count_all_posts_with_using_last_evaluated_key(
         self,
         faker,
@@ -162,7 +220,7 @@ class TestPostRepository:
             posts[0].post_path, filter_expression
         )
 
-        assert item == posts[0].model_dump()
+        assert item == with_published_index_keys(posts[0].model_dump())
 
     def test_successfully_get_post_by_title(
         self,
@@ -172,67 +230,305 @@ class TestPostRepository:
     ):
         item = post_repository.get_post_by_title(posts[0].title, filter_expression)
 
-        assert item == posts[0].model_dump()
+        assert item == with_published_index_keys(posts[0].model_dump())
 
     def test_successfully_get_posts(
         self,
-        filter_expression: ConditionBase,
         posts: list[Post],
         post_repository: PostRepository,
     ):
         last_evaluated_key, response = post_repository.get_posts(
-            filter_expression, None, list(posts[0].model_fields.keys())
+            len(posts) + 1, None, ["id", "title", "meta", "published_at", "updated_at"]
         )
 
         assert last_evaluated_key is None
         assert len(response) == len(posts)
+        assert set(response[0]) == {"id", "title", "meta", "published_at", "updated_at"}
 
     def test_successfully_get_posts_without_fields(
         self,
-        filter_expression: ConditionBase,
         posts: list[Post],
         post_repository: PostRepository,
     ):
-        last_evaluated_key, response = post_repository.get_posts(
-            filter_expression, None
-        )
+        last_evaluated_key, response = post_repository.get_posts(len(posts) + 1)
 
         assert last_evaluated_key is None
         assert len(response) == len(posts)
 
+    def test_successfully_get_posts_newest_first(
+        self,
+        make_post,
+        post_repository: PostRepository,
+    ):
+        now = pendulum.now()
+        for days in (3, 1, 2):
+            post = make_post()
+            post.published_at = now.subtract(days=days).to_iso8601_string()
+            post_repository.create_post(post.model_dump())
+
+        _, response = post_repository.get_posts(100)
+
+        published_at = [post["published_at"] for post in response]
+        assert published_at == sorted(published_at, reverse=True)
+
+    def test_successfully_get_posts_without_deleted_and_unpublished_posts(
+        self,
+        make_post,
+        posts: list[Post],
+        post_repository: PostRepository,
+    ):
+        deleted_post = make_post()
+        deleted_post.deleted_at = pendulum.now().to_iso8601_string()
+        draft_post = make_post()
+        draft_post.published_at = None
+        post_repository.create_post(deleted_post.model_dump())
+        post_repository.create_post(draft_post.model_dump())
+
+        _, response = post_repository.get_posts(100)
+
+        assert {post["id"] for post in response} == {post.id for post in posts}
+
+    def test_successfully_get_posts_with_limit(
+        self,
+        posts: list[Post],
+        post_repository: PostRepository,
+    ):
+        last_evaluated_key, response = post_repository.get_posts(3)
+
+        assert len(response) == 3
+        assert last_evaluated_key == {
+            "id": response[-1]["id"],
+            PUBLISHED_KEY: PUBLISHED_KEY_VALUE,
+            PUBLISHED_SORT_KEY: response[-1]["published_at"],
+        }
+
     def test_successfully_get_posts_with_exclusive_start_key(
+        self,
+        posts: list[Post],
+        post_repository: PostRepository,
+    ):
+        pages = []
+        last_evaluated_key = None
+        while True:
+            last_evaluated_key, response = post_repository.get_posts(
+                4, last_evaluated_key
+            )
+            pages.append(response)
+            if not last_evaluated_key:
+                break
+
+        ids = [post["id"] for page in pages for post in page]
+        assert sorted(ids) == sorted(post.id for post in posts)
+
+    def test_successfully_remove_published_key_of_deleted_post(
         self,
         filter_expression: ConditionBase,
         posts: list[Post],
         post_repository: PostRepository,
+        posts_table,
     ):
-        last_evaluated_key, response = post_repository.get_posts(
-            filter_expression, {"id": posts[0].id}
+        posts[0].deleted_at = pendulum.now().to_iso8601_string()
+
+        post_repository.update_post(
+            posts[0].id, posts[0].model_dump(exclude={"id"}), filter_expression
         )
 
-        assert last_evaluated_key is None
-        assert not any(post["id"] == posts[0].id for post in response)
+        item = posts_table.get_item(Key={"id": posts[0].id})["Item"]
+        assert item["deleted_at"] == posts[0].deleted_at
+        assert PUBLISHED_KEY not in item
 
-    def test_successfully_get_posts_with_the_return_of_last_evaluated_key(
+    def test_successfully_backfill_published_keys(
         self,
-        faker,
-        filter_expression: ConditionBase,
         make_post,
         posts: list[Post],
         post_repository: PostRepository,
         posts_table,
     ):
+        deleted_post = make_post()
+        deleted_post.deleted_at = pendulum.now().to_iso8601_string()
         with posts_table.batch_writer() as batch:
-            for _ in range(MAX_NUMBER_OF_LARGE_SIZED_POSTS):
-                long_sized_post = make_post()
-                long_sized_post.content = faker.text(
-                    randint(LARGE_SIZED_POST_MIN_LENGTH, LARGE_SIZED_POST_MAX_LENGTH)
-                )
-                batch.put_item(Item=long_sized_post.model_dump())
+            for post in posts:
+                batch.put_item(Item=post.model_dump())
+            batch.put_item(
+                Item={**deleted_post.model_dump(), PUBLISHED_KEY: PUBLISHED_KEY_VALUE}
+            )
+
+        assert post_repository.backfill_published_keys() == len(posts) + 1
+        assert post_repository.backfill_published_keys() == 0
+        _, response = post_repository.get_posts(100)
+        assert {post["id"] for post in response} == {post.id for post in posts}
+
+    def test_successfully_count_created_post(
+        self,
+        make_post,
+        posts: list[Post],
+        post_repository: PostRepository,
+    ):
+        post = make_post()
+        post.published_at = "2021-03-04T05:06:07+00:00"
+        draft_post = make_post()
+        draft_post.published_at = None
 
-        last_evaluated_key, response = post_repository.get_posts(
-            filter_expression, None
+        post_repository.create_post(post.model_dump())
+        post_repository.create_post(draft_post.model_dump())
+
+        assert post_repository.get_archive()["2021-03"] == 1
+        assert post_repository.get_post_counts() == {
+            "live": len(posts) + 2,
+            "published": len(posts) + 1,
+        }
+
+    def test_successfully_count_post_published_with_non_iso_date(
+        self,
+        make_post,
+        posts: list[Post],
+        post_repository: PostRepository,
+    ):
+        post = make_post()
+        post.published_at = "20210304T050607Z"
+
+        post_repository.create_post(post.model_dump())
+
+        assert post_repository.get_archive()["2021-03"] == 1
+
+    def test_successfully_count_updated_and_deleted_post(
+        self,
+        filter_expression: ConditionBase,
+        posts: list[Post],
+        post_repository: PostRepository,
+    ):
+        month = pendulum.parse(posts[0].published_at).format("YYYY-MM")
+        previous = posts[0].model_dump(exclude={"id"})
+
+        post_repository.update_post(
+            posts[0].id,
+            {**previous, "published_at": "2021-03-04T05:06:07+00:00"},
+            filter_expression,
+            previous,
+        )
+        post_repository.update_post(
+            posts[1].id,
+            {"deleted_at": pendulum.now().to_iso8601_string()},
+            filter_expression,
+            posts[1].model_dump(exclude={"id"}),
+        )
+
+        assert post_repository.get_archive() == {
+            month: len(posts) - 2,
+            "2021-03": 1,
+        }
+        assert post_repository.get_post_counts() == {
+            "live": len(posts) - 1,
+            "published": len(posts) - 1,
+        }
+
+    def test_fail_to_update_post_due_to_concurrent_publish(
+        self,
+        filter_expression: ConditionBase,
+        posts: list[Post],
+        post_repository: PostRepository,
+    ):
+        previous = posts[0].model_dump(exclude={"id"})
+        previous["published_at"] = None
+
+        with pytest.raises(ClientError) as excinfo:
+            post_repository.update_post(
+                posts[0].id,
+                {"deleted_at": pendulum.now().to_iso8601_string()},
+                filter_expression,
+                previous,
+            )
+
+        assert excinfo.value.response["Error"]["Code"] == (
+            "TransactionCanceledException"
+        )
+        assert post_repository.get_post_counts() == {
+            "live": len(posts),
+            "published": len(posts),
+        }
+
+    def test_fail_to_count_post_due_to_failed_transaction(
+        self,
+        make_post,
+        posts: list[Post],
+        post_repository: PostRepository,
+    ):
+        post = make_post()
+        post.id = posts[0].id
+
+        with pytest.raises(ClientError) as excinfo:
+            post_repository.create_post(post.model_dump())
+
+        assert excinfo.value.response["Error"]["Code"] == (
+            "TransactionCanceledException"
         )
+        assert post_repository.get_post_counts() == {
+            "live": len(posts),
+            "published": len(posts),
+        }
 
-        assert last_evaluated_key is not None
-        assert response[-1]["id"] == last_evaluated_key
+    def test_successfully_repair_counters(
+        self,
+        make_post,
+        posts: list[Post],
+        post_repository: PostRepository,
+        post_counters_table,
+    ):
+        month = pendulum.parse(posts[0].published_at).format("YYYY-MM")
+        post_counters_table.put_item(
+            Item={"pk": "archive", "sk": "1999-01", "count": 5}
+        )
+        post_counters_table.put_item(Item={"pk": "archive", "sk": month, "count": 1})
+        post_counters_table.put_item(
+            Item={"pk": "totals", "sk": "posts", "live": 1, "published": 1}
+        )
+
+        assert post_repository.repair_counters() == 3
+        assert post_repository.get_archive() == {month: len(posts)}
+        assert post_repository.get_post_counts() == {
+            "live": len(posts),
+            "published": len(posts),
+        }
+
+    def test_successfully_hedge_point_reads(
+        self,
+        filter_expression: ConditionBase,
+        hedged_caller: HedgedCaller,
+        mocker: MockerFixture,
+        posts: list[Post],
+        post_repository: PostRepository,
+    ):
+        read = mocker.spy(hedged_caller, "read")
+
+        post_repository.get_post_by_uuid(posts[0].id, filter_expression)
+        post_repository.get_post_by_post_path(posts[0].post_path, filter_expression)
+        post_repository.get_post_by_title(posts[0].title, filter_expression)
+
+        assert [call.args[0] for call in read.call_args_list] == [
+            "get_post_by_uuid",
+            "get_post_by_post_path",
+            "get_post_by_title",
+        ]
+        assert [call.kwargs.get("hedge", False) for call in read.call_args_list] == [
+            True,
+            True,
+            False,
+        ]
+        assert hedged_caller.latency("get_post_by_uuid").count == 1
+
+
+class TestPublishedMonth:
+    @pytest.mark.parametrize(
+        "published_at,month",
+        [
+            ("2024-05-01T10:00:00+00:00", "2024-05"),
+            ("2024-12", "2024-12"),
+            ("20240501T100000Z", "2024-05"),
+        ],
+    )
+    def test_successfully_get_published_month(self, published_at: str, month: str):
+        assert published_month(published_at) == month
+
+    def test_fail_to_get_published_month_due_to_duration(self):
+        with pytest.raises(ValueError):
+            published_month("P1M")
@@ -0,0 +1,40 @@
+import pytest
+from botocore.exceptions import ClientError
+
+from app.repositories.rate_limit_repository import RateLimitRepository
+
+EXPIRES_AT = 2_000_000_000
+KEY = "127.0.0.1#1"
+LIMIT = 5
+
+
+class TestRateLimitRepository:
+    @pytest.fixture
+    def rate_limit_repository(self, dynamodb_resource) -> RateLimitRepository:
+        return RateLimitRepository(dynamodb_resource)
+
+    def test_successfully_lease_tokens(
+        self, rate_limit_repository: RateLimitRepository, rate_limits_table
+    ):
+        assert rate_limit_repository.lease_tokens(KEY, 2, LIMIT, EXPIRES_AT) == 2
+        assert rate_limit_repository.lease_tokens(KEY, 2, LIMIT, EXPIRES_AT) == 4
+
+        item = rate_limits_table.get_item(Key={"id": KEY})["Item"]
+        assert item["consumed"] == 4
+        assert item["expires_at"] == EXPIRES_AT
+
+    def test_fail_to_lease_tokens_due_to_exceeded_limit(
+        self, rate_limit_repository: RateLimitRepository, rate_limits_table
+    ):
+        rate_limit_repository.lease_tokens(KEY, 4, LIMIT, EXPIRES_AT)
+
+        assert rate_limit_repository.lease_tokens(KEY, 2, LIMIT, EXPIRES_AT) is None
+        assert rate_limit_repository.lease_tokens(KEY, 1, LIMIT, EXPIRES_AT) == LIMIT
+
+    def test_fail_to_lease_tokens_due_to_missing_table(
+        self, rate_limit_repository: RateLimitRepository
+    ):
+        with pytest.raises(ClientError) as excinfo:
+            rate_limit_repository.lease_tokens(KEY, 1, LIMIT, EXPIRES_AT)
+
+        assert excinfo.value.response["Error"]["Code"] == "ResourceNotFoundException"
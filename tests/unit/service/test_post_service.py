@@ -6,9 +6,11 @@ import pytest
 from fastapi import status
 from pytest_mock import MockerFixture
 
-from app.exceptions import PostAlreadyExistsException, PostNotFoundException
+from app.exceptions import (InvalidCursorException, PostAlreadyExistsException,
+                            PostNotFoundException)
 from app.models.post import Post
 from app.models.response import Post as PostResponse
+from app.pagination import CursorCodec
 from app.repositories.post_repository import PostRepository
 from app.schemas.post_schema import UpdatePost
 from app.services.post_service import PostService
@@ -89,7 +91,7 @@ class TestPostService:
         post_service.delete_post(posts[0].id)
 
         post_repository.get_post_by_uuid.assert_called_once_with(posts[0].id, ANY)
-        post_repository.update_post.assert_called_once_with(posts[0].id, ANY, ANY)
+        post_repository.update_post.assert_called_once_with(posts[0].id, ANY, ANY, ANY)
 
     def test_fail_to_delete_post_due_to_not_found_exception(
         self,
@@ -156,7 +158,7 @@ class TestPostService:
         post_service.update_post(
             posts[0].id, {"content": "Updated content", "title": "Updated title"}
         )
-        post_repository.update_post.assert_called_once_with(posts[0].id, ANY, ANY)
+        post_repository.update_post.assert_called_once_with(posts[0].id, ANY, ANY, ANY)
 
     def test_fail_to_update_post_due_post_not_found_exception(
         self,
@@ -184,19 +186,66 @@ class TestPostService:
         post_service: PostService,
     ):
         mocker.patch.object(
-            PostRepository, "get_all_posts", return_value=[posts[0].model_dump()]
+            PostRepository,
+            "get_archive",
+            return_value={pendulum.parse(posts[0].published_at).format("YYYY-MM"): 1},
         )
 
         result = post_service.get_archive()
 
         assert result.get(pendulum.parse(posts[0].published_at).format("YYYY-MM")) == 1
 
+    def test_successfully_get_archive_with_empty_months(
+        self,
+        mocker: MockerFixture,
+        post_service: PostService,
+    ):
+        mocker.patch.object(
+            PostRepository, "get_archive", return_value={"2024-11": 2, "2025-02": 1}
+        )
+
+        result = post_service.get_archive()
+
+        assert result == {"2024-11": 2, "2024-12": 0, "2025-01": 0, "2025-02": 1}
+
+    def test_successfully_get_archive_from_cache(
+        self,
+        mocker: MockerFixture,
+        post_repository: PostRepository,
+        post_service: PostService,
+    ):
+        mocker.patch.object(PostRepository, "get_archive", return_value={"2024-11": 2})
+
+        assert post_service.get_archive() == post_service.get_archive()
+        post_repository.get_archive.assert_called_once()
+
+    def test_successfully_invalidate_archive_cache_on_write(
+        self,
+        mocker: MockerFixture,
+        make_post,
+        post_repository: PostRepository,
+        post_service: PostService,
+    ):
+        mocker.patch.object(PostRepository, "get_archive", return_value={"2024-11": 2})
+        mocker.patch.object(PostRepository, "get_post_by_title", return_value=None)
+        mocker.patch.object(PostRepository, "create_post")
+        post_service.get_archive()
+
+        post_service.create_post(
+            make_post().model_dump(
+                include={"author", "title", "content", "tags", "meta", "published_at"}
+            )
+        )
+        post_service.get_archive()
+
+        assert post_repository.get_archive.call_count == 2
+
     def test_successfully_get_archive_and_return_none(
         self,
         mocker: MockerFixture,
         post_service: PostService,
     ):
-        mocker.patch.object(PostRepository, "get_all_posts", return_value=[])
+        mocker.patch.object(PostRepository, "get_archive", return_value={})
 
         result = post_service.get_archive()
 
@@ -261,7 +310,42 @@ class TestPostService:
                 post.model_dump(exclude="attachments").items()
                 <= posts[idx].model_dump(exclude="attachments").items()
             )
-        post_repository.get_posts.assert_called_once_with(ANY, None, ANY)
+        post_repository.get_posts.assert_called_once_with(20, None, ANY)
+
+    def test_successfully_get_posts_with_cursor(
+        self,
+        cursor_codec: CursorCodec,
+        mocker: MockerFixture,
+        post_repository: PostRepository,
+        post_service: PostService,
+        posts: list[Post],
+    ):
+        last_evaluated_key = {"id": posts[-1].id, "published_sort_key": "2024"}
+        mocker.patch.object(
+            PostRepository,
+            "get_posts",
+            return_value=[last_evaluated_key, [post.model_dump() for post in posts]],
+        )
+
+        result = post_service.get_posts(5, cursor_codec.encode({"id": posts[0].id}))
+
+        assert "exclusive_start_key" not in result.model_dump()
+        assert cursor_codec.decode(result.next_cursor) == last_evaluated_key
+        post_repository.get_posts.assert_called_once_with(5, {"id": posts[0].id}, ANY)
+
+    def test_fail_to_get_posts_due_to_invalid_cursor(
+        self,
+        mocker: MockerFixture,
+        post_repository: PostRepository,
+        post_service: PostService,
+    ):
+        mocker.patch.object(PostRepository, "get_posts")
+
+        with pytest.raises(InvalidCursorException) as excinfo:
+            post_service.get_posts(5, "invalid")
+
+        assert status.HTTP_400_BAD_REQUEST == excinfo.value.status_code
+        post_repository.get_posts.assert_not_called()
 
     def test_successfully_get_post_by_uuid(
         self,
@@ -1,13 +1,21 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock
 
+import boto3
 import jwt
 import pytest
+from aws_lambda_powertools.utilities import parameters
 from fastapi import HTTPException, status
 from fastapi.requests import Request
+from pytest_mock import MockerFixture
 
-from app.jwt_bearer import JWTBearer
+from app.jwt_bearer import JWTBearer, verified_tokens
+from app.jwt_secret_provider import jwt_secret_provider
 from app.models.auth import JWTToken
 from app.settings import Settings
+from tests.helpers.utils import generate_jwt_token
 
 NOT_AUTHENTICATED = "Not authenticated"
 
@@ -33,6 +41,29 @@ def valid_request(empty_request: Mock, jwt_token: JWTToken, settings: Settings)
     return empty_request
 
 
+@pytest.fixture(autouse=True)
+def clear_verified_tokens():
+    verified_tokens.clear()
+
+
+def put_jwt_secret(value: str):
+    boto3.client("ssm").put_parameter(
+        Name=pytest.jwt_secret_ssm_param_name,
+        Value=value,
+        Type="SecureString",
+        Overwrite=True,
+    )
+    parameters.clear_caches()
+    jwt_secret_provider.clear()
+
+
+@pytest.fixture
+def rotated_secrets():
+    put_jwt_secret(json.dumps({"v1": "old-secret", "v2": "new-secret"}))
+    yield
+    put_jwt_secret(pytest.jwt_secret_ssm_param_value)
+
+
 class TestJWTAuth:
     def test_fail_to_authorize_request_due_to_authorization_header_is_empty(
         self, empty_request: Mock, jwt_bearer: JWTBearer
@@ -186,3 +217,111 @@ class TestJWTAuth:
         result = jwt_bearer(request)
 
         assert jwt_token.model_dump() == result.model_dump()
+
+    @pytest.mark.parametrize("kid", ["v1", "v2", None])
+    def test_successfully_authorize_request_with_rotated_secrets(
+        self,
+        empty_request: Mock,
+        jwt_bearer: JWTBearer,
+        jwt_token: JWTToken,
+        rotated_secrets,
+        kid: str | None,
+    ):
+        secret = "old-secret" if kid == "v1" else "new-secret"
+        headers = {"kid": kid} if kid else None
+        bearer_token = jwt.encode(jwt_token.model_dump(), secret, headers=headers)
+        empty_request.headers = {"Authorization": f"Bearer {bearer_token}"}
+
+        assert jwt_bearer(empty_request).model_dump() == jwt_token.model_dump()
+
+    def test_fail_to_authorize_request_due_to_unknown_kid(
+        self,
+        empty_request: Mock,
+        jwt_bearer: JWTBearer,
+        jwt_token: JWTToken,
+        rotated_secrets,
+    ):
+        bearer_token = jwt.encode(
+            jwt_token.model_dump(), "new-secret", headers={"kid": "v3"}
+        )
+        empty_request.headers = {"Authorization": f"Bearer {bearer_token}"}
+
+        with pytest.raises(HTTPException) as excinfo:
+            jwt_bearer(empty_request)
+
+        assert excinfo.value.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_successfully_authorize_request_from_verified_token_cache(
+        self,
+        jwt_bearer: JWTBearer,
+        jwt_token: JWTToken,
+        valid_request: Request,
+        mocker: MockerFixture,
+    ):
+        decode = mocker.spy(jwt, "decode")
+        hits = verified_tokens.hits
+
+        results = [jwt_bearer(valid_request) for _ in range(3)]
+
+        assert all(result.model_dump() == jwt_token.model_dump() for result in results)
+        assert decode.call_count == 1
+        assert verified_tokens.hits == hits + 2
+
+    def test_successfully_expire_cached_token_at_exp(
+        self,
+        jwt_bearer: JWTBearer,
+        jwt_token: JWTToken,
+        settings: Settings,
+        mocker: MockerFixture,
+    ):
+        jwt_token.exp = int(time.time()) + 10
+        bearer_token = generate_bearer_token(jwt_token, settings.jwt_secret)
+        request = Mock()
+        request.headers = {"Authorization": f"Bearer {bearer_token}"}
+        decode = mocker.spy(jwt, "decode")
+        jwt_bearer(request)
+
+        mocker.patch("app.cache.time.monotonic", return_value=time.monotonic() + 11)
+        jwt_bearer(request)
+
+        assert decode.call_count == 2
+
+    def test_successfully_skip_caching_token_at_exp(
+        self,
+        jwt_bearer: JWTBearer,
+        jwt_token: JWTToken,
+        settings: Settings,
+        mocker: MockerFixture,
+    ):
+        jwt_token.exp = int(time.time()) + 10
+        bearer_token = generate_bearer_token(jwt_token, settings.jwt_secret)
+        request = Mock()
+        request.headers = {"Authorization": f"Bearer {bearer_token}"}
+        mocker.patch("app.jwt_bearer.time.time", return_value=jwt_token.exp)
+        decode = mocker.spy(jwt, "decode")
+
+        jwt_bearer(request)
+        jwt_bearer(request)
+
+        assert decode.call_count == 2
+
+    def test_successfully_authorize_concurrent_requests_with_distinct_tokens(
+        self, jwt_bearer: JWTBearer, user_dict: dict[str, str | None]
+    ):
+        def authorize(index: int) -> tuple[str | None, str | None]:
+            valid = index % 2 == 0
+            jwt_token, token_id = generate_jwt_token(
+                pytest.jwt_secret_ssm_param_value if valid else "invalid-secret",
+                user_dict,
+            )
+            request = Mock()
+            request.headers = {"Authorization": f"Bearer {jwt_token}"}
+            try:
+                return token_id if valid else None, jwt_bearer(request).jti
+            except HTTPException:
+                return token_id if valid else None, None
+
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            results = list(executor.map(authorize, range(1000)))
+
+        assert all(expected == actual for expected, actual in results)
@@ -0,0 +1,95 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.aws_clients import AWSClientFactory
+from app.settings import Settings
+
+
+class TestAWSClientFactory:
+    @pytest.fixture
+    def aws_clients(self, settings: Settings) -> AWSClientFactory:
+        settings.db_scan_workers = 0
+        settings.worker_threads = 2
+        return AWSClientFactory(settings)
+
+    def test_successfully_configure_clients(self, aws_clients: AWSClientFactory):
+        config = aws_clients.client("dynamodb").meta.config
+
+        assert config.connect_timeout == 1.0
+        assert config.max_pool_connections == 6
+        assert config.read_timeout == 3.0
+        assert config.retries == {"mode": "adaptive", "total_max_attempts": 3}
+        assert config.tcp_keepalive is True
+
+    def test_successfully_configure_resources(self, aws_clients: AWSClientFactory):
+        config = aws_clients.resource("s3").meta.client.meta.config
+
+        assert config.max_pool_connections == 6
+        assert config.retries["mode"] == "adaptive"
+
+    def test_successfully_count_requests(self, aws_clients: AWSClientFactory):
+        client = aws_clients.client("s3")
+
+        client.list_buckets()
+        client.list_buckets()
+
+        assert aws_clients.stats()["s3"] == {
+            "in_flight": 0,
+            "max_in_flight": 1,
+            "pool_size": 6,
+            "requests": 2,
+            "saturated": 0,
+            "utilization": 0.1667,
+        }
+
+    def test_successfully_count_saturated_requests(
+        self, mocker: MockerFixture, settings: Settings
+    ):
+        mocker.patch.object(
+            Settings,
+            "aws_max_pool_connections",
+            new_callable=mocker.PropertyMock,
+            return_value=1,
+        )
+        aws_clients = AWSClientFactory(settings)
+        client = aws_clients.client("s3")
+        nested = []
+
+        def send_concurrent_request(**kwargs):
+            if not nested:
+                nested.append(True)
+                client.list_buckets()
+
+        client.meta.events.register("before-send", send_concurrent_request)
+        client.list_buckets()
+
+        assert aws_clients.stats()["s3"] == {
+            "in_flight": 0,
+            "max_in_flight": 2,
+            "pool_size": 1,
+            "requests": 2,
+            "saturated": 1,
+            "utilization": 2.0,
+        }
+
+    def test_successfully_count_concurrent_requests(
+        self, aws_clients: AWSClientFactory
+    ):
+        client = aws_clients.client("s3")
+
+        with ThreadPoolExecutor(16) as executor:
+            list(executor.map(lambda _: client.list_buckets(), range(64)))
+
+        assert aws_clients.stats()["s3"]["in_flight"] == 0
+        assert aws_clients.stats()["s3"]["requests"] == 64
+
+    def test_successfully_count_failed_requests(self, aws_clients: AWSClientFactory):
+        client = aws_clients.client("s3")
+
+        with pytest.raises(client.exceptions.NoSuchBucket):
+            client.list_objects_v2(Bucket="missing")
+
+        assert aws_clients.stats()["s3"]["in_flight"] == 0
+        assert aws_clients.stats()["s3"]["requests"] == 1
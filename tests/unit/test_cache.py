@@ -0,0 +1,112 @@
+from pytest_mock import MockerFixture
+
+from app.cache import ExpiringSet, TTLCache
+
+
+class TestTTLCache:
+    def test_successfully_get_item(self):
+        cache: TTLCache[str, bool] = TTLCache(2, 60)
+
+        cache.set("key", True)
+
+        assert cache.get("key") is True
+        assert "key" in cache
+
+    def test_fail_to_get_item_due_to_missing_key(self):
+        cache: TTLCache[str, bool] = TTLCache(2, 60)
+
+        assert cache.get("key") is None
+        assert "key" not in cache
+
+    def test_fail_to_get_item_due_to_expiration(self, mocker: MockerFixture):
+        monotonic = mocker.patch("app.cache.time.monotonic", return_value=100.0)
+        cache: TTLCache[str, bool] = TTLCache(2, 60)
+        cache.set("key", True)
+
+        monotonic.return_value = 160.0
+
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_successfully_skip_item_with_non_positive_ttl(self):
+        cache: TTLCache[str, bool] = TTLCache(2, 60)
+        cache.set("key", True)
+
+        cache.set("key", True, ttl=0)
+        cache.set("other", True, ttl=-1)
+
+        assert "key" not in cache
+        assert "other" not in cache
+        assert len(cache) == 0
+
+    def test_successfully_evict_least_recently_used_item(self):
+        cache: TTLCache[str, int] = TTLCache(2, 60)
+        cache.set("first", 1)
+        cache.set("second", 2)
+        cache.get("first")
+
+        cache.set("third", 3)
+
+        assert len(cache) == 2
+        assert cache.get("first") == 1
+        assert cache.get("second") is None
+        assert cache.get("third") == 3
+
+    def test_successfully_clear(self):
+        cache: TTLCache[str, int] = TTLCache(2, 60)
+        cache.set("key", 1)
+
+        cache.clear()
+
+        assert len(cache) == 0
+
+    def test_successfully_count_cache_statistics(self, mocker: MockerFixture):
+        monotonic = mocker.patch("app.cache.time.monotonic", return_value=100.0)
+        cache: TTLCache[str, int] = TTLCache(1, 60)
+        cache.set("first", 1)
+        cache.get("first")
+        cache.set("second", 2)
+        cache.get("first")
+
+        monotonic.return_value = 160.0
+        cache.get("second")
+
+        assert cache.stats() == {
+            "size": 0,
+            "hits": 1,
+            "misses": 2,
+            "evictions": 1,
+            "expirations": 1,
+            "hit_rate": 0.3333,
+        }
+
+
+class TestExpiringSet:
+    def test_successfully_add_item(self):
+        items: ExpiringSet[str] = ExpiringSet(2, 60)
+
+        items.add("127.0.0.1")
+
+        assert "127.0.0.1" in items
+        assert "127.0.0.2" not in items
+
+    def test_successfully_expire_item_with_custom_ttl(self, mocker: MockerFixture):
+        monotonic = mocker.patch("app.cache.time.monotonic", return_value=100.0)
+        items: ExpiringSet[str] = ExpiringSet(2, 60)
+        items.add("127.0.0.1", ttl=1)
+        items.add("127.0.0.2")
+
+        monotonic.return_value = 101.0
+
+        assert "127.0.0.1" not in items
+        assert "127.0.0.2" in items
+
+    def test_successfully_bound_size(self):
+        items: ExpiringSet[str] = ExpiringSet(2, 60)
+
+        for i in range(10):
+            items.add(f"127.0.0.{i}")
+
+        assert len(items) == 2
+        assert items.evictions == 8
+        assert "127.0.0.9" in items
@@ -0,0 +1,86 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+
+from app.api_handler import app
+from app.container import Container, container
+from app.exceptions import InvalidCursorException
+from app.pagination import CursorCodec
+from app.settings import Settings
+
+
+class TestContainer:
+    def test_successfully_create_dependencies_on_first_use(self, settings: Settings):
+        container = Container(settings)
+
+        assert "dynamodb" not in container
+        post_service = container.post_service
+
+        assert "dynamodb" in container
+        assert "s3" not in container
+        assert container.post_service is post_service
+
+    def test_successfully_share_dependencies(self, settings: Settings):
+        container = Container(settings)
+
+        assert container.attachment_service._post_service is container.post_service
+        assert container.post_repository._table.meta.client is (
+            container.rate_limit_repository._table.meta.client
+        )
+        assert container.publisher_service._post_service is container.post_service
+
+    def test_successfully_sign_cursors_with_cursor_secret(self, settings: Settings):
+        container = Container(settings)
+        cursor = container.cursors.encode({"id": "id"})
+
+        assert CursorCodec(
+            lambda: {"default": pytest.cursor_secret_ssm_param_value}
+        ).decode(cursor) == {"id": "id"}
+        with pytest.raises(InvalidCursorException):
+            CursorCodec(lambda: {"default": pytest.jwt_secret_ssm_param_value}).decode(
+                cursor
+            )
+
+    def test_successfully_size_connection_pool_to_worker_threads(
+        self, settings: Settings
+    ):
+        settings.db_scan_workers = 2
+        settings.worker_threads = 8
+        container = Container(settings)
+
+        assert container.dynamodb.meta.client.meta.config.max_pool_connections == 30
+        assert container.s3.meta.client.meta.config.max_pool_connections == 30
+
+    def test_successfully_create_dependencies_once_across_threads(
+        self, mocker: MockerFixture, settings: Settings
+    ):
+        container = Container(settings)
+        resource = mocker.spy(container.aws_clients, "resource")
+
+        with ThreadPoolExecutor(16) as executor:
+            clients = set(executor.map(lambda _: id(container.dynamodb), range(64)))
+
+        assert len(clients) == 1
+        resource.assert_called_once()
+
+    def test_successfully_close(self, mocker: MockerFixture, settings: Settings):
+        container = Container(settings)
+        dynamodb = container.dynamodb
+        close = mocker.spy(dynamodb.meta.client, "close")
+
+        container.close()
+
+        close.assert_called_once()
+        assert "dynamodb" not in container
+        assert container.dynamodb is not dynamodb
+
+    def test_successfully_close_on_shutdown(self, mocker: MockerFixture):
+        close = mocker.patch.object(container, "close")
+
+        with TestClient(app) as test_client:
+            assert test_client.get("/health").status_code == 200
+            close.assert_not_called()
+
+        close.assert_called_once()
@@ -0,0 +1,45 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from app.edge_policy import (FULL, RATE_LIMIT_ONLY, SKIP, build_edge_policies,
+                             get_edge_policy, resolve_edge_policy)
+
+
+class TestEdgePolicy:
+    @pytest.mark.parametrize(
+        "method,path,policy",
+        [
+            ("GET", "/health", SKIP),
+            ("GET", "/metrics", SKIP),
+            ("GET", "/metrics/aws", SKIP),
+            ("GET", "/docs", RATE_LIMIT_ONLY),
+            ("GET", "/openapi.json", RATE_LIMIT_ONLY),
+            ("OPTIONS", "/api/v1/posts", RATE_LIMIT_ONLY),
+            ("GET", "/api/v1/posts", RATE_LIMIT_ONLY),
+            ("GET", "/api/v1/posts/archive", RATE_LIMIT_ONLY),
+            ("POST", "/api/v1/posts", FULL),
+            ("PUT", "/api/v1/posts/uuid", FULL),
+            ("DELETE", "/api/v1/posts/uuid", FULL),
+            ("POST", "/api/v1/posts/uuid/attachments", FULL),
+            ("POST", "/docs", FULL),
+            ("GET", "/unknown", FULL),
+        ],
+    )
+    def test_successfully_resolve_edge_policy(self, method: str, path: str, policy):
+        assert resolve_edge_policy(method, path) == policy
+
+    def test_successfully_validate_client_on_reads(self, mocker: MockerFixture):
+        mocker.patch("app.edge_policy.EDGE_POLICIES", build_edge_policies(True))
+
+        assert resolve_edge_policy("GET", "/api/v1/posts") == FULL
+        assert resolve_edge_policy("OPTIONS", "/api/v1/posts") == RATE_LIMIT_ONLY
+
+    def test_successfully_get_edge_policy_once_per_request(self):
+        scope = {"type": "http", "method": "GET", "path": "/health"}
+
+        assert get_edge_policy(scope) == SKIP
+        assert scope["edge_policy"] == SKIP
+
+        scope["path"] = "/api/v1/posts"
+
+        assert get_edge_policy(scope) == SKIP
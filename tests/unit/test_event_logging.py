@@ -0,0 +1,72 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from app.event_logging import REDACTED, log_sampled_event, redact_event
+
+EVENT = {
+    "rawPath": "/api/v1/posts/uuid/attachments",
+    "headers": {"authorization": "Bearer token", "content-type": "image/png"},
+    "cookies": ["session=secret"],
+    "body": "a" * 4096,
+}
+
+
+class TestEventLogging:
+    @pytest.fixture
+    def logger(self, mocker: MockerFixture):
+        return mocker.patch("app.event_logging.logger")
+
+    def test_successfully_redact_and_truncate_event(self):
+        event = redact_event(EVENT, 16)
+
+        assert event["headers"]["authorization"] == REDACTED
+        assert event["headers"]["content-type"] == "image/png"
+        assert event["cookies"] == REDACTED
+        assert event["body"] == f"{'a' * 16}...[truncated 4096 bytes]"
+        assert EVENT["body"] == "a" * 4096
+
+    def test_successfully_log_sampled_event_truncated(
+        self, logger, mocker: MockerFixture
+    ):
+        mocker.patch("app.event_logging.random.random", return_value=0.0)
+        handler = log_sampled_event(lambda event, context: {"statusCode": 200})
+
+        assert handler(EVENT, None) == {"statusCode": 200}
+
+        logger.info.assert_called_once()
+        assert len(logger.info.call_args.kwargs["event"]["body"]) < 4096
+
+    def test_successfully_skip_unsampled_event(self, logger, mocker: MockerFixture):
+        mocker.patch("app.event_logging.random.random", return_value=1.0)
+        handler = log_sampled_event(lambda event, context: {"statusCode": 200})
+
+        handler(EVENT, None)
+
+        logger.info.assert_not_called()
+
+    def test_successfully_log_failed_event_in_full(self, logger, mocker: MockerFixture):
+        mocker.patch("app.event_logging.random.random", return_value=1.0)
+        handler = log_sampled_event(lambda event, context: {"statusCode": 500})
+
+        handler(EVENT, None)
+
+        assert logger.info.call_args.kwargs["event"]["body"] == EVENT["body"]
+        assert logger.info.call_args.kwargs["status_code"] == 500
+
+    def test_successfully_log_slow_event_in_full(self, logger, mocker: MockerFixture):
+        mocker.patch("app.event_logging.random.random", return_value=1.0)
+        mocker.patch("app.event_logging.settings.event_log_slow_threshold_in_ms", 0)
+        handler = log_sampled_event(lambda event, context: {"statusCode": 200})
+
+        handler(EVENT, None)
+
+        assert logger.info.call_args.kwargs["event"]["body"] == EVENT["body"]
+
+    def test_successfully_log_event_on_exception(self, logger):
+        def handler(event: dict, context: object) -> dict:
+            raise ValueError()
+
+        with pytest.raises(ValueError):
+            log_sampled_event(handler)(EVENT, None)
+
+        assert logger.info.call_args.kwargs["status_code"] is None
@@ -0,0 +1,65 @@
+import pytest
+
+from app.geoip import IPRangeDatabase, load_country_database, read_ranges
+
+
+class TestIPRangeDatabase:
+    @pytest.fixture
+    def database_path(self, tmp_path) -> str:
+        ranges_path = tmp_path / "ranges.csv"
+        ranges_path.write_text(
+            "# start,end,country\n"
+            "5.255.255.0,5.255.255.255,RU\n"
+            "1.0.0.0,1.0.0.255,au\n"
+            "2001:db8::/32,CN\n"
+        )
+        database_path = tmp_path / "ranges.bin"
+        database_path.write_bytes(IPRangeDatabase.build(read_ranges(str(ranges_path))))
+        return str(database_path)
+
+    @pytest.mark.parametrize(
+        "ip,country_code",
+        [
+            ("1.0.0.0", "AU"),
+            ("1.0.0.128", "AU"),
+            ("1.0.0.255", "AU"),
+            ("5.255.255.8", "RU"),
+            ("::ffff:5.255.255.8", "RU"),
+            ("2001:db8::1", "CN"),
+            ("2001:db8:ffff:ffff:ffff:ffff:ffff:ffff", "CN"),
+        ],
+    )
+    def test_successfully_lookup(self, database_path: str, ip: str, country_code: str):
+        database = IPRangeDatabase.from_file(database_path)
+
+        assert database.lookup(ip) == country_code
+
+    @pytest.mark.parametrize(
+        "ip", ["0.0.0.0", "1.0.1.0", "255.255.255.255", "2001:db9::", "::1", "ip"]
+    )
+    def test_fail_to_lookup_due_to_unknown_address(self, database_path: str, ip: str):
+        database = IPRangeDatabase.from_file(database_path)
+
+        assert database.lookup(ip) is None
+
+    def test_fail_to_build_due_to_invalid_range(self):
+        with pytest.raises(ValueError):
+            IPRangeDatabase.build([("1.0.0.255", "1.0.0.0", "AU")])
+
+    def test_fail_to_build_due_to_invalid_country_code(self):
+        with pytest.raises(ValueError):
+            IPRangeDatabase.build([("1.0.0.0", "1.0.0.255", "AUS")])
+
+    def test_successfully_load_country_database(self, database_path: str):
+        database = load_country_database(database_path)
+
+        assert len(database) == 3
+
+    def test_fail_to_load_country_database_due_to_invalid_file(self, tmp_path):
+        database_path = tmp_path / "invalid.bin"
+        database_path.write_bytes(b"invalid database file")
+
+        assert load_country_database(str(database_path)) is None
+
+    def test_fail_to_load_country_database_due_to_missing_file(self, tmp_path):
+        assert load_country_database(str(tmp_path / "missing.bin")) is None
@@ -0,0 +1,170 @@
+import threading
+import time
+
+import pytest
+
+from app.exceptions import DatabaseTimeoutException
+from app.hedging import HedgedCaller, RollingLatency
+from app.settings import Settings
+
+OPERATION = "get_post_by_uuid"
+
+
+@pytest.fixture
+def hedged_caller(settings: Settings) -> HedgedCaller:
+    settings.db_latency_min_samples = 100
+    caller = HedgedCaller(settings)
+    for duration in [20.0] * 98 + [1000.0] * 2:
+        caller.latency(OPERATION).observe(duration)
+    yield caller
+    caller.close()
+
+
+class SlowFirstAttempt:
+    def __init__(self, delay: float):
+        self._delay = delay
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def __call__(self) -> int:
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if call == 1:
+            time.sleep(self._delay)
+        return call
+
+
+class TestRollingLatency:
+    def test_successfully_calculate_percentiles(self):
+        latency = RollingLatency(100)
+        for duration in range(1, 101):
+            latency.observe(float(duration))
+
+        assert latency.percentile(50) == 50.0
+        assert latency.percentile(95) == 95.0
+        assert latency.percentile(99) == 99.0
+        assert latency.percentile(100) == 100.0
+
+    def test_successfully_forget_samples_outside_window(self):
+        latency = RollingLatency(10)
+        for _ in range(10):
+            latency.observe(1000.0)
+        for _ in range(10):
+            latency.observe(1.0)
+
+        assert latency.count == 20
+        assert latency.percentile(99) == 1.0
+
+    def test_successfully_calculate_percentile_without_samples(self):
+        assert RollingLatency(10).percentile(99) == 0.0
+
+
+class TestHedgedCaller:
+    def test_successfully_derive_timeout_from_p99(self, hedged_caller: HedgedCaller):
+        assert hedged_caller.timeout(OPERATION) == 3000.0
+        assert hedged_caller.hedge_delay(OPERATION) == 20.0
+
+    def test_successfully_clamp_timeout(self, settings: Settings):
+        settings.db_latency_min_samples = 1
+        hedged_caller = HedgedCaller(settings)
+        hedged_caller.latency("fast").observe(0.1)
+        hedged_caller.latency("p99").observe(500.0)
+        hedged_caller.latency("slow").observe(60_000.0)
+
+        assert hedged_caller.timeout("fast") == settings.db_min_timeout_in_ms
+        assert hedged_caller.timeout("p99") == 1500.0
+        assert hedged_caller.timeout("slow") == (
+            settings.aws_read_timeout_in_seconds * 1000
+        )
+
+    def test_successfully_call_inline_until_warmed_up(self, settings: Settings):
+        hedged_caller = HedgedCaller(settings)
+
+        assert hedged_caller.read(OPERATION, threading.get_ident, hedge=True) == (
+            threading.get_ident()
+        )
+        assert hedged_caller.timeout(OPERATION) is None
+        assert hedged_caller.latency(OPERATION).count == 1
+
+    def test_successfully_hedge_slow_read(self, hedged_caller: HedgedCaller):
+        fn = SlowFirstAttempt(0.5)
+
+        assert hedged_caller.read(OPERATION, fn, hedge=True) == 2
+        assert fn.calls == 2
+        assert hedged_caller.hedges == 1
+        assert hedged_caller.hedge_wins == 1
+
+    def test_successfully_skip_hedge_for_fast_read(self, hedged_caller: HedgedCaller):
+        fn = SlowFirstAttempt(0.0)
+
+        assert hedged_caller.read(OPERATION, fn, hedge=True) == 1
+        assert fn.calls == 1
+        assert hedged_caller.hedges == 0
+
+    def test_successfully_skip_hedge_when_disabled(self, settings: Settings):
+        settings.db_hedging = False
+        settings.db_latency_min_samples = 1
+        hedged_caller = HedgedCaller(settings)
+        hedged_caller.latency(OPERATION).observe(20.0)
+        fn = SlowFirstAttempt(0.03)
+
+        assert hedged_caller.read(OPERATION, fn, hedge=True) == 1
+        assert hedged_caller.hedges == 0
+
+    def test_successfully_record_abandoned_attempts(self, hedged_caller: HedgedCaller):
+        hedged_caller.read(OPERATION, SlowFirstAttempt(0.2), hedge=True)
+        time.sleep(0.5)
+
+        assert hedged_caller.latency(OPERATION).count == 102
+
+    def test_successfully_exclude_queue_time_from_timeout(self, settings: Settings):
+        settings.db_hedging = False
+        settings.db_latency_min_samples = 1
+        settings.db_min_timeout_in_ms = 0.0
+        hedged_caller = HedgedCaller(settings)
+        hedged_caller._workers = 1
+        hedged_caller.latency(OPERATION).observe(30.0)
+        hedged_caller._submit(threading.Event(), "blocker", time.sleep, 0.3)
+
+        assert hedged_caller.read(OPERATION, lambda: 1) == 1
+        assert hedged_caller.timeouts == 0
+        hedged_caller.close()
+
+    def test_successfully_size_executor_for_hedges_and_scans(self, settings: Settings):
+        settings.db_scan_workers = 2
+        settings.worker_threads = 3
+
+        assert HedgedCaller(settings)._workers == 10
+        assert settings.aws_max_pool_connections == 15
+
+    def test_fail_to_read_due_to_timeout(self, settings: Settings):
+        settings.db_latency_min_samples = 1
+        settings.db_min_timeout_in_ms = 0.0
+        hedged_caller = HedgedCaller(settings)
+        hedged_caller.latency(OPERATION).observe(10.0)
+
+        with pytest.raises(DatabaseTimeoutException) as excinfo:
+            hedged_caller.read(OPERATION, time.sleep, 0.5, hedge=True)
+
+        assert excinfo.value.status_code == 504
+        assert hedged_caller.hedges == 1
+        assert hedged_caller.timeouts == 1
+
+    def test_fail_to_read_due_to_error(self, hedged_caller: HedgedCaller):
+        def fail():
+            raise ValueError("error")
+
+        with pytest.raises(ValueError):
+            hedged_caller.read(OPERATION, fail, hedge=True)
+
+        assert hedged_caller.timeouts == 0
+
+    def test_successfully_report_stats(self, hedged_caller: HedgedCaller):
+        assert hedged_caller.stats()["operations"][OPERATION] == {
+            "count": 100,
+            "p50": 20.0,
+            "p95": 20.0,
+            "p99": 1000.0,
+            "timeout_in_ms": 3000.0,
+        }
@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+from typing import NamedTuple
+
+import pytest
+
+LAZY_MODULES = [
+    "asyncssh",
+    "httpx",
+    "markdown",
+    "mypy_boto3_s3",
+    "slugify",
+    "sshfs",
+    "unidecode",
+    "uvicorn",
+]
+
+
+HANDLER_MODULE = "app.api_handler"
+NUMBER_OF_RUNS = 3
+
+
+class ImportProfile(NamedTuple):
+    modules: dict[str, int]
+
+    @property
+    def cumulative_time_in_ms(self) -> float:
+        return self.modules[HANDLER_MODULE] / 1000
+
+    def slowest(self, count: int = 10) -> list[tuple[str, int]]:
+        return sorted(self.modules.items(), key=lambda item: -item[1])[:count]
+
+
+def profile_import() -> ImportProfile:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {HANDLER_MODULE}"],
+        capture_output=True,
+        check=True,
+        env={
+            name: value
+            for name, value in os.environ.items()
+            if not name.startswith("COV_CORE_")
+        },
+        text=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        modules[module.strip()] = int(cumulative)
+    return ImportProfile(modules=modules)
+
+
+@pytest.fixture(scope="module")
+def import_profile() -> ImportProfile:
+    return min(
+        (profile_import() for _ in range(NUMBER_OF_RUNS)),
+        key=lambda profile: profile.cumulative_time_in_ms,
+    )
+
+
+class TestImportTime:
+    def test_successfully_import_handler_within_budget(
+        self, import_profile: ImportProfile
+    ):
+        budget = float(os.environ.get("IMPORT_TIME_BUDGET_IN_MS", 2000))
+
+        assert import_profile.cumulative_time_in_ms <= budget, import_profile.slowest()
+
+    @pytest.mark.parametrize("module", LAZY_MODULES)
+    def test_successfully_defer_heavy_module(
+        self, import_profile: ImportProfile, module: str
+    ):
+        assert module not in import_profile.modules
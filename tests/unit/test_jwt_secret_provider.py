@@ -0,0 +1,145 @@
+import json
+import threading
+
+import boto3
+import pytest
+from aws_lambda_powertools.utilities import parameters
+from aws_lambda_powertools.utilities.parameters.exceptions import \
+    GetParameterError
+from pytest_mock import MockerFixture
+
+from app.jwt_secret_provider import (DEFAULT_KEY_ID, JWTSecretProvider,
+                                     parse_keys)
+from app.settings import Settings
+
+
+@pytest.fixture(autouse=True)
+def clear_parameter_caches():
+    yield
+    parameters.clear_caches()
+
+
+@pytest.fixture
+def provider(settings: Settings) -> JWTSecretProvider:
+    return JWTSecretProvider(settings)
+
+
+def put_secret(value: str):
+    boto3.client("ssm").put_parameter(
+        Name=pytest.jwt_secret_ssm_param_name,
+        Value=value,
+        Type="SecureString",
+        Overwrite=True,
+    )
+
+
+class TestJWTSecretProvider:
+    @pytest.mark.parametrize(
+        "value,keys",
+        [
+            ("secret", {DEFAULT_KEY_ID: "secret"}),
+            ('{"v1": "old", "v2": "new"}', {"v1": "old", "v2": "new"}),
+            ("[]", {DEFAULT_KEY_ID: "[]"}),
+        ],
+    )
+    def test_successfully_parse_keys(self, value: str, keys: dict[str, str]):
+        assert parse_keys(value) == keys
+
+    def test_successfully_cache_keys_until_expiry(
+        self, provider: JWTSecretProvider, mocker: MockerFixture
+    ):
+        monotonic = mocker.patch(
+            "app.jwt_secret_provider.time.monotonic", return_value=0.0
+        )
+        get_parameters = mocker.spy(parameters, "get_parameters_by_name")
+
+        assert provider.get_secrets(None) == [pytest.jwt_secret_ssm_param_value]
+        assert provider.get_secrets(None) == [pytest.jwt_secret_ssm_param_value]
+        assert get_parameters.call_count == 1
+
+        put_secret("rotated")
+        monotonic.return_value = 301.0
+
+        assert provider.get_secrets(None) == ["rotated"]
+        assert get_parameters.call_count == 2
+
+    def test_successfully_refresh_keys_in_background(
+        self, provider: JWTSecretProvider, mocker: MockerFixture
+    ):
+        monotonic = mocker.patch(
+            "app.jwt_secret_provider.time.monotonic", return_value=0.0
+        )
+        thread = mocker.patch("app.jwt_secret_provider.threading.Thread")
+        provider.get_keys()
+        monotonic.return_value = 250.0
+
+        assert provider.get_secrets(None) == [pytest.jwt_secret_ssm_param_value]
+        assert provider.get_secrets(None) == [pytest.jwt_secret_ssm_param_value]
+        thread.assert_called_once_with(target=provider.refresh, daemon=True)
+        thread.return_value.start.assert_called_once()
+
+    def test_successfully_start_one_background_refresh_across_threads(
+        self, provider: JWTSecretProvider, mocker: MockerFixture
+    ):
+        monotonic = mocker.patch(
+            "app.jwt_secret_provider.time.monotonic", return_value=0.0
+        )
+        provider.get_keys()
+        monotonic.return_value = 250.0
+        barrier = threading.Barrier(8)
+
+        def get_keys():
+            barrier.wait()
+            provider.get_keys()
+
+        threads = [threading.Thread(target=get_keys) for _ in range(8)]
+        thread = mocker.patch("app.jwt_secret_provider.threading.Thread")
+        for worker in threads:
+            worker.start()
+        for worker in threads:
+            worker.join(5)
+
+        thread.assert_called_once_with(target=provider.refresh, daemon=True)
+
+    def test_successfully_select_key_by_kid(self, provider: JWTSecretProvider):
+        put_secret(json.dumps({"v1": "old", "v2": "new"}))
+
+        assert provider.get_secrets("v1") == ["old"]
+        assert provider.get_secrets("v2") == ["new"]
+        assert provider.get_secrets(None) == ["old", "new"]
+
+    def test_successfully_refresh_keys_on_unknown_kid(
+        self, provider: JWTSecretProvider, mocker: MockerFixture
+    ):
+        monotonic = mocker.patch(
+            "app.jwt_secret_provider.time.monotonic", return_value=0.0
+        )
+        put_secret(json.dumps({"v1": "old"}))
+        assert provider.get_secrets("v2") == []
+
+        put_secret(json.dumps({"v1": "old", "v2": "new"}))
+        assert provider.get_secrets("v2") == []
+
+        monotonic.return_value = (
+            JWTSecretProvider.MIN_FORCED_REFRESH_INTERVAL_IN_SECONDS
+        )
+        assert provider.get_secrets("v2") == ["new"]
+
+    def test_successfully_keep_cached_keys_on_refresh_failure(
+        self, provider: JWTSecretProvider, mocker: MockerFixture
+    ):
+        provider.get_keys()
+        mocker.patch(
+            "app.settings.parameters.get_parameters_by_name",
+            side_effect=GetParameterError(),
+        )
+
+        assert provider.refresh() == {DEFAULT_KEY_ID: pytest.jwt_secret_ssm_param_value}
+
+    def test_fail_to_get_keys_due_to_missing_parameter(self, settings: Settings):
+        provider = JWTSecretProvider(
+            settings.model_copy(update={"jwt_secret_ssm_param_name": "/missing"})
+        )
+
+        with pytest.raises(GetParameterError):
+            provider.get_keys()
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.metrics import (MAX_EMF_VALUES, LatencyHistogram, LatencyMetrics,
+                         log_latency_metrics)
+
+
+class TestLatencyHistogram:
+    def test_successfully_estimate_percentiles(self):
+        histogram = LatencyHistogram()
+        for duration in range(1, 101):
+            histogram.observe(float(duration))
+
+        assert histogram.count == 100
+        assert histogram.max == 100.0
+        assert 25.0 <= histogram.percentile(50) <= 75.0
+        assert 75.0 <= histogram.percentile(95) <= 100.0
+        assert 75.0 <= histogram.percentile(99) <= 100.0
+
+    def test_successfully_cap_overflow_bucket_at_max(self):
+        histogram = LatencyHistogram()
+        histogram.observe(60_000.0)
+
+        assert histogram.counts[-1] == 1
+        assert 30_000.0 < histogram.percentile(99) <= 60_000.0
+
+    def test_successfully_summarize_empty_histogram(self):
+        summary = LatencyHistogram().summary()
+
+        assert summary["count"] == 0
+        assert summary["p99"] == 0.0
+
+
+class TestLatencyMetrics:
+    @pytest.fixture
+    def latency_metrics(self) -> LatencyMetrics:
+        return LatencyMetrics()
+
+    def test_successfully_group_by_route_and_status_class(
+        self, latency_metrics: LatencyMetrics
+    ):
+        latency_metrics.observe("GET /api/v1/posts", 200, 10.0)
+        latency_metrics.observe("GET /api/v1/posts", 204, 20.0)
+        latency_metrics.observe("GET /api/v1/posts", 404, 5.0)
+        latency_metrics.observe("GET /api/v1/posts/{uuid}", 200, 30.0)
+
+        snapshot = latency_metrics.snapshot()
+
+        assert len(latency_metrics) == 3
+        assert snapshot["GET /api/v1/posts"]["2xx"]["count"] == 2
+        assert snapshot["GET /api/v1/posts"]["4xx"]["count"] == 1
+        assert snapshot["GET /api/v1/posts/{uuid}"]["2xx"]["count"] == 1
+
+    def test_successfully_flush_embedded_metrics(
+        self, latency_metrics: LatencyMetrics, capsys: pytest.CaptureFixture
+    ):
+        for _ in range(MAX_EMF_VALUES + 1):
+            latency_metrics.observe("GET /api/v1/posts", 200, 10.0)
+
+        latency_metrics.flush()
+        latency_metrics.flush()
+
+        emfs = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert {(emf["route"], emf["status_class"]) for emf in emfs} == {
+            ("GET /api/v1/posts", "2xx")
+        }
+        assert [emf["Requests"] for emf in emfs if "Requests" in emf] == [
+            [MAX_EMF_VALUES + 1]
+        ]
+        assert sum(len(emf.get("Latency", [])) for emf in emfs) == MAX_EMF_VALUES
+        assert latency_metrics.snapshot()["GET /api/v1/posts"]["2xx"]["count"] == (
+            MAX_EMF_VALUES + 1
+        )
+
+    def test_successfully_flush_after_invocation(self, mocker: MockerFixture):
+        flush = mocker.patch("app.metrics.latency_metrics.flush")
+
+        @log_latency_metrics
+        def handler(event: dict, context: object) -> dict:
+            raise ValueError()
+
+        with pytest.raises(ValueError):
+            handler({}, None)
+
+        flush.assert_called_once()
@@ -0,0 +1,261 @@
+import asyncio
+import threading
+import uuid
+
+import pytest
+from fastapi import status
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+from httpx import ConnectTimeout, Response
+from pytest_mock import MockerFixture
+from respx import MockRouter
+
+from app.geoip import IPRangeDatabase
+from app.middlewares import (COUNTRY_IS_API_BASE_URL, X_CORRELATION_ID,
+                             ClientValidationMiddleware,
+                             CorrelationIdMiddleware, LatencyMetricsMiddleware,
+                             RateLimitingMiddleware, banned_hosts,
+                             host_verdicts, latency_metrics, pending_lookups,
+                             rate_limiter)
+
+CLIENT_IP = "8.8.8.8"
+
+
+class TestClientValidationMiddleware:
+    @pytest.fixture
+    def middleware(self) -> ClientValidationMiddleware:
+        return ClientValidationMiddleware(PlainTextResponse("OK"))
+
+    @pytest.fixture(autouse=True)
+    def setup_function(self):
+        banned_hosts.clear()
+        host_verdicts.clear()
+        pending_lookups.clear()
+
+    def test_successfully_cache_allowed_verdict(
+        self, middleware: ClientValidationMiddleware, respx_mock: MockRouter
+    ):
+        route_mock = respx_mock.get(f"{COUNTRY_IS_API_BASE_URL}/{CLIENT_IP}").mock(
+            Response(status_code=status.HTTP_200_OK, json={"country": "US"})
+        )
+
+        async def validate() -> list[bool]:
+            return [await middleware._is_restricted(CLIENT_IP) for _ in range(3)]
+
+        assert asyncio.run(validate()) == [False, False, False]
+        assert route_mock.call_count == 1
+        assert host_verdicts.get(CLIENT_IP) is False
+
+    def test_successfully_cache_restricted_verdict(
+        self, middleware: ClientValidationMiddleware, respx_mock: MockRouter
+    ):
+        route_mock = respx_mock.get(f"{COUNTRY_IS_API_BASE_URL}/{CLIENT_IP}").mock(
+            Response(status_code=status.HTTP_200_OK, json={"country": "RU"})
+        )
+
+        async def validate() -> list[bool]:
+            return [await middleware._is_restricted(CLIENT_IP) for _ in range(3)]
+
+        assert asyncio.run(validate()) == [True, True, True]
+        assert route_mock.call_count == 1
+        assert host_verdicts.get(CLIENT_IP) is True
+
+    def test_successfully_skip_caching_on_lookup_failure(
+        self, middleware: ClientValidationMiddleware, respx_mock: MockRouter
+    ):
+        route_mock = respx_mock.get(f"{COUNTRY_IS_API_BASE_URL}/{CLIENT_IP}").mock(
+            side_effect=ConnectTimeout("timeout")
+        )
+
+        async def validate() -> list[bool]:
+            return [await middleware._is_restricted(CLIENT_IP) for _ in range(2)]
+
+        assert asyncio.run(validate()) == [False, False]
+        assert route_mock.call_count == 2
+        assert CLIENT_IP not in host_verdicts
+
+    def test_successfully_coalesce_concurrent_lookups(
+        self, middleware: ClientValidationMiddleware, mocker: MockerFixture
+    ):
+        async def validate_host(client_ip: str) -> bool:
+            await asyncio.sleep(0.01)
+            return False
+
+        validate_host_mock = mocker.patch.object(
+            middleware, "_validate_host", side_effect=validate_host
+        )
+
+        async def validate() -> list[bool]:
+            return await asyncio.gather(
+                *(middleware._is_restricted(CLIENT_IP) for _ in range(10))
+            )
+
+        assert asyncio.run(validate()) == [False] * 10
+        validate_host_mock.assert_called_once_with(CLIENT_IP)
+        assert not pending_lookups
+
+    def test_successfully_resolve_country_from_local_database(
+        self,
+        middleware: ClientValidationMiddleware,
+        mocker: MockerFixture,
+        respx_mock: MockRouter,
+    ):
+        database = IPRangeDatabase(
+            memoryview(IPRangeDatabase.build([(CLIENT_IP, CLIENT_IP, "RU")]))
+        )
+        mocker.patch("app.middlewares.country_database", database)
+        route_mock = respx_mock.get(url__startswith=COUNTRY_IS_API_BASE_URL)
+
+        assert asyncio.run(middleware._is_restricted(CLIENT_IP)) is True
+        assert not route_mock.called
+        assert host_verdicts.get(CLIENT_IP) is True
+
+    def test_successfully_fall_back_to_http_lookup(
+        self,
+        middleware: ClientValidationMiddleware,
+        mocker: MockerFixture,
+        respx_mock: MockRouter,
+    ):
+        database = IPRangeDatabase(
+            memoryview(IPRangeDatabase.build([("1.0.0.0", "1.0.0.255", "AU")]))
+        )
+        mocker.patch("app.middlewares.country_database", database)
+        route_mock = respx_mock.get(f"{COUNTRY_IS_API_BASE_URL}/{CLIENT_IP}").mock(
+            Response(status_code=status.HTTP_200_OK, json={"country": "US"})
+        )
+
+        assert asyncio.run(middleware._is_restricted(CLIENT_IP)) is False
+        assert route_mock.call_count == 1
+
+    def test_successfully_reject_banned_host_without_lookup(
+        self, middleware: ClientValidationMiddleware, mocker: MockerFixture
+    ):
+        banned_hosts.add(CLIENT_IP)
+        is_restricted_mock = mocker.patch.object(middleware, "_is_restricted")
+
+        response = TestClient(middleware, client=(CLIENT_IP, 50000)).get("/")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json() == {"message": "Forbidden"}
+        is_restricted_mock.assert_not_called()
+
+    def test_successfully_ban_restricted_host(
+        self, middleware: ClientValidationMiddleware, mocker: MockerFixture
+    ):
+        mocker.patch.object(middleware, "_is_restricted", return_value=True)
+
+        response = TestClient(middleware, client=(CLIENT_IP, 50000)).get("/")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert CLIENT_IP in banned_hosts
+
+    def test_successfully_skip_whitelisted_host(
+        self, middleware: ClientValidationMiddleware, mocker: MockerFixture
+    ):
+        is_restricted_mock = mocker.patch.object(middleware, "_is_restricted")
+
+        response = TestClient(middleware, client=("127.0.0.1", 50000)).get("/")
+
+        assert response.status_code == status.HTTP_200_OK
+        is_restricted_mock.assert_not_called()
+
+    def test_successfully_skip_route_without_client_validation(
+        self, middleware: ClientValidationMiddleware, mocker: MockerFixture
+    ):
+        banned_hosts.add(CLIENT_IP)
+        is_restricted_mock = mocker.patch.object(middleware, "_is_restricted")
+
+        response = TestClient(middleware, client=(CLIENT_IP, 50000)).get("/health")
+
+        assert response.status_code == status.HTTP_200_OK
+        is_restricted_mock.assert_not_called()
+
+
+class TestCorrelationIdMiddleware:
+    @pytest.fixture
+    def test_client(self) -> TestClient:
+        return TestClient(CorrelationIdMiddleware(PlainTextResponse("OK")))
+
+    def test_successfully_generate_correlation_id(self, test_client: TestClient):
+        response = test_client.get("/")
+
+        assert uuid.UUID(response.headers[X_CORRELATION_ID])
+
+    def test_successfully_propagate_correlation_id(self, test_client: TestClient):
+        correlation_id = str(uuid.uuid4())
+
+        response = test_client.get("/", headers={X_CORRELATION_ID: correlation_id})
+
+        assert response.headers[X_CORRELATION_ID] == correlation_id
+
+
+class TestLatencyMetricsMiddleware:
+    @pytest.fixture(autouse=True)
+    def setup_function(self):
+        latency_metrics.clear()
+
+    def test_successfully_record_unmatched_route(self):
+        test_client = TestClient(
+            LatencyMetricsMiddleware(PlainTextResponse("OK", status_code=404))
+        )
+
+        test_client.get("/unknown")
+
+        snapshot = latency_metrics.snapshot()
+        assert snapshot["GET UNMATCHED"]["4xx"]["count"] == 1
+
+
+class TestRateLimitingMiddleware:
+    @pytest.fixture
+    def test_client(self) -> TestClient:
+        return TestClient(
+            RateLimitingMiddleware(PlainTextResponse("OK")), client=(CLIENT_IP, 50000)
+        )
+
+    @pytest.fixture(autouse=True)
+    def setup_function(self):
+        rate_limiter.clear()
+
+    def test_successfully_add_rate_limit_headers(self, test_client: TestClient):
+        response = test_client.get("/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["X-RateLimit-Limit"] == "60"
+        assert response.headers["X-RateLimit-Remaining"] == "59"
+        assert "Retry-After" not in response.headers
+
+    def test_fail_to_get_due_to_rate_limit(self, test_client: TestClient):
+        responses = [test_client.get("/") for _ in range(61)]
+
+        assert all(
+            response.status_code == status.HTTP_200_OK for response in responses[:-1]
+        )
+        assert responses[-1].status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert responses[-1].headers["X-RateLimit-Remaining"] == "0"
+        assert responses[-1].headers["Retry-After"] == "1"
+
+    def test_successfully_skip_route_without_rate_limiting(
+        self, test_client: TestClient
+    ):
+        responses = [test_client.get("/health") for _ in range(61)]
+
+        assert all(response.status_code == status.HTTP_200_OK for response in responses)
+        assert "X-RateLimit-Limit" not in responses[-1].headers
+
+    def test_successfully_acquire_blocking_rate_limit_off_event_loop(
+        self, mocker: MockerFixture, test_client: TestClient
+    ):
+        threads = []
+        acquire = rate_limiter.acquire
+
+        def record_thread(key: str):
+            threads.append(threading.current_thread())
+            return acquire(key)
+
+        mocker.patch("app.middlewares.rate_limiter.blocking", True)
+        mocker.patch("app.middlewares.rate_limiter.acquire", side_effect=record_thread)
+
+        response = test_client.get("/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert threads[0].name.startswith("AnyIO worker thread")
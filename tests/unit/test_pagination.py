@@ -0,0 +1,80 @@
+import pytest
+from aws_lambda_powertools.utilities.parameters.exceptions import \
+    GetParameterError
+from fastapi import status
+
+from app.exceptions import InvalidCursorException, SecretUnavailableException
+from app.pagination import CursorCodec, b64encode
+
+KEY = {
+    "id": "3c4d2a9e-7a52-4f4e-8d0c-0e6d7d8c4b1a",
+    "published_key": "published",
+    "published_sort_key": "2024-05-01T10:00:00+00:00",
+}
+
+
+class TestCursorCodec:
+    def test_successfully_encode_and_decode_cursor(self):
+        cursor_codec = CursorCodec(lambda: {"default": "secret"})
+
+        cursor = cursor_codec.encode(KEY)
+
+        assert "=" not in cursor
+        assert cursor_codec.decode(cursor) == KEY
+
+    def test_successfully_decode_cursor_signed_with_previous_key(self):
+        cursor = CursorCodec(lambda: {"old": "old-secret"}).encode(KEY)
+        cursor_codec = CursorCodec(lambda: {"new": "new-secret", "old": "old-secret"})
+
+        assert cursor_codec.decode(cursor) == KEY
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "",
+            "invalid",
+            "a.b.c",
+            "!!!.???",
+            f"{b64encode(b'{}')}.{b64encode(b'signature')}",
+        ],
+    )
+    def test_fail_to_decode_cursor_due_to_malformed_cursor(self, cursor: str):
+        with pytest.raises(InvalidCursorException) as excinfo:
+            CursorCodec(lambda: {"default": "secret"}).decode(cursor)
+
+        assert excinfo.value.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_fail_to_decode_cursor_due_to_tampered_key(self):
+        cursor_codec = CursorCodec(lambda: {"default": "secret"})
+        _, signature = cursor_codec.encode(KEY).split(".")
+        payload = b64encode(b'{"id":"another"}')
+
+        with pytest.raises(InvalidCursorException):
+            cursor_codec.decode(f"{payload}.{signature}")
+
+    def test_fail_to_decode_cursor_due_to_unknown_secret(self):
+        cursor = CursorCodec(lambda: {"default": "secret"}).encode(KEY)
+
+        with pytest.raises(InvalidCursorException):
+            CursorCodec(lambda: {"default": "rotated"}).decode(cursor)
+
+    def test_fail_to_decode_cursor_due_to_invalid_key(self):
+        cursor_codec = CursorCodec(lambda: {"default": "secret"})
+
+        with pytest.raises(InvalidCursorException):
+            cursor_codec.decode(cursor_codec.encode([]))
+
+    def test_fail_to_encode_cursor_due_to_unavailable_secret(self):
+        def keys() -> dict[str, str]:
+            raise GetParameterError("unavailable")
+
+        with pytest.raises(SecretUnavailableException) as excinfo:
+            CursorCodec(keys).encode(KEY)
+
+        assert excinfo.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    def test_fail_to_decode_cursor_due_to_unconfigured_secret(self):
+        cursor = CursorCodec(lambda: {"default": "secret"}).encode(KEY)
+
+        with pytest.raises(SecretUnavailableException):
+            CursorCodec(lambda: {}).decode(cursor)
@@ -0,0 +1,248 @@
+import threading
+import time
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.rate_limiter import (DistributedRateLimiter, RateLimiter,
+                              create_rate_limiter)
+from app.repositories.rate_limit_repository import RateLimitRepository
+from app.settings import Settings
+
+LIMIT = 5
+PERIOD = 10.0
+
+
+class TestRateLimiter:
+    @pytest.fixture
+    def monotonic(self, mocker: MockerFixture):
+        return mocker.patch("app.rate_limiter.time.monotonic", return_value=100.0)
+
+    @pytest.fixture
+    def rate_limiter(self, monotonic) -> RateLimiter:
+        return RateLimiter(LIMIT, PERIOD, 100)
+
+    def test_successfully_acquire_until_limit(self, rate_limiter: RateLimiter):
+        results = [rate_limiter.acquire("client") for _ in range(LIMIT)]
+
+        assert all(result.allowed for result in results)
+        assert [result.remaining for result in results] == [4, 3, 2, 1, 0]
+
+    def test_fail_to_acquire_due_to_exhausted_bucket(self, rate_limiter: RateLimiter):
+        for _ in range(LIMIT):
+            rate_limiter.acquire("client")
+
+        result = rate_limiter.acquire("client")
+
+        assert result.allowed is False
+        assert result.remaining == 0
+        assert result.retry_after == pytest.approx(PERIOD / LIMIT)
+        assert result.reset_after == pytest.approx(PERIOD)
+
+    def test_successfully_refill_tokens(self, monotonic, rate_limiter: RateLimiter):
+        for _ in range(LIMIT):
+            rate_limiter.acquire("client")
+
+        monotonic.return_value += PERIOD / LIMIT
+
+        assert rate_limiter.acquire("client").allowed is True
+        assert rate_limiter.acquire("client").allowed is False
+
+    def test_successfully_prevent_bursts_at_window_boundaries(
+        self, monotonic, rate_limiter: RateLimiter
+    ):
+        monotonic.return_value += PERIOD - 0.1
+        allowed = sum(rate_limiter.acquire("client").allowed for _ in range(LIMIT))
+        monotonic.return_value += 0.2
+        allowed += sum(rate_limiter.acquire("client").allowed for _ in range(LIMIT))
+
+        assert allowed == LIMIT
+
+    def test_successfully_track_clients_independently(self, rate_limiter: RateLimiter):
+        for _ in range(LIMIT):
+            rate_limiter.acquire("client")
+
+        assert rate_limiter.acquire("other").allowed is True
+
+    def test_successfully_evict_idle_clients(
+        self, monotonic, rate_limiter: RateLimiter
+    ):
+        rate_limiter.acquire("idle")
+        monotonic.return_value += PERIOD / 2
+        rate_limiter.acquire("active")
+        monotonic.return_value += PERIOD / 2
+
+        rate_limiter.acquire("active")
+
+        assert len(rate_limiter) == 1
+
+    def test_successfully_bound_number_of_clients(self, monotonic):
+        rate_limiter = RateLimiter(LIMIT, PERIOD, 10)
+
+        for i in range(100):
+            rate_limiter.acquire(f"client-{i}")
+
+        assert len(rate_limiter) <= 10
+
+    def test_successfully_get_headers(self, mocker: MockerFixture, rate_limiter):
+        mocker.patch("app.rate_limiter.time.time", return_value=1000.0)
+        for _ in range(LIMIT):
+            rate_limiter.acquire("client")
+
+        assert rate_limiter.acquire("client").headers() == {
+            "X-RateLimit-Limit": str(LIMIT),
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": "1010",
+            "Retry-After": "2",
+        }
+
+
+class TestDistributedRateLimiter:
+    @pytest.fixture
+    def rate_limit_repository(self, dynamodb_resource) -> RateLimitRepository:
+        return RateLimitRepository(dynamodb_resource)
+
+    def make_rate_limiter(
+        self, rate_limit_repository: RateLimitRepository, lease_size: int = 2
+    ) -> DistributedRateLimiter:
+        return DistributedRateLimiter(
+            LIMIT,
+            int(PERIOD),
+            lease_size,
+            rate_limit_repository,
+            RateLimiter(LIMIT, PERIOD, 100),
+        )
+
+    def test_successfully_lease_tokens_in_batches(
+        self,
+        mocker: MockerFixture,
+        rate_limit_repository: RateLimitRepository,
+        rate_limits_table,
+    ):
+        mocker.spy(rate_limit_repository, "lease_tokens")
+        rate_limiter = self.make_rate_limiter(rate_limit_repository, LIMIT)
+
+        results = [rate_limiter.acquire("client") for _ in range(LIMIT)]
+
+        assert all(result.allowed for result in results)
+        assert rate_limit_repository.lease_tokens.call_count == 1
+
+    def test_successfully_share_limit_between_instances(
+        self, rate_limit_repository: RateLimitRepository, rate_limits_table
+    ):
+        rate_limiters = [
+            self.make_rate_limiter(rate_limit_repository),
+            self.make_rate_limiter(rate_limit_repository),
+        ]
+
+        results = [
+            rate_limiter.acquire("client")
+            for _ in range(LIMIT)
+            for rate_limiter in rate_limiters
+        ]
+
+        assert sum(result.allowed for result in results) == LIMIT
+        assert results[-1].allowed is False
+        assert results[-1].remaining == 0
+        assert 0 < results[-1].retry_after <= PERIOD
+
+    def test_successfully_stop_leasing_after_exhaustion(
+        self,
+        mocker: MockerFixture,
+        rate_limit_repository: RateLimitRepository,
+        rate_limits_table,
+    ):
+        other = self.make_rate_limiter(rate_limit_repository, LIMIT)
+        for _ in range(LIMIT):
+            other.acquire("client")
+        mocker.spy(rate_limit_repository, "lease_tokens")
+        rate_limiter = self.make_rate_limiter(rate_limit_repository)
+
+        results = [rate_limiter.acquire("client") for _ in range(3)]
+
+        assert not any(result.allowed for result in results)
+        assert rate_limit_repository.lease_tokens.call_count == 2
+
+    def test_successfully_acquire_while_another_key_renews(
+        self,
+        mocker: MockerFixture,
+        rate_limit_repository: RateLimitRepository,
+        rate_limits_table,
+    ):
+        leasing, release = threading.Event(), threading.Event()
+        lease_tokens = rate_limit_repository.lease_tokens
+
+        def slow_lease_tokens(key: str, *args) -> int | None:
+            if key.startswith("slow#"):
+                leasing.set()
+                release.wait(5)
+            return lease_tokens(key, *args)
+
+        mocker.patch.object(
+            rate_limit_repository, "lease_tokens", side_effect=slow_lease_tokens
+        )
+        rate_limiter = self.make_rate_limiter(rate_limit_repository)
+        thread = threading.Thread(target=rate_limiter.acquire, args=("slow",))
+        thread.start()
+        assert leasing.wait(5)
+
+        results = [rate_limiter.acquire("client") for _ in range(3)]
+        renewing = thread.is_alive()
+        release.set()
+        thread.join(5)
+
+        assert renewing
+        assert all(result.allowed for result in results)
+
+    def test_successfully_lease_once_for_concurrent_misses(
+        self,
+        mocker: MockerFixture,
+        rate_limit_repository: RateLimitRepository,
+        rate_limits_table,
+    ):
+        lease_tokens = rate_limit_repository.lease_tokens
+
+        def slow_lease_tokens(*args) -> int | None:
+            time.sleep(0.1)
+            return lease_tokens(*args)
+
+        mocker.patch.object(
+            rate_limit_repository, "lease_tokens", side_effect=slow_lease_tokens
+        )
+        rate_limiter = self.make_rate_limiter(rate_limit_repository)
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(rate_limiter.acquire("client"))
+            )
+            for _ in range(2)
+        ]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert [result.allowed for result in results] == [True, True]
+        assert rate_limit_repository.lease_tokens.call_count == 1
+
+    def test_successfully_fall_back_to_local_rate_limiting(
+        self, mocker: MockerFixture, rate_limit_repository: RateLimitRepository
+    ):
+        mocker.spy(rate_limit_repository, "lease_tokens")
+        rate_limiter = self.make_rate_limiter(rate_limit_repository)
+
+        results = [rate_limiter.acquire("client") for _ in range(LIMIT + 1)]
+
+        assert [result.allowed for result in results] == [True] * LIMIT + [False]
+        assert rate_limit_repository.lease_tokens.call_count == 1
+
+
+class TestCreateRateLimiter:
+    def test_successfully_create_local_rate_limiter(self, settings: Settings):
+        assert isinstance(create_rate_limiter(settings), RateLimiter)
+
+    def test_successfully_create_distributed_rate_limiter(self, settings: Settings):
+        settings.rate_limit_backend = "dynamodb"
+
+        assert isinstance(create_rate_limiter(settings), DistributedRateLimiter)
@@ -0,0 +1,55 @@
+import json
+
+import boto3
+import pytest
+from aws_lambda_powertools.utilities import parameters
+from pytest_mock import MockerFixture
+
+from app.settings import Settings
+
+SSH_SECRET_SSM_PARAM_NAME = "/dev/secrets/ssh"
+
+
+class TestSettings:
+    @pytest.fixture
+    def settings(self) -> Settings:
+        boto3.client("ssm").put_parameter(
+            Name=SSH_SECRET_SSM_PARAM_NAME,
+            Value=json.dumps({"private_key": "key"}),
+            Type="SecureString",
+        )
+        return Settings(ssh_secret_ssm_param_name=SSH_SECRET_SSM_PARAM_NAME)
+
+    def test_successfully_load_secrets_in_one_batch(
+        self, settings: Settings, mocker: MockerFixture
+    ):
+        get_parameters = mocker.spy(parameters, "get_parameters_by_name")
+
+        assert settings.jwt_secret == pytest.jwt_secret_ssm_param_value
+        assert settings.ssh_secret == {"private_key": "key"}
+        assert settings.cursor_secret == pytest.cursor_secret_ssm_param_value
+        assert settings.jwt_secret == pytest.jwt_secret_ssm_param_value
+        assert get_parameters.call_count == 1
+
+    def test_successfully_force_fetch_secrets(
+        self, settings: Settings, mocker: MockerFixture
+    ):
+        settings.load_secrets()
+        boto3.client("ssm").put_parameter(
+            Name=pytest.jwt_secret_ssm_param_name,
+            Value="rotated",
+            Type="SecureString",
+            Overwrite=True,
+        )
+
+        assert settings.jwt_secret == pytest.jwt_secret_ssm_param_value
+        assert settings.load_secrets(force_fetch=True)["jwt_secret"] == "rotated"
+        assert settings.jwt_secret == "rotated"
+
+    def test_successfully_skip_unconfigured_secrets(self):
+        settings = Settings(cursor_secret_ssm_param_name=None)
+
+        assert settings.load_secrets() == {
+            "jwt_secret": pytest.jwt_secret_ssm_param_value
+        }
+        assert settings.cursor_secret is None
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app import middlewares, snapstart
+from app.api_handler import app
+from app.jwt_bearer import verified_tokens
+from app.metrics import latency_metrics
+
+
+class TestSnapStart:
+    @pytest.fixture
+    def current_event_loop(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        yield loop
+        asyncio.set_event_loop(None)
+        loop.close()
+
+    def test_successfully_prime_application(self, current_event_loop):
+        snapstart.reset()
+
+        snapstart.prime(app)
+
+        assert latency_metrics.snapshot()["GET /health"]["2xx"]["count"] == 1
+
+    def test_successfully_reset_per_process_state(self):
+        middlewares.banned_hosts.add("8.8.8.8")
+        middlewares.host_verdicts.set("8.8.8.8", True)
+        middlewares.rate_limiter.acquire("8.8.8.8")
+        latency_metrics.observe("GET /health", 200, 1.0)
+        verified_tokens.set(b"token", None)
+
+        snapstart.reset()
+
+        assert "8.8.8.8" not in middlewares.banned_hosts
+        assert len(middlewares.host_verdicts) == 0
+        assert len(middlewares.rate_limiter) == 0
+        assert len(latency_metrics) == 0
+        assert len(verified_tokens) == 0
+        assert middlewares._country_client is None
+
+    def test_successfully_register_hooks(self, mocker: MockerFixture):
+        before_snapshot = mocker.patch("app.snapstart.register_before_snapshot")
+        after_restore = mocker.patch("app.snapstart.register_after_restore")
+
+        assert snapstart.register(app)
+
+        before_snapshot.assert_called_once_with(snapstart.prime, app)
+        after_restore.assert_called_once_with(snapstart.reset)
+
+    def test_fail_to_register_hooks_due_to_missing_runtime_module(
+        self, mocker: MockerFixture
+    ):
+        mocker.patch("app.snapstart.register_before_snapshot", None)
+
+        assert not snapstart.register(app)
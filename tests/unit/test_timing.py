@@ -0,0 +1,57 @@
+from app.timing import (TimedJSONResponse, format_server_timing,
+                        server_timings, timed)
+
+
+class TestTiming:
+    def test_successfully_record_timings(self):
+        timings: dict[str, float] = {}
+        token = server_timings.set(timings)
+        try:
+            with timed("db"):
+                pass
+            with timed("db"):
+                pass
+            with timed("markdown"):
+                pass
+        finally:
+            server_timings.reset(token)
+
+        assert list(timings) == ["db", "markdown"]
+        assert all(duration >= 0 for duration in timings.values())
+
+    def test_successfully_record_timings_as_decorator(self):
+        @timed("decorated")
+        def decorated() -> int:
+            return 1
+
+        timings: dict[str, float] = {}
+        token = server_timings.set(timings)
+        try:
+            assert decorated() == 1
+        finally:
+            server_timings.reset(token)
+
+        assert "decorated" in timings
+
+    def test_successfully_skip_recording_without_timings(self):
+        with timed("db"):
+            pass
+
+        assert server_timings.get() is None
+
+    def test_successfully_record_serialization(self):
+        timings: dict[str, float] = {}
+        token = server_timings.set(timings)
+        try:
+            response = TimedJSONResponse({"status": "ok"})
+        finally:
+            server_timings.reset(token)
+
+        assert response.body == b'{"status":"ok"}'
+        assert "serialize" in timings
+
+    def test_successfully_format_server_timing(self):
+        assert (
+            format_server_timing({"db": 1.234, "total": 5})
+            == "db;dur=1.23, total;dur=5.00"
+        )
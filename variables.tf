@@ -18,6 +18,20 @@ variable "architecture" {
   type    = string
 }
 
+variable "country_database_path" {
+  default = ""
+  type    = string
+}
+
+variable "country_lookup" {
+  default = "http"
+  type    = string
+}
+
+variable "cursor_secret_ssm_param_name" {
+  type = string
+}
+
 variable "debug" {
   default = false
   type    = bool
@@ -28,15 +42,40 @@ variable "default_timezone" {
   type    = string
 }
 
+variable "event_log_max_body_size" {
+  default = 2048
+  type    = number
+}
+
+variable "event_log_sample_rate" {
+  default = 0.1
+  type    = number
+}
+
+variable "event_log_slow_threshold_in_ms" {
+  default = 1000
+  type    = number
+}
+
 variable "jwt_secret_ssm_param_name" {
   type = string
 }
 
+variable "jwt_secret_ttl_in_seconds" {
+  default = 300
+  type    = number
+}
+
 variable "log_level" {
   default = "INFO"
   type    = string
 }
 
+variable "rate_limit_backend" {
+  default = "dynamodb"
+  type    = string
+}
+
 variable "rate_limit_duration_in_seconds" {
   default = 60
   type    = number
@@ -52,6 +91,11 @@ variable "rate_limiting" {
   type    = bool
 }
 
+variable "server_timing" {
+  default = false
+  type    = bool
+}
+
 variable "ssh_host" {
   type = string
 }